@@ -0,0 +1,34 @@
+# python -m benchmarks --output results.json
+import argparse
+
+from benchmarks import bench_adapters
+from benchmarks import bench_dict_merger
+from benchmarks import bench_json
+from benchmarks import bench_mappers
+from benchmarks import bench_schema_mapper
+from benchmarks import harness
+
+CPU_SUITES = {
+    'schema_mapper': bench_schema_mapper.run,
+    'dict_merger': bench_dict_merger.run,
+    'mappers': bench_mappers.run,
+    'json': bench_json.run
+}
+
+
+def run(args):
+    results = []
+    for name, suite in CPU_SUITES.items():
+        results.extend(dict(result, name=f'{name}.{result["name"]}') for result in suite())
+    if not args.cpu_only:
+        results.extend(bench_adapters.run(args.engines, args.number, args.sns))
+    return results
+
+
+if __name__ == '__main__':
+    parser = bench_adapters.add_arguments(argparse.ArgumentParser(
+        description='cpu microbenchmarks and adapter latency against local stand-ins'
+    ))
+    parser.add_argument('--cpu-only', action='store_true', help='skip the adapter benchmarks')
+    arguments = harness.parse_args(None, parser)
+    harness.report(run(arguments), arguments.output)
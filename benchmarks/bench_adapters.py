@@ -0,0 +1,272 @@
+# DTA_BENCH_AWS_ENDPOINT=http://localhost:4000 python -m benchmarks.bench_adapters --engines dynamodb s3
+import argparse
+import itertools
+import os
+
+import boto3
+from boto3.dynamodb.conditions import Key
+
+import syngenta_digital_dta
+from syngenta_digital_dta.common import registry
+
+from benchmarks import data
+from benchmarks import harness
+
+SCHEMA_FILE = 'benchmarks/openapi.yml'
+DYNAMODB_ENDPOINT = os.getenv('DTA_BENCH_DYNAMODB_ENDPOINT', 'http://localhost:4000')
+AWS_ENDPOINT = os.getenv('DTA_BENCH_AWS_ENDPOINT', 'http://localhost:4566')
+POSTGRES = {
+    'endpoint': os.getenv('DTA_BENCH_POSTGRES_HOST', 'localhost'),
+    'database': os.getenv('DTA_BENCH_POSTGRES_DATABASE', 'dta-postgis'),
+    'user': os.getenv('DTA_BENCH_POSTGRES_USER', 'root'),
+    'password': os.getenv('DTA_BENCH_POSTGRES_PASSWORD', 'Lq4nKg&&TRhHv%7z'),
+    'port': int(os.getenv('DTA_BENCH_POSTGRES_PORT', '5432'))
+}
+MONGO = {
+    'endpoint': os.getenv('DTA_BENCH_MONGO_ENDPOINT', 'mongodb://localhost:27017/'),
+    'user': os.getenv('DTA_BENCH_MONGO_USER', 'root'),
+    'password': os.getenv('DTA_BENCH_MONGO_PASSWORD', 'Lq4nKg&&TRhHv%7z')
+}
+ELASTICSEARCH_ENDPOINT = os.getenv('DTA_BENCH_ELASTICSEARCH_HOST', 'localhost')
+NAME = 'benchmark'
+SEED = 100
+BATCH = 25
+
+
+def unique_batch(ids):
+    return [data.nested_record(f'batch-{next(ids)}') for _ in range(BATCH)]
+
+
+def bench_dynamodb(number, **options):
+    client = boto3.client('dynamodb', endpoint_url=DYNAMODB_ENDPOINT)
+    try:
+        client.delete_table(TableName=NAME)
+    except client.exceptions.ResourceNotFoundException:
+        pass
+    client.create_table(
+        TableName=NAME,
+        BillingMode='PAY_PER_REQUEST',
+        AttributeDefinitions=[{'AttributeName': 'model_id', 'AttributeType': 'S'}],
+        KeySchema=[{'AttributeName': 'model_id', 'KeyType': 'HASH'}]
+    )
+    adapter = syngenta_digital_dta.adapter(
+        engine='dynamodb',
+        table=NAME,
+        endpoint=DYNAMODB_ENDPOINT,
+        model_schema='bench-nested-model',
+        model_schema_file=SCHEMA_FILE,
+        model_identifier='model_id',
+        model_version_key='modified',
+        shared=True,
+        **options
+    )
+    adapter.batch_insert(data=[data.dynamodb_record(index) for index in range(SEED)])
+    ids = itertools.count(SEED)
+    batch = [data.dynamodb_record(f'batch-{index}') for index in range(BATCH)]
+    keys = [{'model_id': item['model_id']} for item in batch]
+    return [
+        harness.measure_latency('dynamodb.create', lambda: adapter.insert(data=data.dynamodb_record(next(ids))), number),
+        harness.measure_latency('dynamodb.get', lambda: adapter.get(query={'Key': {'model_id': 'model-1'}}), number),
+        harness.measure_latency('dynamodb.update', lambda: adapter.update(
+            operation='get',
+            query={'Key': {'model_id': 'model-2'}},
+            data={'name': 'updated benchmark record'}
+        ), number),
+        harness.measure_latency('dynamodb.update_native', lambda: adapter.update(
+            native=True,
+            query={'Key': {'model_id': 'model-2'}},
+            data={'name': 'updated benchmark record'},
+            expected_version='2020-10-05'
+        ), number),
+        harness.measure_latency('dynamodb.query', lambda: adapter.query(
+            query={'KeyConditionExpression': Key('model_id').eq('model-3')}
+        ), number),
+        harness.measure_latency('dynamodb.scan', lambda: adapter.scan(query={'Limit': SEED}), number, items=SEED),
+        harness.measure_latency('dynamodb.batch_insert', lambda: adapter.batch_insert(data=batch), number, items=BATCH),
+        harness.measure_latency('dynamodb.batch_delete', lambda: adapter.batch_delete(data=keys), number, items=BATCH)
+    ]
+
+
+def bench_postgres(number, **options):
+    adapter = syngenta_digital_dta.adapter(
+        engine='postgres',
+        table=NAME,
+        model_schema='bench-flat-model',
+        model_schema_file=SCHEMA_FILE,
+        model_identifier='model_id',
+        model_version_key='modified',
+        **POSTGRES,
+        **options
+    )
+    adapter.connect()
+    adapter.cursor.execute(f'DROP TABLE IF EXISTS {NAME}')
+    adapter.cursor.execute(f'''
+        CREATE TABLE {NAME} (
+            model_id character varying(256) PRIMARY KEY,
+            name character varying(256),
+            active boolean,
+            created character varying(64),
+            modified character varying(64)
+        )
+    ''')
+    adapter.commit()
+    for index in range(SEED):
+        adapter.insert(data=data.nested_record(index), commit=True)
+    ids = itertools.count(SEED)
+    return [
+        harness.measure_latency('postgres.create', lambda: adapter.insert(data=data.nested_record(next(ids)), commit=True),
+                                number),
+        harness.measure_latency('postgres.get', lambda: adapter.get('model-1'), number),
+        harness.measure_latency('postgres.update', lambda: adapter.update(
+            data={'model_id': 'model-2', 'name': 'updated benchmark record'},
+            commit=True
+        ), number),
+        harness.measure_latency('postgres.query', lambda: adapter.query(
+            query=f'SELECT * FROM {NAME} WHERE name = %(name)s LIMIT 10',
+            params={'name': 'nested benchmark record'}
+        ), number, items=10),
+        harness.measure_latency('postgres.scan', lambda: adapter.get_all(limit=SEED), number, items=SEED),
+        harness.measure_latency('postgres.batch_insert', lambda: adapter.batch_insert(
+            data=unique_batch(ids),
+            commit=True
+        ), number, items=BATCH)
+    ]
+
+
+def bench_mongo(number, **options):
+    adapter = syngenta_digital_dta.adapter(
+        engine='mongo',
+        database=NAME,
+        collection=NAME,
+        model_schema='bench-nested-model',
+        model_schema_file=SCHEMA_FILE,
+        model_identifier='model_id',
+        model_version_key='modified',
+        **MONGO,
+        **options
+    )
+    adapter.batch_delete(data=[data.nested_record(index) for index in range(SEED)])
+    adapter.batch_create(data=[data.nested_record(index) for index in range(SEED)])
+    ids = itertools.count(SEED)
+    batch = [data.nested_record(f'batch-{index}') for index in range(BATCH)]
+    return [
+        harness.measure_latency('mongo.create', lambda: adapter.create(data=data.nested_record(next(ids))), number),
+        harness.measure_latency('mongo.get', lambda: adapter.find_one(query={'model_id': 'model-1'}), number),
+        harness.measure_latency('mongo.update', lambda: adapter.update(
+            query={'model_id': 'model-2'},
+            data={'name': 'updated benchmark record'}
+        ), number),
+        harness.measure_latency('mongo.query', lambda: adapter.find(
+            query={'owner.address.city': 'Chicago'},
+            params={'limit': 10}
+        ), number, items=10),
+        harness.measure_latency('mongo.scan', lambda: adapter.find(query={}, params={'limit': SEED}), number, items=SEED),
+        harness.measure_latency('mongo.batch_upsert', lambda: adapter.batch_upsert(data=batch), number, items=BATCH),
+        harness.measure_latency('mongo.batch_delete', lambda: adapter.batch_delete(data=batch), number, items=BATCH)
+    ]
+
+
+def bench_elasticsearch(number, **options):
+    adapter = syngenta_digital_dta.adapter(
+        engine='elasticsearch',
+        index=NAME,
+        endpoint=ELASTICSEARCH_ENDPOINT,
+        model_schema='bench-nested-model',
+        model_schema_file=SCHEMA_FILE,
+        model_identifier='model_id',
+        model_version_key='modified',
+        **options
+    )
+    adapter.connection.indices.delete(index=NAME, ignore=[404])
+    adapter.create_index()
+    for index in range(SEED):
+        adapter.create(data=data.nested_record(index), refresh=False)
+    adapter.connection.indices.refresh(index=NAME)
+    ids = itertools.count(SEED)
+    return [
+        harness.measure_latency('elasticsearch.create', lambda: adapter.create(data=data.nested_record(next(ids))), number),
+        harness.measure_latency('elasticsearch.get', lambda: adapter.get('model-1'), number),
+        harness.measure_latency('elasticsearch.update', lambda: adapter.update(
+            data={'model_id': 'model-2', 'name': 'updated benchmark record'}
+        ), number),
+        harness.measure_latency('elasticsearch.query', lambda: adapter.query(
+            query={'match': {'owner.address.city': 'Chicago'}}
+        ), number),
+        harness.measure_latency('elasticsearch.scan', lambda: adapter.query(query={'match_all': {}}), number),
+        harness.measure_latency('elasticsearch.batch_create', lambda: adapter.batch_create(
+            data=unique_batch(ids),
+            refresh=False
+        ), number, items=BATCH)
+    ]
+
+
+def bench_s3(number, **options):
+    client = boto3.client('s3', endpoint_url=AWS_ENDPOINT, region_name='us-east-2')
+    try:
+        client.create_bucket(Bucket=NAME, CreateBucketConfiguration={'LocationConstraint': 'us-east-2'})
+    except (client.exceptions.BucketAlreadyOwnedByYou, client.exceptions.BucketAlreadyExists):
+        pass
+    adapter = syngenta_digital_dta.adapter(engine='s3', endpoint=AWS_ENDPOINT, bucket=NAME, **options)
+    record = data.nested_record()
+    for index in range(SEED):
+        adapter.put(s3_path=f'{NAME}/model-{index}.json', data=record, json=True, publish=False)
+    ids = itertools.count(SEED)
+    return [
+        harness.measure_latency('s3.create', lambda: adapter.put(
+            s3_path=f'{NAME}/model-{next(ids)}.json',
+            data=record,
+            json=True
+        ), number),
+        harness.measure_latency('s3.get', lambda: adapter.get(s3_path=f'{NAME}/model-1.json', json=True), number),
+        harness.measure_latency('s3.update', lambda: adapter.put(
+            s3_path=f'{NAME}/model-2.json',
+            data=record,
+            json=True
+        ), number),
+        harness.measure_latency('s3.query', lambda: adapter.list_dir_files(dir_name=f'{NAME}/model-1'), number),
+        harness.measure_latency('s3.delete', lambda: adapter.delete(s3_path=f'{NAME}/model-{next(ids)}.json'), number)
+    ]
+
+
+ENGINES = {
+    'dynamodb': bench_dynamodb,
+    'postgres': bench_postgres,
+    'mongo': bench_mongo,
+    'elasticsearch': bench_elasticsearch,
+    's3': bench_s3
+}
+
+
+def create_topic():
+    client = boto3.client('sns', endpoint_url=AWS_ENDPOINT, region_name='us-east-2')
+    return client.create_topic(Name=NAME)['TopicArn']
+
+
+def run(engines=None, number=200, sns=False):
+    os.environ.setdefault('AWS_ACCESS_KEY_ID', '0')
+    os.environ.setdefault('AWS_SECRET_ACCESS_KEY', '0')
+    os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-2')
+    options = {'sns_arn': create_topic(), 'sns_endpoint': AWS_ENDPOINT} if sns else {}
+    results = []
+    for engine in engines or ENGINES:
+        try:
+            results.extend(ENGINES[engine](number, **options))
+        except Exception as error:
+            print(f'skipped {engine}: {error}')
+        finally:
+            registry.close_all()
+    return results
+
+
+def add_arguments(parser):
+    parser.add_argument('--engines', nargs='+', choices=list(ENGINES), help='engines to benchmark; defaults to all')
+    parser.add_argument('--number', type=int, default=200, help='calls per operation')
+    parser.add_argument('--sns', action='store_true', help='publish every write to an sns topic on the aws stand-in')
+    return parser
+
+
+if __name__ == '__main__':
+    args = harness.parse_args(None, add_arguments(argparse.ArgumentParser(
+        description='p50/p99 latency and throughput of every adapter against local stand-ins'
+    )))
+    harness.report(run(args.engines, args.number, args.sns), args.output)
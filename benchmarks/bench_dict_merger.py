@@ -0,0 +1,102 @@
+# python -m benchmarks.bench_dict_merger
+import copy
+import json
+import tracemalloc
+
+from syngenta_digital_dta.common import dict_merger
+
+from benchmarks import data
+from benchmarks import harness
+
+SIZES = {'1kb': 1024, '100kb': 100 * 1024, '1mb': 1024 * 1024}
+PATCH = {'modified': '2020-10-06', 'owner': {'settings': {'units': 'imperial'}}}
+
+
+def legacy_merge(original_data, new_data, **kwargs):
+    updated_data = copy.deepcopy(original_data)
+    _legacy_walk_dict(updated_data, new_data, **kwargs)
+    return updated_data
+
+
+def _legacy_walk_dict(old_data, new_data, **kwargs):
+    for new_key in new_data.keys():
+        if old_data.get(new_key) and isinstance(new_data[new_key], dict):
+            _legacy_walk_dict(old_data[new_key], new_data[new_key], **kwargs)
+        elif isinstance(old_data.get(new_key), list) and isinstance(new_data[new_key], list):
+            for item in new_data[new_key]:
+                if item not in old_data[new_key]:
+                    old_data[new_key].append(item)
+        else:
+            old_data[new_key] = new_data[new_key]
+
+
+def legacy_add_unique_item_in_list(old_list, new_list):
+    old_list = list(old_list)
+    for item in new_list:
+        if item not in old_list:
+            old_list.append(item)
+    return old_list
+
+
+def legacy_remove_item_in_list(old_list, new_list):
+    old_list = list(old_list)
+    for old_item in list(old_list):
+        old = sorted(old_item.items()) if isinstance(old_item, dict) else old_item
+        new = sorted(new_list[0].items()) if isinstance(new_list[0], dict) else new_list[0]
+        if json.dumps(old) == json.dumps(new):
+            old_list.remove(old_item)
+    return old_list
+
+
+def embedded_objects(start, count):
+    return [{'field_id': f'field-{index}', 'crop': {'name': 'corn', 'rank': index}} for index in range(start, start + count)]
+
+
+def run_lists(count=10000):
+    results = []
+    old_list = embedded_objects(0, count)
+    new_list = embedded_objects(count // 2, count)
+    cases = (
+        ('add', legacy_add_unique_item_in_list, 'add'),
+        ('remove', legacy_remove_item_in_list, 'remove')
+    )
+    for name, legacy, operation in cases:
+        results.append(harness.measure(f'list.{name}.{count}.legacy', lambda legacy=legacy: legacy(old_list, new_list),
+                                       number=1, repeat=1))
+        results.append(harness.measure(
+            f'list.{name}.{count}.merge',
+            lambda operation=operation: dict_merger.merge({'items': old_list}, {'items': new_list}, update_list_operation=operation),
+            repeat=3
+        ))
+    return results
+
+
+def peak_allocation(func):
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def run():
+    results = []
+    for name, size in SIZES.items():
+        document = data.document(size)
+        assert dict_merger.merge(document, PATCH) == legacy_merge(document, PATCH)
+        for variant, merge in (('legacy', legacy_merge), ('merge', dict_merger.merge)):
+            result = harness.measure(f'merge.{name}.{variant}', lambda merge=merge: merge(document, PATCH), repeat=3)
+            result['peak_bytes'] = peak_allocation(lambda merge=merge: merge(document, PATCH))
+            results.append(result)
+    return results
+
+
+if __name__ == '__main__':
+    args = harness.parse_args('dict_merger documents (1kb, 100kb, 1mb) and list operations (10k embedded objects) versus the legacy merge')
+    results = run()
+    list_results = run_lists()
+    harness.report(results)
+    for result in results:
+        print(f'{result["name"]:<22}  peak {result["peak_bytes"]:>12,} bytes')
+    harness.report(list_results)
+    harness.write(results + list_results, args.output)
@@ -0,0 +1,47 @@
+# python -m benchmarks.bench_json
+import importlib
+
+from syngenta_digital_dta.common import json_helper
+
+from benchmarks import data
+from benchmarks import harness
+
+
+def legacy_dumps():
+    import jsonpickle  # pylint: disable=C
+    import simplejson  # pylint: disable=C
+    return {
+        'simplejson': lambda record: simplejson.dumps(record),
+        'jsonpickle': lambda record: jsonpickle.dumps(record, unpicklable=False, use_decimal=True)
+    }
+
+
+def available_backends():
+    backends = []
+    for backend in json_helper.BACKENDS:
+        try:
+            importlib.import_module(backend)
+        except ImportError:
+            continue
+        backends.append(backend)
+    return backends
+
+
+def run():
+    results = []
+    record = data.decimal_record(fields=200)
+    for name, dumps in legacy_dumps().items():
+        results.append(harness.measure(f'dumps.legacy.{name}', lambda dumps=dumps: dumps(record)))
+    active = json_helper.get_backend()
+    for backend in available_backends():
+        json_helper.set_backend(backend)
+        message = json_helper.dumps(record)
+        results.append(harness.measure(f'dumps.{backend}', lambda: json_helper.dumps(record)))
+        results.append(harness.measure(f'loads.{backend}', lambda message=message: json_helper.loads(message)))
+    json_helper.set_backend(active)
+    return results
+
+
+if __name__ == '__main__':
+    args = harness.parse_args('json_helper backends on a decimal-heavy dynamodb item versus the legacy encoders')
+    harness.report(run(), args.output)
@@ -0,0 +1,41 @@
+# python -m benchmarks.bench_mappers
+from syngenta_digital_dta.elasticsearch import es_mapper
+from syngenta_digital_dta.postgres import json_formatting
+
+from benchmarks import data
+from benchmarks import harness
+
+SCHEMA_FILE = 'benchmarks/openapi.yml'
+COLUMN_MAP = {'created': 'now()', 'modified': 'now()'}
+JSON_COLUMN_MAP = {
+    'model_id': 'models.model_id',
+    'name': 'models.name',
+    'owner_id': 'models.owner.owner_id',
+    'units': 'models.settings.units'
+}
+FUNCTION_MAP = {'name': 'upper({})'}
+
+
+def run():
+    results = []
+    for schema_key in ('bench-nested-model', 'bench-array-model'):
+        results.append(harness.measure(
+            f'es_mapper.{schema_key}',
+            lambda schema_key=schema_key: es_mapper.convert_schema_to_mapping(SCHEMA_FILE, schema_key, {'name': 'keyword'})
+        ))
+    json = {'models': [data.nested_record(index) for index in range(100)]}
+    results.append(harness.measure('json_formatting.insert_json_into_table', lambda: json_formatting.insert_json_into_table(
+        json=json,
+        table_name='models',
+        column_map=COLUMN_MAP,
+        json_column_map=JSON_COLUMN_MAP,
+        function_map=FUNCTION_MAP,
+        conflict_cols=['model_id'],
+        update_cols=['name', 'modified']
+    )))
+    return results
+
+
+if __name__ == '__main__':
+    args = harness.parse_args('es_mapper schema conversion and postgres json_formatting statement building')
+    harness.report(run(), args.output)
@@ -0,0 +1,38 @@
+# python -m benchmarks.bench_publisher
+import os
+
+import boto3
+import simplejson as json
+
+from syngenta_digital_dta.common import publisher
+from syngenta_digital_dta.common import registry
+
+from benchmarks import data
+from benchmarks import harness
+from benchmarks.sns_stub import SNSStub
+
+ARN = 'arn:aws:sns:us-east-2:111111111111:benchmark-topic'
+
+
+def legacy_publish(**kwargs):
+    client = boto3.client('sns', region_name=kwargs.get('region'), endpoint_url=kwargs.get('endpoint'))
+    client.publish(TopicArn=kwargs['arn'], Message=json.dumps(kwargs['data']), MessageAttributes={})
+
+
+def run():
+    os.environ.setdefault('AWS_ACCESS_KEY_ID', '0')
+    os.environ.setdefault('AWS_SECRET_ACCESS_KEY', '0')
+    record = data.nested_record()
+    with SNSStub() as stub:
+        kwargs = {'arn': ARN, 'data': record, 'region': 'us-east-2', 'endpoint': stub.endpoint}
+        results = [
+            harness.measure('publish.legacy_client_per_call', lambda: legacy_publish(**kwargs), repeat=3),
+            harness.measure('publish.cached_client', lambda: publisher.publish(**kwargs), repeat=3)
+        ]
+    registry.close_all()
+    return results
+
+
+if __name__ == '__main__':
+    args = harness.parse_args('sns publish latency with a client per call versus the cached publisher client')
+    harness.report(run(), args.output)
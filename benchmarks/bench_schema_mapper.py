@@ -0,0 +1,56 @@
+# python -m benchmarks.bench_schema_mapper
+from syngenta_digital_dta.common import schema_loader
+from syngenta_digital_dta.common import schema_mapper
+
+from benchmarks import data
+from benchmarks import harness
+
+SCHEMA_FILE = 'benchmarks/openapi.yml'
+
+
+def legacy_map_to_schema(record, schema_file, schema_key):
+    model_data = {}
+    model_schema = schema_loader.load_schema(schema_file, schema_key)
+    schemas = model_schema['allOf'] if model_schema.get('allOf') else [model_schema]
+    for model in schemas:
+        if model.get('type') == 'object':
+            _legacy_populate_model_data(model.get('properties', {}), record, model_data)
+    return model_data
+
+
+def _legacy_populate_model_data(properties, record, model_data):
+    if record and isinstance(record, dict):
+        for property_key, property_value in properties.items():
+            model_data[property_key] = {}
+            if property_value.get('properties'):
+                _legacy_populate_model_data(property_value['properties'], record.get(property_key), model_data[property_key])
+            elif property_value.get('items', {}).get('properties'):
+                model_data[property_key] = []
+                for item in record.get(property_key, []):
+                    model_data[property_key].append(
+                        _legacy_populate_model_data(property_value['items']['properties'], item, {}))
+            else:
+                model_data[property_key] = record.get(property_key)
+    return model_data
+
+
+def run():
+    results = []
+    cases = [
+        ('nested', 'bench-nested-model', data.nested_record()),
+        ('all_of', 'bench-request-model', data.nested_record()),
+        ('array_of_objects', 'bench-array-model', data.array_record())
+    ]
+    for name, schema_key, record in cases:
+        expected = legacy_map_to_schema(record, SCHEMA_FILE, schema_key)
+        assert schema_mapper.map_to_schema(record, SCHEMA_FILE, schema_key) == expected
+        plan = schema_mapper.compile_schema(SCHEMA_FILE, schema_key)
+        results.append(harness.measure(f'{name}.legacy', lambda: legacy_map_to_schema(record, SCHEMA_FILE, schema_key)))
+        results.append(harness.measure(f'{name}.map_to_schema', lambda: schema_mapper.map_to_schema(record, SCHEMA_FILE, schema_key)))
+        results.append(harness.measure(f'{name}.plan', lambda: plan.project(record)))
+    return results
+
+
+if __name__ == '__main__':
+    args = harness.parse_args('compare the legacy schema walker with compiled mapping plans')
+    harness.report(run(), args.output)
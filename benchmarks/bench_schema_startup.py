@@ -0,0 +1,70 @@
+# python -m benchmarks.bench_schema_startup
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+import yaml
+
+from syngenta_digital_dta.common import schema_compiler
+
+from benchmarks import harness
+
+CHILD = '''
+import sys
+import time
+start = time.perf_counter()
+from syngenta_digital_dta.common import schema_mapper
+schema_mapper.map_to_schema({'model_id': '1'}, sys.argv[1], 'bench-request-model')
+print(time.perf_counter() - start)
+'''
+
+
+def write_large_spec(path, models=300):
+    with open('benchmarks/openapi.yml', encoding='UTF-8') as openapi:
+        spec = yaml.safe_load(openapi)
+    schemas = spec['components']['schemas']
+    for index in range(models):
+        schemas[f'bench-generated-model-{index}'] = {
+            'allOf': [
+                {'$ref': '#/components/schemas/bench-nested-model'},
+                {'$ref': '#/components/schemas/bench-array-model'},
+                {'required': ['model_id']}
+            ]
+        }
+    with open(path, 'w', encoding='UTF-8') as openapi:
+        yaml.safe_dump(spec, openapi)
+
+
+def cold_start(schema_file, repeat):
+    env = {**os.environ, 'PYTHONPATH': os.getcwd()}
+    timings = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', CHILD, schema_file], env=env, check=True,
+                                capture_output=True, text=True).stdout
+        timings.append(float(output))
+    return timings
+
+
+def run(repeat=5):
+    temp_dir = tempfile.mkdtemp()
+    try:
+        schema_file = os.path.join(temp_dir, 'openapi.yml')
+        write_large_spec(schema_file)
+        results = []
+        for name in ('openapi', 'artifact'):
+            if name == 'artifact':
+                schema_compiler.compile_schemas(schema_file, schema_keys=['bench-request-model'])
+            timings = cold_start(schema_file, repeat)
+            results.append({'name': f'cold_start.{name}', 'number': repeat, 'best': min(timings),
+                            'median': statistics.median(timings)})
+        return results
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == '__main__':
+    args = harness.parse_args('first map_to_schema in a fresh interpreter with and without a compiled artifact')
+    harness.report(run(), args.output)
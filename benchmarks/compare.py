@@ -0,0 +1,35 @@
+# python -m benchmarks.compare baseline.json current.json
+import argparse
+
+from benchmarks import harness
+
+
+def compare(baseline, current, threshold):
+    baseline = {result['name']: result for result in baseline}
+    regressions = []
+    width = max((len(result['name']) for result in current), default=0)
+    for result in current:
+        previous = baseline.get(result['name'])
+        if previous is None:
+            print(f'{result["name"]:<{width}}  new')
+            continue
+        line = f'{result["name"]:<{width}}'
+        for metric in ('median', 'p99'):
+            if metric in result and metric in previous:
+                ratio = result[metric] / previous[metric] if previous[metric] else 1.0
+                line += f'  {metric} {previous[metric] * 1e6:>10.2f} -> {result[metric] * 1e6:>10.2f} us ({ratio:>5.2f}x)'
+                if ratio > threshold:
+                    regressions.append(f'{result["name"]}.{metric}')
+        print(line)
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='compare two benchmark result files by name')
+    parser.add_argument('baseline')
+    parser.add_argument('current')
+    parser.add_argument('--threshold', type=float, default=1.2, help='ratio above which a result is a regression')
+    args = parser.parse_args()
+    found = compare(harness.load(args.baseline), harness.load(args.current), args.threshold)
+    if found:
+        raise SystemExit(f'regressions: {", ".join(found)}')
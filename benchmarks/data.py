@@ -0,0 +1,87 @@
+import json
+from decimal import Decimal
+
+
+def nested_record(index=0):
+    return {
+        'model_id': f'model-{index}',
+        'name': 'nested benchmark record',
+        'active': True,
+        'ignored': 'not in schema',
+        'created': '2020-10-05',
+        'modified': '2020-10-05',
+        'owner': {
+            'owner_id': f'owner-{index}',
+            'email': 'owner@example.com',
+            'address': {
+                'street': '1 Main St',
+                'city': 'Chicago',
+                'state': 'IL',
+                'zipcode': '60601',
+                'geo': {'lat': 41.88, 'lng': -87.62}
+            }
+        },
+        'settings': {
+            'units': 'metric',
+            'locale': 'en-US',
+            'notifications': {'email': True, 'sms': False}
+        }
+    }
+
+
+def array_record(index=0, fields=20, samples=5):
+    return {
+        'model_id': f'model-{index}',
+        'tags': ['a', 'b', 'c'],
+        'fields': [
+            {
+                'field_id': f'field-{field}',
+                'area': field * 1.5,
+                'ignored': True,
+                'crop': {'name': 'corn', 'variety': 'dent'},
+                'samples': [{'sample_id': f'sample-{sample}', 'value': sample} for sample in range(samples)]
+            }
+            for field in range(fields)
+        ],
+        'modified': '2020-10-05'
+    }
+
+
+def document(size_bytes):
+    doc = {
+        'model_id': 'model-0',
+        'modified': '2020-10-05',
+        'owner': {'owner_id': 'owner-0', 'settings': {'units': 'metric', 'locale': 'en-US'}},
+        'fields': []
+    }
+    while len(str(doc)) < size_bytes:
+        index = len(doc['fields'])
+        doc['fields'].append({
+            'field_id': f'field-{index}',
+            'area': index * 1.5,
+            'boundary': [[index, index + 1], [index + 2, index + 3]],
+            'crop': {'name': 'corn', 'variety': 'dent'}
+        })
+    return doc
+
+
+def decimal_record(index=0, fields=50):
+    return {
+        'model_id': f'model-{index}',
+        'version': Decimal(index),
+        'modified': '2020-10-05',
+        'fields': [
+            {
+                'field_id': f'field-{field}',
+                'area': Decimal(field) * Decimal('1.5'),
+                'yield': Decimal('187.25'),
+                'boundary': [[Decimal(field), Decimal(field + 1)], [Decimal('41.8781'), Decimal('-87.6298')]],
+                'samples': [{'sample_id': f'sample-{sample}', 'value': Decimal(sample)} for sample in range(5)]
+            }
+            for field in range(fields)
+        ]
+    }
+
+
+def dynamodb_record(index=0):
+    return json.loads(json.dumps(nested_record(index)), parse_float=Decimal)
@@ -0,0 +1,93 @@
+import argparse
+import datetime
+import json
+import platform
+import statistics
+import subprocess
+import time
+import timeit
+
+
+def measure(name, func, number=None, repeat=5):
+    timer = timeit.Timer(func)
+    if number is None:
+        number, _ = timer.autorange()
+    per_call = [run / number for run in timer.repeat(repeat=repeat, number=number)]
+    return {
+        'name': name,
+        'number': number,
+        'best': min(per_call),
+        'median': statistics.median(per_call)
+    }
+
+
+def measure_latency(name, func, number=200, warmup=5, items=1):
+    for _ in range(warmup):
+        func()
+    timings = []
+    started = time.perf_counter()
+    for _ in range(number):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    elapsed = time.perf_counter() - started
+    timings.sort()
+    return {
+        'name': name,
+        'number': number,
+        'best': timings[0],
+        'median': statistics.median(timings),
+        'p50': percentile(timings, 0.5),
+        'p99': percentile(timings, 0.99),
+        'throughput': number * items / elapsed
+    }
+
+
+def percentile(timings, rank):
+    return timings[min(len(timings) - 1, int(rank * len(timings)))]
+
+
+def parse_args(description, parser=None):
+    parser = parser or argparse.ArgumentParser(description=description)
+    parser.add_argument('--output', help='write results as json to this path')
+    return parser.parse_args()
+
+
+def report(results, output=None):
+    if results:
+        width = max(len(result['name']) for result in results)
+        for result in results:
+            line = f'{result["name"]:<{width}}  best {result["best"] * 1e6:>12.2f} us  median {result["median"] * 1e6:>12.2f} us'
+            if 'p99' in result:
+                line += f'  p99 {result["p99"] * 1e6:>12.2f} us  {result["throughput"]:>10.1f} ops/s'
+            print(line)
+    write(results, output)
+
+
+def write(results, output=None):
+    if output:
+        with open(output, 'w', encoding='UTF-8') as results_file:
+            json.dump({**environment(), 'results': results}, results_file, indent=4)
+
+
+def load(path):
+    with open(path, encoding='UTF-8') as results_file:
+        results = json.load(results_file)
+    return results['results'] if isinstance(results, dict) else results
+
+
+def environment():
+    return {
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat()
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], check=True, capture_output=True,
+                              text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
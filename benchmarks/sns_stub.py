@@ -0,0 +1,40 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PUBLISH_RESPONSE = b'''<PublishResponse xmlns="http://sns.amazonaws.com/doc/2010-03-31/">
+<PublishResult><MessageId>00000000-0000-0000-0000-000000000000</MessageId></PublishResult>
+<ResponseMetadata><RequestId>00000000-0000-0000-0000-000000000000</RequestId></ResponseMetadata>
+</PublishResponse>'''
+
+
+class SNSStubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_POST(self):  # pylint: disable=C
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self.server.requests += 1
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/xml')
+        self.send_header('Content-Length', str(len(PUBLISH_RESPONSE)))
+        self.end_headers()
+        self.wfile.write(PUBLISH_RESPONSE)
+
+    def log_message(self, *args):  # pylint: disable=W
+        pass
+
+
+class SNSStub:
+
+    def __init__(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), SNSStubHandler)
+        self.server.requests = 0
+        self.endpoint = f'http://127.0.0.1:{self.server.server_port}'
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args):
+        self.server.shutdown()
+        self.server.server_close()
@@ -13,19 +13,26 @@ setup(
     description='A DRY multi-database normalizer.',
     long_description=long_description,
     long_description_content_type='text/markdown',
-    packages=find_packages(),
+    packages=find_packages(exclude=['tests', 'tests.*', 'benchmarks', 'benchmarks.*']),
+    entry_points={
+        'console_scripts': [
+            'dta-compile-schemas=syngenta_digital_dta.common.schema_compiler:main'
+        ]
+    },
     python_requires='>=3.0',
     install_requires=[
         'aws-psycopg2',
         'boto3',
         'elasticsearch==7.13.4',
         'jsonref',
-        'jsonpickle',
         'psycopg2-binary',
         'pyyaml',
         'requests-aws4auth',
         'simplejson'
     ],
+    extras_require={
+        'orjson': ['orjson>=3.9']
+    },
     classifiers=[
         'Environment :: Web Environment',
         'Intended Audience :: Developers',
@@ -1,4 +1,16 @@
-def adapter(**kwargs): # pylint: disable=R0911
+def adapter(**kwargs):
+    if kwargs.get('shared'):
+        from syngenta_digital_dta.common import registry  # pylint: disable=C
+        return registry.get_or_create('adapter', kwargs, lambda: _create_adapter(**kwargs))
+    return _create_adapter(**kwargs)
+
+
+def close_all():
+    from syngenta_digital_dta.common import registry  # pylint: disable=C
+    registry.close_all()
+
+
+def _create_adapter(**kwargs): # pylint: disable=R0911
     if kwargs.get('engine') == 'dynamodb':
         from syngenta_digital_dta.dynamodb.adapter import DynamodbAdapter  # pylint: disable=C
         return DynamodbAdapter(**kwargs)
@@ -0,0 +1,182 @@
+import atexit
+import collections
+import functools
+import threading
+import time
+import weakref
+
+from syngenta_digital_dta.common import logger
+from syngenta_digital_dta.common import publisher
+from syngenta_digital_dta.common import registry
+
+BACKPRESSURE_MODES = ('block', 'drop_oldest', 'fail')
+CLOSE_TIMEOUT = 5
+
+_publishers = weakref.WeakSet()
+
+
+class AsyncPublisher:
+
+    def __init__(self, **kwargs):
+        self.transport = kwargs.get('transport', publisher)
+        self.queue_size = kwargs.get('queue_size', 1000)
+        self.workers = kwargs.get('workers', 2)
+        self.backpressure = kwargs.get('backpressure', 'block')
+        if self.backpressure not in BACKPRESSURE_MODES:
+            raise PublishQueueException(f'backpressure must be one of {BACKPRESSURE_MODES}')
+        self.__queue = collections.deque()
+        self.__condition = threading.Condition()
+        self.__threads = []
+        self.__pending = 0
+        self.__closed = False
+        self.__metrics = {
+            'published': 0,
+            'failed': 0,
+            'dropped': 0,
+            'rejected': 0,
+            'latency_total': 0.0,
+            'latency_max': 0.0
+        }
+        _publishers.add(self)
+
+    def publish(self, **kwargs):
+        self.__enqueue('publish', kwargs)
+
+    def publish_batch(self, **kwargs):
+        self.__enqueue('publish_batch', kwargs)
+
+    def flush(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.__condition:
+            while self.__pending:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self.__condition.wait(remaining)
+        return True
+
+    def close(self, timeout=CLOSE_TIMEOUT):
+        flushed = self.flush(timeout)
+        with self.__condition:
+            dropped = len(self.__queue)
+            self.__queue.clear()
+            self.__pending -= dropped
+            self.__metrics['dropped'] += dropped
+            in_flight = self.__pending
+            self.__closed = True
+            self.__condition.notify_all()
+        if not flushed:
+            logger.log(level='WARN', log={
+                'error': f'async_publish_close_timeout: dropped {dropped} queued messages after {timeout}s; '
+                         f'{in_flight} still in flight'
+            })
+        return flushed
+
+    def get_metrics(self):
+        with self.__condition:
+            metrics = dict(self.__metrics)
+            metrics['depth'] = len(self.__queue)
+            metrics['in_flight'] = self.__pending - len(self.__queue)
+        completed = metrics['published'] + metrics['failed']
+        metrics['latency_avg'] = metrics['latency_total'] / completed if completed else 0.0
+        return metrics
+
+    def __enqueue(self, method, kwargs):
+        with self.__condition:
+            self.__raise_if_closed()
+            while len(self.__queue) >= self.queue_size:
+                if self.backpressure == 'fail':
+                    self.__metrics['rejected'] += 1
+                    raise PublishQueueFullException(f'publish queue is full ({self.queue_size} messages)')
+                if self.backpressure == 'drop_oldest':
+                    self.__queue.popleft()
+                    self.__pending -= 1
+                    self.__metrics['dropped'] += 1
+                else:
+                    self.__condition.wait()
+                    self.__raise_if_closed()
+            self.__queue.append((time.monotonic(), method, kwargs))
+            self.__pending += 1
+            self.__start_workers()
+            self.__condition.notify_all()
+
+    def __raise_if_closed(self):
+        if self.__closed:
+            self.__metrics['rejected'] += 1
+            raise PublishQueueClosedException('publish queue is closed')
+
+    def __start_workers(self):
+        self.__threads = [thread for thread in self.__threads if thread.is_alive()]
+        while len(self.__threads) < self.workers:
+            thread = threading.Thread(target=self.__work, name='dta-async-publisher', daemon=True)
+            thread.start()
+            self.__threads.append(thread)
+
+    def __work(self):
+        while True:
+            with self.__condition:
+                while not self.__queue and not self.__closed:
+                    self.__condition.wait()
+                if not self.__queue:
+                    return
+                enqueued, method, kwargs = self.__queue.popleft()
+                self.__condition.notify_all()
+            failed = False
+            try:
+                getattr(self.transport, method)(**kwargs)
+            except Exception as error:
+                failed = True
+                logger.log(level='WARN', log={'error': f'async_publish_error: {error}'})
+            self.__complete(enqueued, failed)
+
+    def __complete(self, enqueued, failed):
+        latency = time.monotonic() - enqueued
+        with self.__condition:
+            self.__pending -= 1
+            self.__metrics['failed' if failed else 'published'] += 1
+            self.__metrics['latency_total'] += latency
+            self.__metrics['latency_max'] = max(self.__metrics['latency_max'], latency)
+            self.__condition.notify_all()
+
+
+def get_publisher(**kwargs):
+    options = {
+        'transport': kwargs.get('transport') or publisher,
+        'queue_size': kwargs.get('queue_size') or 1000,
+        'workers': kwargs.get('workers') or 2,
+        'backpressure': kwargs.get('backpressure') or 'block'
+    }
+    return registry.get_or_create('async_publisher', options, lambda: AsyncPublisher(**options))
+
+
+def flush_all(timeout=None):
+    flushed = True
+    for async_publisher in list(_publishers):
+        if not async_publisher.flush(timeout):
+            flushed = False
+    return flushed
+
+
+def flush_on_exit(handler):
+    @functools.wraps(handler)
+    def wrapper(*args, **kwargs):
+        try:
+            return handler(*args, **kwargs)
+        finally:
+            flush_all()
+    return wrapper
+
+
+atexit.register(flush_all, CLOSE_TIMEOUT)
+
+
+class PublishQueueException(Exception):
+    pass
+
+
+class PublishQueueFullException(PublishQueueException):
+    pass
+
+
+class PublishQueueClosedException(PublishQueueException):
+    pass
@@ -1,5 +1,8 @@
+from syngenta_digital_dta.common import metrics
 from syngenta_digital_dta.common import publisher
 
+OPERATIONS = ('create', 'update', 'upsert', 'delete', 'batch_create', 'batch_upsert', 'batch_delete')
+
 
 class BaseAdapter:
 
@@ -8,43 +11,138 @@ class BaseAdapter:
         self.sns_custom = kwargs.get('sns_attributes', {})
         self.sns_defaults = kwargs.get('sns_default_attributes', True)
         self.sns_endpoint = kwargs.get('sns_endpoint')
+        self.sns_per_item = kwargs.get('sns_per_item', False)
+        self.sns_options = {
+            option: kwargs[f'sns_{option}'] for option in ('region', 'pool_size') if kwargs.get(f'sns_{option}')
+        }
+        if kwargs.get('sns_claim_check_bucket'):
+            from syngenta_digital_dta.common import claim_check  # pylint: disable=C
+            self.sns_options['claim_check'] = claim_check.get_claim_check(
+                bucket=kwargs['sns_claim_check_bucket'],
+                threshold=kwargs.get('sns_claim_check_threshold'),
+                compress=kwargs.get('sns_claim_check_compress', False),
+                prefix=kwargs.get('sns_claim_check_prefix'),
+                endpoint=kwargs.get('sns_claim_check_endpoint'),
+                region=kwargs.get('sns_region')
+            )
         self.publisher = publisher
+        self.__publishing = bool(self.sns_arn or kwargs.get('sns_transport'))
+        if kwargs.get('sns_transport'):
+            from syngenta_digital_dta.common import transports  # pylint: disable=C
+            transport_options = kwargs.get('sns_transport_options', {})
+            self.publisher = transports.get_transport(kwargs['sns_transport'], **transport_options)
+        if kwargs.get('sns_async'):
+            from syngenta_digital_dta.common import async_publisher  # pylint: disable=C
+            self.publisher = async_publisher.get_publisher(
+                transport=self.publisher,
+                queue_size=kwargs.get('sns_queue_size'),
+                workers=kwargs.get('sns_workers'),
+                backpressure=kwargs.get('sns_backpressure')
+            )
         self.default_attributes = {
             'model_schema': kwargs.get('model_schema'),
             'model_identifier': kwargs.get('model_identifier'),
             'model_version_key': kwargs.get('model_version_key'),
             'author_identifier': kwargs.get('author_identifier')
         }
+        self.metrics = metrics.get_instrumentation(
+            kwargs.get('metrics'),
+            options=kwargs.get('metrics_options', {}),
+            tracer=kwargs.get('tracing'),
+            tracer_options=kwargs.get('tracing_options', {}),
+            engine=kwargs.get('engine') or type(self).__name__,
+            resource=kwargs.get('table') or kwargs.get('index') or kwargs.get('collection') or kwargs.get('bucket')
+        )
+        self.__attributes = {operation: self.__format_attributes(operation) for operation in OPERATIONS}
 
     def publish(self, db_operation, db_data, **kwargs):
         attributes = self.create_format_attibutes(db_operation)
-        self.publisher.publish(
-            endpoint=self.sns_endpoint,
-            arn=self.sns_arn,
-            attributes=attributes,
-            data=db_data,
-            fifo_group_id=kwargs.get('fifo_group_id'),
-            fifo_duplication_id=kwargs.get('fifo_duplication_id')
-        )
+        with self.metrics.measure(db_operation, 'publish') as measurement:
+            if self.__publishing:
+                measurement.count_payload(db_data)
+            self.publisher.publish(
+                endpoint=self.sns_endpoint,
+                arn=self.sns_arn,
+                attributes=attributes,
+                data=db_data,
+                fifo_group_id=kwargs.get('fifo_group_id'),
+                fifo_duplication_id=kwargs.get('fifo_duplication_id'),
+                **self.sns_options
+            )
+
+    def publish_batch(self, db_operation, db_items, **kwargs):
+        attributes = self.create_format_attibutes(db_operation)
+        entries = [
+            {
+                'data': item,
+                'fifo_group_id': self.__get_fifo_id(kwargs.get('fifo_group_id'), item),
+                'fifo_duplication_id': self.__get_fifo_id(kwargs.get('fifo_duplication_id'), item, index)
+            }
+            for index, item in enumerate(db_items)
+        ]
+        with self.metrics.measure(db_operation, 'publish', items=len(entries)) as measurement:
+            if self.__publishing:
+                measurement.count_payload(db_items)
+            self.publisher.publish_batch(
+                endpoint=self.sns_endpoint,
+                arn=self.sns_arn,
+                attributes=attributes,
+                entries=entries,
+                **self.sns_options
+            )
+
+    def publish_items(self, db_operation, db_items, **kwargs):
+        if self.sns_per_item:
+            self.publish_batch(db_operation, db_items, **kwargs)
+        else:
+            self.publish(db_operation, db_items, **kwargs)
+
+    def __get_fifo_id(self, fifo_id, item, index=None):
+        if callable(fifo_id):
+            return fifo_id(item)
+        if fifo_id and index is not None:
+            return f'{fifo_id}-{index}'
+        return fifo_id
 
     def create_format_attibutes(self, operation):
-        self.default_attributes['operation'] = operation
-        custom_attributes = self.get_attributes()
+        attributes = self.__attributes.get(operation)
+        if attributes is None:
+            attributes = self.__format_attributes(operation)
+            self.__attributes[operation] = attributes
+        return attributes
+
+    def __format_attributes(self, operation):
         formatted_attributes = {}
-        for key, value in custom_attributes.items():
+        for key, value in self.get_attributes(operation).items():
             if value is not None:
                 data_type = 'String' if isinstance(value, str) else 'Number'
-                formatted_attributes[key] = {
+                formatted_attributes[key] = FrozenDict({
                     'DataType': data_type,
                     'StringValue': value
-                }
-        return formatted_attributes
+                })
+        return FrozenDict(formatted_attributes)
 
-    def get_attributes(self):
+    def get_attributes(self, operation=None):
+        default_attributes = {**self.default_attributes, 'operation': operation}
         if self.sns_defaults and self.sns_custom:
-            return {**self.default_attributes, **self.sns_custom}
+            return {**default_attributes, **self.sns_custom}
         if not self.sns_defaults and self.sns_custom:
             return self.sns_custom
         if self.sns_defaults and not self.sns_custom:
-            return self.default_attributes
+            return default_attributes
         return {}
+
+
+class FrozenDict(dict):
+
+    def __readonly(self, *args, **kwargs):
+        raise TypeError(f'{type(self).__name__} is immutable')
+
+    __setitem__ = __delitem__ = __ior__ = __readonly
+    clear = pop = popitem = setdefault = update = __readonly
+
+    def __hash__(self):
+        return hash(frozenset(self.items()))
+
+    def __reduce__(self):
+        return (type(self), (dict(self),))
@@ -0,0 +1,77 @@
+import gzip
+import uuid
+
+from syngenta_digital_dta.common import json_helper
+from syngenta_digital_dta.common import registry
+
+DEFAULT_THRESHOLD = 245760
+DEFAULT_PREFIX = 'sns-claim-check/'
+POINTER_KEY = 'claim_check'
+
+
+class ClaimCheck:
+
+    def __init__(self, **kwargs):
+        self.bucket = kwargs['bucket']
+        self.threshold = kwargs.get('threshold') or DEFAULT_THRESHOLD
+        self.compress = kwargs.get('compress', False)
+        self.prefix = kwargs.get('prefix') or DEFAULT_PREFIX
+        self.endpoint = kwargs.get('endpoint')
+        self.region = kwargs.get('region')
+        self.__storage = None
+
+    def check(self, message):
+        body = message.encode('utf-8')
+        size = len(body)
+        if size <= self.threshold:
+            return message
+        key = f'{self.prefix}{uuid.uuid4()}.json'
+        if self.compress:
+            body = gzip.compress(body)
+            key = f'{key}.gz'
+        if self.__storage is None:
+            from syngenta_digital_dta.s3.adapter import S3Adapter  # pylint: disable=C,R0401
+            self.__storage = S3Adapter(shared=True, bucket=self.bucket, endpoint=self.endpoint, region=self.region)
+        self.__storage.put(s3_path=key, data=body, encode=False, publish=False)
+        pointer = {
+            'bucket': self.bucket,
+            'key': key,
+            'encoding': 'gzip' if self.compress else None,
+            'size': size
+        }
+        return json_helper.dumps({POINTER_KEY: pointer})
+
+
+def get_claim_check(**kwargs):
+    options = {
+        'bucket': kwargs['bucket'],
+        'threshold': kwargs.get('threshold') or DEFAULT_THRESHOLD,
+        'compress': kwargs.get('compress', False),
+        'prefix': kwargs.get('prefix') or DEFAULT_PREFIX,
+        'endpoint': kwargs.get('endpoint'),
+        'region': kwargs.get('region')
+    }
+    return registry.get_or_create('claim_check', options, lambda: ClaimCheck(**options))
+
+
+def is_pointer(message):
+    return isinstance(message, dict) and list(message.keys()) == [POINTER_KEY]
+
+
+def resolve(message, **kwargs):
+    from syngenta_digital_dta.s3.adapter import S3Adapter  # pylint: disable=C,R0401
+    if isinstance(message, (str, bytes)):
+        message = json_helper.loads(message)
+    if not is_pointer(message):
+        return message
+    pointer = message[POINTER_KEY]
+    storage = S3Adapter(
+        shared=True,
+        bucket=pointer['bucket'],
+        endpoint=kwargs.get('endpoint'),
+        region=kwargs.get('region')
+    )
+    body = storage.get(s3_path=pointer['key'], decode=False)['Body'].read()
+    if pointer.get('encoding') == 'gzip':
+        body = gzip.decompress(body)
+    return json_helper.loads(body)
@@ -1,23 +1,54 @@
-import copy
+import collections
 
-import simplejson as json
+Change = collections.namedtuple('Change', ['operation', 'path', 'value'])
 
 
 def merge(original_data, new_data, **kwargs):
-    updated_data = copy.deepcopy(original_data)
-    _walk_dict(updated_data, new_data, **kwargs)
-    return updated_data
+    return _merge_dict(original_data, new_data, **kwargs)
+
+
+def diff(original_data, updated_data):
+    changes = []
+    _diff_dict(original_data, updated_data, (), changes)
+    return changes
+
+
+def _diff_dict(old_data, new_data, path, changes):
+    for key, new_value in new_data.items():
+        if key not in old_data:
+            changes.append(Change('set', path + (key,), new_value))
+            continue
+        old_value = old_data[key]
+        if old_value is new_value:
+            continue
+        if isinstance(old_value, dict) and isinstance(new_value, dict):
+            _diff_dict(old_value, new_value, path + (key,), changes)
+        elif _is_appended(old_value, new_value):
+            changes.append(Change('append', path + (key,), new_value[len(old_value):]))
+        elif old_value != new_value:
+            changes.append(Change('set', path + (key,), new_value))
+    for key in old_data.keys():
+        if key not in new_data:
+            changes.append(Change('unset', path + (key,), None))
 
 
-def _walk_dict(old_data, new_data, **kwargs):
+def _is_appended(old_value, new_value):
+    return (isinstance(old_value, list) and isinstance(new_value, list) and old_value
+            and len(new_value) > len(old_value) and new_value[:len(old_value)] == old_value)
+
+
+def _merge_dict(old_data, new_data, **kwargs):
+    updated_data = dict(old_data)
     for new_key in new_data.keys():
-        if old_data.get(new_key) and isinstance(new_data[new_key], dict):
-            _walk_dict(old_data[new_key], new_data[new_key], **kwargs)
-        elif isinstance(old_data.get(new_key), list) and isinstance(new_data[new_key], list):
-            old_data[new_key] = _merge_lists(old_data[new_key], new_data[new_key],
-                                             kwargs.get('update_list_operation', 'add'))
+        old_value = old_data.get(new_key)
+        if old_value and isinstance(old_value, dict) and isinstance(new_data[new_key], dict):
+            updated_data[new_key] = _merge_dict(old_value, new_data[new_key], **kwargs)
+        elif isinstance(old_value, list) and isinstance(new_data[new_key], list):
+            updated_data[new_key] = _merge_lists(old_value, new_data[new_key],
+                                                 kwargs.get('update_list_operation', 'add'))
         else:
-            _merge_dicts(new_key, old_data, new_data, kwargs.get('update_dict_operation', 'upsert'))
+            _merge_dicts(new_key, updated_data, new_data, kwargs.get('update_dict_operation', 'upsert'))
+    return updated_data
 
 
 def _merge_dicts(dict_key, old_dict, new_dict, update_dict_operation='upsert'):
@@ -29,23 +60,39 @@ def _merge_dicts(dict_key, old_dict, new_dict, update_dict_operation='upsert'):
 
 def _merge_lists(old_list, new_list, update_list_operation='add'):
     if update_list_operation == 'remove':
-        _remove_item_in_list(old_list, new_list)
-    elif update_list_operation == 'add':
-        _add_unique_item_in_list(old_list, new_list)
-    elif update_list_operation == 'replace':
-        old_list = new_list
+        return _remove_item_in_list(old_list, new_list)
+    if update_list_operation == 'add':
+        return _add_unique_item_in_list(old_list, new_list)
+    if update_list_operation == 'replace':
+        return new_list
     return old_list
 
 
 def _remove_item_in_list(old_list, new_list):
-    for old_item in old_list:
-        old = sorted(old_item.items()) if isinstance(old_item, dict) else old_item
-        new = sorted(new_list[0].items()) if isinstance(new_list[0], dict) else new_list[0]
-        if json.dumps(old) == json.dumps(new):
-            old_list.remove(old_item)
+    removed = {_fingerprint(item) for item in new_list}
+    return [item for item in old_list if _fingerprint(item) not in removed]
 
 
 def _add_unique_item_in_list(old_list, new_list):
+    updated_list = list(old_list)
+    existing = {_fingerprint(item) for item in old_list}
     for item in new_list:
-        if item not in old_list:
-            old_list.append(item)
+        fingerprint = _fingerprint(item)
+        if fingerprint not in existing:
+            existing.add(fingerprint)
+            updated_list.append(item)
+    return updated_list
+
+
+def _fingerprint(item):
+    if isinstance(item, dict):
+        return ('dict', frozenset((key, _fingerprint(value)) for key, value in item.items()))
+    if isinstance(item, (list, tuple)):
+        return ('list', tuple(_fingerprint(value) for value in item))
+    if isinstance(item, (set, frozenset)):
+        return ('set', frozenset(_fingerprint(value) for value in item))
+    try:
+        hash(item)
+    except TypeError:
+        return ('repr', repr(item))
+    return item
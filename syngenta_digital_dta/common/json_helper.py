@@ -1,15 +1,159 @@
-import json
+import base64
+import datetime
+import decimal
+import importlib
+import json as _json
+import os
+import re
+import uuid
+
+BACKENDS = ('orjson', 'simplejson', 'json')
+
+_backend = {}
+_long_integer = re.compile(r'\d{19,}')
+_long_integer_bytes = re.compile(rb'\d{19,}')
 
 
 def try_decode_json(possible_json):
     try:
-        return json.loads(possible_json)
+        return loads(possible_json)
     except Exception:
         return possible_json
 
 
 def try_encode_json(possible_json):
     try:
-        return json.dumps(possible_json)
+        return dumps(possible_json)
     except Exception:
         return possible_json
+
+
+def dumps(data, **kwargs):
+    backend = _get_backend()
+    if backend['always_compact']:
+        return backend['dumps'](data, kwargs.get('sort_keys', False))
+    return backend['dumps'](data, kwargs.get('compact', False), kwargs.get('sort_keys', False))
+
+
+def loads(data):
+    return _get_backend()['loads'](data)
+
+
+def get_backend():
+    return _get_backend()['name']
+
+
+def set_backend(name=None):
+    name = name or os.getenv('DTA_JSON_BACKEND')
+    candidates = [name] if name else BACKENDS
+    for candidate in candidates:
+        if candidate not in BACKENDS:
+            raise JSONBackendException(f'json backend must be one of {BACKENDS}')
+        factories = {'orjson': _create_orjson, 'simplejson': _create_simplejson, 'json': _create_json}
+        try:
+            backend = factories[candidate](importlib.import_module(candidate))
+        except ImportError:
+            if name:
+                raise
+            continue
+        _backend.update(name=candidate, **backend)
+        return candidate
+    return None
+
+
+def _get_backend():
+    if not _backend:
+        set_backend()
+    return _backend
+
+
+def _create_orjson(orjson):
+    if not hasattr(orjson, 'Fragment'):
+        raise ImportError('the orjson json backend requires orjson>=3.9')
+
+    def _orjson_default(value):
+        number = _decimal_to_json(value)
+        return orjson.Fragment(number) if number is not None else _default(value)
+
+    def _dumps(data, sort_keys):
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        return orjson.dumps(data, default=_orjson_default, option=option).decode('utf-8')
+
+    def _loads(data):
+        long_integer = _long_integer_bytes if isinstance(data, (bytes, bytearray)) else _long_integer
+        if long_integer.search(data):
+            return _json.loads(data)
+        return orjson.loads(data)
+    return {'dumps': _dumps, 'loads': _loads, 'always_compact': True}
+
+
+def _create_simplejson(simplejson):
+    def _simplejson_default(value):
+        number = _decimal_to_json(value)
+        return simplejson.RawJSON(number) if number is not None else _default(value)
+
+    def _dumps(data, compact, sort_keys):
+        return simplejson.dumps(
+            data,
+            default=_simplejson_default,
+            use_decimal=False,
+            namedtuple_as_object=False,
+            encoding=None,
+            separators=(',', ':') if compact else None,
+            sort_keys=sort_keys
+        )
+
+    def _loads(data):
+        return simplejson.loads(data.decode('utf-8') if isinstance(data, (bytes, bytearray)) else data)
+    return {'dumps': _dumps, 'loads': _loads, 'always_compact': False}
+
+
+def _create_json(json):
+    def _json_default(value):
+        if isinstance(value, decimal.Decimal) and value.is_finite():
+            if value == value.to_integral_value():
+                return int(value)
+            if decimal.Decimal(repr(float(value))) == value:
+                return float(value)
+            raise _InexactDecimal()
+        return _default(value)
+
+    def _dumps(data, compact, sort_keys):
+        try:
+            separators = (',', ':') if compact else None
+            return json.dumps(data, default=_json_default, separators=separators, sort_keys=sort_keys)
+        except _InexactDecimal:
+            return _create_simplejson(importlib.import_module('simplejson'))['dumps'](data, compact, sort_keys)
+    return {'dumps': _dumps, 'loads': json.loads, 'always_compact': False}
+
+
+def _decimal_to_json(value):
+    if not isinstance(value, decimal.Decimal) or not value.is_finite():
+        return None
+    if value == value.to_integral_value():
+        return str(int(value))
+    return str(value)
+
+
+def _default(value):
+    if isinstance(value, decimal.Decimal):
+        return None
+    if isinstance(value, (uuid.UUID, BaseException)):
+        return str(value)
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (bytes, bytearray)):
+        return base64.b64encode(value).decode('ascii')
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    if hasattr(value, '__dict__'):
+        return vars(value)
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+class _InexactDecimal(Exception):
+    pass
+
+
+class JSONBackendException(Exception):
+    pass
@@ -1,11 +1,120 @@
+import atexit
+import collections
 import os
+import random
+import threading
+import weakref
 
 from syngenta_digital_dta.common import json_helper
 
+LEVELS = {'DEBUG': 10, 'INFO': 20, 'WARN': 30, 'WARNING': 30, 'ERROR': 40, 'CRITICAL': 50}
+CLOSE_TIMEOUT = 5
+
+_config = {}
+_handlers = weakref.WeakSet()
+
 
 def log(**kwargs):
-    if not os.getenv('RUN_MODE') == 'unittest':
-        print(json_helper.try_encode_json({
-            'level': kwargs.get('level', 'INFO'),
-            'log': kwargs.get('log', {})
-        }))
+    level = kwargs.get('level', 'INFO')
+    if not is_enabled(level):
+        return False
+    sample = kwargs.get('sample')
+    if sample is not None and random.random() >= sample:
+        return False
+    payload = kwargs.get('log', {})
+    _config['handler']({'level': level, 'log': payload() if callable(payload) else payload})
+    return True
+
+
+def is_enabled(level='INFO'):
+    if not _config:
+        configure()
+    return _config['enabled'] and LEVELS.get(level, LEVELS['INFO']) >= _config['threshold']
+
+
+def configure(**kwargs):
+    level = kwargs.get('level') or os.getenv('DTA_LOG_LEVEL') or 'INFO'
+    if level not in LEVELS:
+        raise LoggerException(f'level must be one of {list(LEVELS)}')
+    enabled = kwargs.get('enabled')
+    _config.update(
+        level=level,
+        threshold=LEVELS[level],
+        enabled=os.getenv('RUN_MODE') != 'unittest' if enabled is None else enabled,
+        handler=kwargs.get('handler') or print_handler
+    )
+    return dict(_config)
+
+
+def print_handler(record):
+    print(json_helper.try_encode_json(record))
+
+
+class AsyncHandler:
+
+    def __init__(self, **kwargs):
+        self.handler = kwargs.get('handler', print_handler)
+        self.queue_size = kwargs.get('queue_size', 10000)
+        self.dropped = 0
+        self.__records = collections.deque()
+        self.__condition = threading.Condition()
+        self.__pending = 0
+        self.__closed = False
+        self.__thread = None
+
+    def __call__(self, record):
+        with self.__condition:
+            if len(self.__records) >= self.queue_size:
+                self.dropped += 1
+                return
+            self.__records.append(record)
+            self.__pending += 1
+            if self.__closed or self.__thread is None:
+                self.__closed = False
+                _handlers.add(self)
+            if self.__thread is None or not self.__thread.is_alive():
+                self.__thread = threading.Thread(target=self.__work, name='dta-async-logger', daemon=True)
+                self.__thread.start()
+            self.__condition.notify_all()
+
+    def flush(self, timeout=None):
+        with self.__condition:
+            return self.__condition.wait_for(lambda: not self.__pending, timeout)
+
+    def close(self, timeout=CLOSE_TIMEOUT):
+        flushed = self.flush(timeout)
+        with self.__condition:
+            self.__closed = True
+            self.__condition.notify_all()
+        _handlers.discard(self)
+        return flushed
+
+    def __work(self):
+        while True:
+            with self.__condition:
+                self.__condition.wait_for(lambda: self.__records or self.__closed)
+                if not self.__records:
+                    return
+                record = self.__records.popleft()
+            try:
+                self.handler(record)
+            except Exception:
+                pass
+            with self.__condition:
+                self.__pending -= 1
+                self.__condition.notify_all()
+
+
+def flush_all(timeout=None):
+    flushed = True
+    for handler in list(_handlers):
+        if not handler.flush(timeout):
+            flushed = False
+    return flushed
+
+
+atexit.register(flush_all, CLOSE_TIMEOUT)
+
+
+class LoggerException(Exception):
+    pass
@@ -0,0 +1,254 @@
+import bisect
+import socket
+import threading
+import time
+
+from syngenta_digital_dta.common import json_helper
+from syngenta_digital_dta.common import registry
+from syngenta_digital_dta.common import tracing
+
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Instrumentation:
+
+    def __init__(self, **kwargs):
+        self.sink = kwargs.get('sink')
+        self.tracer = kwargs.get('tracer')
+        self.engine = kwargs.get('engine')
+        self.resource = kwargs.get('resource')
+
+    def measure(self, operation, phase, **counts):
+        return Measurement(self, operation, phase, counts)
+
+    def start_span(self, operation, phase):
+        if self.tracer is None:
+            return None
+        name = f'{self.engine}.{operation}' if phase == 'call' else f'{self.engine}.{operation}.{phase}'
+        attributes = {'db.system': self.engine, 'db.operation': operation, 'dta.phase': phase}
+        if self.resource:
+            attributes['dta.resource'] = self.resource
+        try:
+            return self.tracer.start(name, attributes)
+        except Exception:
+            return None
+
+    def record(self, event, span=None, error=None):
+        if span is not None:
+            try:
+                span.end({f'dta.{name}': value for name, value in event['counts'].items()}, error)
+            except Exception:
+                pass
+        if self.sink is not None:
+            try:
+                self.sink.record(event)
+            except Exception:
+                pass
+
+
+class Measurement:
+
+    def __init__(self, instrumentation, operation, phase, counts):
+        self.instrumentation = instrumentation
+        self.operation = operation
+        self.phase = phase
+        self.counts = counts
+        self.start = None
+        self.span = None
+
+    def __enter__(self):
+        self.span = self.instrumentation.start_span(self.operation, self.phase)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, error_type, error, traceback):
+        self.instrumentation.record({
+            'engine': self.instrumentation.engine,
+            'operation': self.operation,
+            'phase': self.phase,
+            'duration': time.perf_counter() - self.start,
+            'error': error_type is not None,
+            'counts': self.counts
+        }, self.span, error)
+
+    def count(self, **counts):
+        for name, value in counts.items():
+            self.counts[name] = self.counts.get(name, 0) + value
+
+    def count_payload(self, payload):
+        try:
+            self.count(bytes=len(json_helper.dumps(payload, compact=True).encode('utf-8')))
+        except (TypeError, ValueError):
+            pass
+
+
+class NullInstrumentation:
+
+    def measure(self, *_args, **_counts):
+        return NULL_MEASUREMENT
+
+
+class NullMeasurement:
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, error_type, error, traceback):
+        return None
+
+    def count(self, **_counts):
+        return None
+
+    def count_payload(self, _payload):
+        return None
+
+
+NULL_MEASUREMENT = NullMeasurement()
+NULL_INSTRUMENTATION = NullInstrumentation()
+
+
+class MemorySink:
+
+    def __init__(self, **kwargs):
+        self.buckets = kwargs.get('buckets', BUCKETS)
+        self.__lock = threading.Lock()
+        self.__histograms = {}
+
+    def record(self, event):
+        key = (event['engine'], event['operation'], event['phase'])
+        with self.__lock:
+            histogram = self.__histograms.get(key)
+            if histogram is None:
+                histogram = {
+                    'count': 0,
+                    'errors': 0,
+                    'total': 0.0,
+                    'min': event['duration'],
+                    'max': event['duration'],
+                    'buckets': [0] * (len(self.buckets) + 1),
+                    'counts': {}
+                }
+                self.__histograms[key] = histogram
+            histogram['count'] += 1
+            histogram['errors'] += int(event['error'])
+            histogram['total'] += event['duration']
+            histogram['min'] = min(histogram['min'], event['duration'])
+            histogram['max'] = max(histogram['max'], event['duration'])
+            histogram['buckets'][bisect.bisect_left(self.buckets, event['duration'])] += 1
+            for name, value in event['counts'].items():
+                histogram['counts'][name] = histogram['counts'].get(name, 0) + value
+
+    def get_stats(self):
+        with self.__lock:
+            histograms = {
+                key: dict(histogram, counts=dict(histogram['counts'])) for key, histogram in self.__histograms.items()
+            }
+        stats = []
+        for (engine, operation, phase), histogram in histograms.items():
+            stats.append({
+                'engine': engine,
+                'operation': operation,
+                'phase': phase,
+                'count': histogram['count'],
+                'errors': histogram['errors'],
+                'avg': histogram['total'] / histogram['count'],
+                'min': histogram['min'],
+                'max': histogram['max'],
+                'p50': self.__percentile(histogram, 0.5),
+                'p99': self.__percentile(histogram, 0.99),
+                **histogram['counts']
+            })
+        return stats
+
+    def reset(self):
+        with self.__lock:
+            self.__histograms.clear()
+
+    def __percentile(self, histogram, percentile):
+        rank = percentile * histogram['count']
+        seen = 0
+        for index, count in enumerate(histogram['buckets']):
+            seen += count
+            if seen >= rank:
+                return min(self.buckets[index], histogram['max']) if index < len(self.buckets) else histogram['max']
+        return histogram['max']
+
+
+class StatsDSink:
+
+    def __init__(self, **kwargs):
+        self.address = (kwargs.get('host', '127.0.0.1'), kwargs.get('port', 8125))
+        self.prefix = kwargs.get('prefix', 'syngenta_digital_dta')
+        self.__socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.__socket.setblocking(False)
+
+    def record(self, event):
+        name = '.'.join(str(part) for part in (self.prefix, event['engine'], event['operation'], event['phase']))
+        lines = [f'{name}.duration:{event["duration"] * 1000:.3f}|ms']
+        if event['error']:
+            lines.append(f'{name}.errors:1|c')
+        lines.extend(f'{name}.{count}:{value}|c' for count, value in event['counts'].items())
+        try:
+            self.__socket.sendto('\n'.join(lines).encode('utf-8'), self.address)
+        except OSError:
+            pass
+
+    def close(self):
+        self.__socket.close()
+
+
+class EMFSink:
+
+    def __init__(self, **kwargs):
+        self.namespace = kwargs.get('namespace', 'syngenta_digital_dta')
+        self.handler = kwargs.get('handler', print)
+
+    def record(self, event):
+        metrics = [{'Name': 'duration', 'Unit': 'Milliseconds'}, {'Name': 'errors', 'Unit': 'Count'}]
+        metrics.extend({'Name': count, 'Unit': 'Bytes' if count == 'bytes' else 'Count'} for count in event['counts'])
+        self.handler(json_helper.dumps({
+            '_aws': {
+                'Timestamp': int(time.time() * 1000),
+                'CloudWatchMetrics': [{
+                    'Namespace': self.namespace,
+                    'Dimensions': [['engine', 'operation', 'phase']],
+                    'Metrics': metrics
+                }]
+            },
+            'engine': event['engine'],
+            'operation': event['operation'],
+            'phase': event['phase'],
+            'duration': event['duration'] * 1000,
+            'errors': int(event['error']),
+            **event['counts']
+        }))
+
+
+SINKS = {
+    'memory': MemorySink,
+    'statsd': StatsDSink,
+    'emf': EMFSink
+}
+
+
+def get_sink(sink, **kwargs):
+    if not isinstance(sink, str):
+        return sink
+    if sink not in SINKS:
+        raise MetricsException(f'metrics sink must be one of {list(SINKS)}')
+    return registry.get_or_create(f'{sink}_metrics', kwargs, lambda: SINKS[sink](**kwargs))
+
+
+def get_instrumentation(sink=None, **kwargs):
+    if not sink and not kwargs.get('tracer'):
+        return NULL_INSTRUMENTATION
+    return Instrumentation(
+        sink=get_sink(sink, **kwargs.get('options', {})) if sink else None,
+        tracer=tracing.get_tracer(kwargs.get('tracer'), **kwargs.get('tracer_options', {})),
+        engine=kwargs.get('engine'),
+        resource=kwargs.get('resource')
+    )
+
+
+class MetricsException(Exception):
+    pass
@@ -1,17 +1,20 @@
-import boto3
-import simplejson as json
-
+from syngenta_digital_dta.common import json_helper
 from syngenta_digital_dta.common import logger
+from syngenta_digital_dta.common import registry
+
+DEFAULT_POOL_SIZE = 10
+MAX_BATCH_ENTRIES = 10
+MAX_BATCH_BYTES = 262144
 
 
 def publish(**kwargs):
     if not kwargs.get('arn') or not kwargs.get('data'):
         return
     try:
-        publisher = boto3.client('sns', region_name=kwargs.get('region'), endpoint_url=kwargs.get('endpoint'))
+        publisher = get_client(**kwargs)
         publish_kwargs = {
             'TopicArn': kwargs['arn'],
-            'Message': json.dumps(kwargs['data']),
+            'Message': create_message(kwargs['data'], kwargs.get('claim_check')),
             'MessageAttributes': kwargs.get('attributes', {})
         }
         if kwargs.get('fifo_group_id'):
@@ -21,3 +24,93 @@ def publish(**kwargs):
         publisher.publish(**publish_kwargs)
     except Exception as e:
         logger.log(level='WARN', log={'error': f'publish_sns_error: {e}'})
+
+
+def publish_batch(**kwargs):
+    if not kwargs.get('arn') or not kwargs.get('entries'):
+        return
+    try:
+        publisher = get_client(**kwargs)
+        entries = [create_batch_entry(index, entry, **kwargs) for index, entry in enumerate(kwargs['entries'])]
+    except Exception as e:
+        logger.log(level='WARN', log={'error': f'publish_sns_error: {e}'})
+        return
+    for batch in coalesce([entry for entry in entries if entry]):
+        try:
+            response = publisher.publish_batch(TopicArn=kwargs['arn'], PublishBatchRequestEntries=batch)
+            for failed in response.get('Failed', []):
+                error = f'publish_sns_batch_error: {failed["Id"]}: {failed.get("Message")}'
+                logger.log(level='WARN', log={'error': error})
+        except Exception as e:
+            logger.log(level='WARN', log={'error': f'publish_sns_error: {e}'})
+
+
+def create_batch_entry(index, entry, **kwargs):
+    if not entry.get('data'):
+        return None
+    batch_entry = {
+        'Id': str(index),
+        'Message': create_message(entry['data'], kwargs.get('claim_check')),
+        'MessageAttributes': entry.get('attributes', kwargs.get('attributes', {}))
+    }
+    if entry.get('fifo_group_id', kwargs.get('fifo_group_id')):
+        batch_entry['MessageGroupId'] = entry.get('fifo_group_id', kwargs.get('fifo_group_id'))
+    if entry.get('fifo_duplication_id'):
+        batch_entry['MessageDeduplicationId'] = entry['fifo_duplication_id']
+    return batch_entry
+
+
+def create_message(data, claim_check=None):
+    message = json_helper.dumps(data)
+    if claim_check:
+        return claim_check.check(message)
+    return message
+
+
+def coalesce(entries):
+    batch = []
+    batch_bytes = 0
+    for entry in entries:
+        entry_bytes = _entry_size(entry)
+        if batch and (len(batch) == MAX_BATCH_ENTRIES or batch_bytes + entry_bytes > MAX_BATCH_BYTES):
+            yield batch
+            batch = []
+            batch_bytes = 0
+        batch.append(entry)
+        batch_bytes += entry_bytes
+    if batch:
+        yield batch
+
+
+def _entry_size(entry):
+    size = len(entry['Message'].encode('utf-8'))
+    for name, attribute in entry['MessageAttributes'].items():
+        size += len(name.encode('utf-8')) + len(attribute.get('DataType', ''))
+        size += len(str(attribute.get('StringValue', '')).encode('utf-8'))
+    return size
+
+
+def get_client(**kwargs):
+    config = {
+        'region': kwargs.get('region'),
+        'endpoint': kwargs.get('endpoint'),
+        'aws_access_key_id': kwargs.get('aws_access_key_id'),
+        'aws_secret_access_key': kwargs.get('aws_secret_access_key'),
+        'aws_session_token': kwargs.get('aws_session_token'),
+        'pool_size': kwargs.get('pool_size') or DEFAULT_POOL_SIZE
+    }
+    return registry.get_or_create('sns', config, lambda: _create_client(**config))
+
+
+def _create_client(**config):
+    import boto3  # pylint: disable=C
+    from botocore.config import Config  # pylint: disable=C
+    return boto3.client(
+        'sns',
+        region_name=config['region'],
+        endpoint_url=config['endpoint'],
+        aws_access_key_id=config['aws_access_key_id'],
+        aws_secret_access_key=config['aws_secret_access_key'],
+        aws_session_token=config['aws_session_token'],
+        config=Config(max_pool_connections=config['pool_size'], tcp_keepalive=True)
+    )
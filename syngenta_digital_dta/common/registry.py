@@ -0,0 +1,70 @@
+import json
+import threading
+import time
+
+from syngenta_digital_dta.common import logger
+
+REDACTED_KEYS = ('password', 'secret', 'token')
+
+_lock = threading.Lock()
+_entries = {}
+_pending = {}
+
+
+def get_or_create(kind, config, factory):
+    key = (kind, json.dumps(config, sort_keys=True, default=repr))
+    while True:
+        with _lock:
+            entry = _entries.get(key)
+            if entry is not None:
+                entry['hits'] += 1
+                entry['last_used'] = time.time()
+                return entry['instance']
+            creating = _pending.setdefault(key, threading.Lock())
+        with creating:
+            with _lock:
+                if key in _entries:
+                    continue
+            instance = factory()
+            with _lock:
+                _entries[key] = {
+                    'kind': kind,
+                    'config': _redact(config),
+                    'instance': instance,
+                    'created': time.time(),
+                    'last_used': time.time(),
+                    'hits': 0
+                }
+                _pending.pop(key, None)
+            return instance
+
+
+def get_stats():
+    with _lock:
+        return [{stat: value for stat, value in entry.items() if stat != 'instance'} for entry in _entries.values()]
+
+
+def close_all():
+    with _lock:
+        entries = list(_entries.values())
+        _entries.clear()
+    for entry in entries:
+        _close(entry)
+
+
+def _close(entry):
+    instance = entry['instance']
+    try:
+        if callable(getattr(instance, 'close', None)):
+            instance.close()
+        elif hasattr(instance, 'meta') and hasattr(instance.meta, 'client'):
+            instance.meta.client.close()
+    except Exception as error:
+        logger.log(level='WARN', log={'error': f'registry_close_error: {entry["kind"]}: {error}'})
+
+
+def _redact(config):
+    return {
+        key: '***' if any(redacted in key.lower() for redacted in REDACTED_KEYS) else value
+        for key, value in config.items()
+    }
@@ -0,0 +1,62 @@
+import argparse
+
+from syngenta_digital_dta.common import json_helper
+from syngenta_digital_dta.common import schema_loader
+
+
+def compile_schemas(schema_file, schema_keys=None):
+    schemas = schema_loader.parse_schemas(schema_file, proxies=False)
+    compiled_schemas = {schema_key: schemas[schema_key] for schema_key in (schema_keys or schemas.keys())}
+    for schema_key, schema in compiled_schemas.items():
+        recursive_path = _find_recursion(schema, [schema_key], set())
+        if recursive_path:
+            raise SchemaCompileException(
+                f'{schema_key} cannot be precompiled: recursive $ref at {"/".join(recursive_path)}; '
+                'leave it out with --schema and it will be resolved from the openapi file at runtime'
+            )
+    artifact = {
+        'version': schema_loader.ARTIFACT_VERSION,
+        'source_hash': schema_loader.hash_file(schema_file),
+        'schemas': compiled_schemas
+    }
+    contents = json_helper.dumps(artifact, compact=True)
+    output = schema_loader.artifact_path(schema_file)
+    with open(output, 'w', encoding='UTF-8') as compiled:
+        compiled.write(contents)
+    return output
+
+
+def _find_recursion(value, path, ancestors):
+    if not isinstance(value, (dict, list)):
+        return None
+    if id(value) in ancestors:
+        return path
+    ancestors.add(id(value))
+    children = value.items() if isinstance(value, dict) else enumerate(value)
+    for key, child in children:
+        recursive_path = _find_recursion(child, path + [str(key)], ancestors)
+        if recursive_path:
+            return recursive_path
+    ancestors.remove(id(value))
+    return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='precompile resolved openapi schemas for fast cold starts')
+    parser.add_argument('schema_file', help='path to the openapi file the adapters use as model_schema_file')
+    parser.add_argument('--schema', action='append', dest='schema_keys',
+                        help='schema key used by an adapter (repeatable); defaults to all components.schemas')
+    args = parser.parse_args(argv)
+    try:
+        output = compile_schemas(args.schema_file, args.schema_keys)
+    except SchemaCompileException as error:
+        parser.error(str(error))
+    print(output)
+
+
+class SchemaCompileException(Exception):
+    pass
+
+
+if __name__ == '__main__':
+    main()
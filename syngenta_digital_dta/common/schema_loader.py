@@ -1,9 +1,88 @@
-import simplejson as json
-import jsonref
-import yaml
+import hashlib
+import os
+import threading
+
+from syngenta_digital_dta.common import json_helper
+
+ARTIFACT_SUFFIX = '.compiled.json'
+ARTIFACT_VERSION = 1
+
+_lock = threading.Lock()
+_registry = {}
+_stats = {'hits': 0, 'misses': 0, 'invalidations': 0, 'artifacts': 0}
 
 
 def load_schema(schema_file, schema_key):
+    schemas = _get_schemas(schema_file)
+    if schema_key not in schemas and os.path.exists(schema_file):
+        schemas = _get_schemas(schema_file, use_artifact=False)
+    return schemas[schema_key]
+
+
+def get_stats():
+    with _lock:
+        return {**_stats, 'files': len(_registry)}
+
+
+def invalidate(schema_file=None):
+    with _lock:
+        if schema_file is None:
+            _registry.clear()
+        else:
+            _registry.pop(os.path.abspath(schema_file), None)
+        _stats['invalidations'] += 1
+
+
+def artifact_path(schema_file):
+    return f'{schema_file}{ARTIFACT_SUFFIX}'
+
+
+def hash_file(schema_file):
+    with open(schema_file, 'rb') as source:
+        return hashlib.sha256(source.read()).hexdigest()
+
+
+def parse_schemas(schema_file, proxies=True):
+    import jsonref  # pylint: disable=C
+    import yaml  # pylint: disable=C
     with open(schema_file, encoding='UTF-8') as openapi:
         api_doc = yaml.load(openapi, Loader=yaml.FullLoader)
-    return jsonref.loads(json.dumps(api_doc))['components']['schemas'][schema_key]
+    return jsonref.loads(json_helper.dumps(api_doc), proxies=proxies)['components']['schemas']
+
+
+def _get_schemas(schema_file, use_artifact=True):
+    path = os.path.abspath(schema_file)
+    signature = _get_signature(path)
+    with _lock:
+        entry = _registry.get(path)
+        if entry and entry['signature'] == signature and (use_artifact or entry['source'] == 'openapi'):
+            _stats['hits'] += 1
+            return entry['schemas']
+        _stats['misses'] += 1
+    source, schemas = _load_artifact(path) if use_artifact else (None, None)
+    if schemas is None:
+        source, schemas = 'openapi', parse_schemas(path)
+    with _lock:
+        _registry[path] = {'signature': signature, 'source': source, 'schemas': schemas}
+    return schemas
+
+
+def _get_signature(path):
+    if not os.path.exists(path) and os.path.exists(artifact_path(path)):
+        path = artifact_path(path)
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _load_artifact(path):
+    if not os.path.exists(artifact_path(path)):
+        return None, None
+    with open(artifact_path(path), 'rb') as compiled:
+        artifact = json_helper.loads(compiled.read())
+    if artifact.get('version') != ARTIFACT_VERSION:
+        return None, None
+    if os.path.exists(path) and artifact.get('source_hash') != hash_file(path):
+        return None, None
+    with _lock:
+        _stats['artifacts'] += 1
+    return 'artifact', artifact['schemas']
@@ -1,36 +1,132 @@
+import collections
+import itertools
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
 from syngenta_digital_dta.common import schema_loader
 
+_lock = threading.Lock()
+_plans = {}
+
 
 def map_to_schema(data, schema_file, schema_key):
-    model_data = {}
+    return compile_schema(schema_file, schema_key).project(data)
+
+
+def map_partial(data, schema_file, schema_key):
+    return compile_schema(schema_file, schema_key).project_partial(data)
+
+
+def map_many(records, schema_file, schema_key, **kwargs):
+    plan = compile_schema(schema_file, schema_key)
+    if kwargs.get('processes'):
+        return _map_parallel(plan, records, kwargs['processes'], kwargs.get('chunk_size', 1000))
+    return map(plan.project, records)
+
+
+def map_batches(records, schema_file, schema_key, batch_size, **kwargs):
+    return _chunk(map_many(records, schema_file, schema_key, **kwargs), batch_size)
+
+
+def compile_schema(schema_file, schema_key):
     model_schema = schema_loader.load_schema(schema_file, schema_key)
+    with _lock:
+        cached = _plans.get((schema_file, schema_key))
+    if cached and cached[0] is model_schema:
+        return cached[1]
+    plan = SchemaPlan(_compile_model(model_schema))
+    with _lock:
+        _plans[(schema_file, schema_key)] = (model_schema, plan)
+    return plan
+
+
+def _map_parallel(plan, records, processes, chunk_size):
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        pending = collections.deque()
+        for chunk in _chunk(records, chunk_size):
+            pending.append(executor.submit(plan.project_many, chunk))
+            if len(pending) > processes * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def _chunk(records, chunk_size):
+    records = iter(records)
+    chunk = list(itertools.islice(records, chunk_size))
+    while chunk:
+        yield chunk
+        chunk = list(itertools.islice(records, chunk_size))
+
+
+def _compile_model(model_schema):
+    fields = {}
     schemas = model_schema['allOf'] if model_schema.get('allOf') else [model_schema]
     for model in schemas:
         if model.get('type') == 'object':
-            _populate_model_data(model.get('properties', {}), data, model_data)
-    return model_data
-
-
-def _populate_model_data(properties, data, model_data):
-    if data and isinstance(data, dict):
-        _populate_model_dict(properties, data, model_data)
-    return model_data
+            fields.update(_compile_properties(model.get('properties', {})))
+    return fields
 
 
-def _populate_model_dict(properties, data, model_data):
+def _compile_properties(properties):
+    fields = {}
     for property_key, property_value in properties.items():
-        model_data[property_key] = {}
         if property_value.get('properties'):
-            _populate_model_data(property_value['properties'], data.get(property_key), model_data[property_key])
+            fields[property_key] = ObjectProjector(_compile_properties(property_value['properties']))
         elif property_value.get('items', {}).get('properties'):
-            _populate_model_list(model_data, property_key, property_value, data)
+            item_projector = ObjectProjector(_compile_properties(property_value['items']['properties']))
+            fields[property_key] = ListProjector(item_projector)
         else:
-            model_data[property_key] = data.get(property_key)
+            fields[property_key] = None
+    return fields
+
+
+class ObjectProjector:
+    __slots__ = ('fields',)
+
+    def __init__(self, fields):
+        self.fields = tuple(fields.items())
+
+    def project(self, data):
+        model_data = {}
+        if data and isinstance(data, dict):
+            for property_key, projector in self.fields:
+                if projector is None:
+                    model_data[property_key] = data.get(property_key)
+                else:
+                    model_data[property_key] = projector.project(data.get(property_key))
+        return model_data
+
+    def project_partial(self, data):
+        model_data = {}
+        if data and isinstance(data, dict):
+            for property_key, projector in self.fields:
+                if property_key not in data:
+                    continue
+                if projector is None:
+                    model_data[property_key] = data[property_key]
+                elif isinstance(projector, ObjectProjector) and isinstance(data[property_key], dict):
+                    model_data[property_key] = projector.project_partial(data[property_key])
+                else:
+                    model_data[property_key] = projector.project(data[property_key])
+        return model_data
+
+
+class ListProjector:
+    __slots__ = ('item_projector',)
+
+    def __init__(self, item_projector):
+        self.item_projector = item_projector
+
+    def project(self, data):
+        if not isinstance(data, list):
+            return []
+        project = self.item_projector.project
+        return [project(item) for item in data]
+
 
+class SchemaPlan(ObjectProjector):
+    __slots__ = ()
 
-def _populate_model_list(model_data, property_key, property_value, data):
-    model_data[property_key] = []
-    for index in range(len(data.get(property_key, []))):
-        if data.get(property_key) and isinstance(data[property_key], list) and index < len(data[property_key]):
-            pop = _populate_model_data(property_value['items']['properties'], data[property_key][index], {})
-            model_data[property_key].append(pop)
+    def project_many(self, records):
+        return [self.project(record) for record in records]
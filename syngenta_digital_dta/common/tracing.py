@@ -0,0 +1,127 @@
+import contextvars
+import functools
+import itertools
+import threading
+import time
+
+from syngenta_digital_dta.common import registry
+
+_ids = itertools.count(1)
+_active_span = contextvars.ContextVar('dta_active_span', default=None)
+
+
+class MemoryTracer:
+
+    def __init__(self, **kwargs):
+        self.max_spans = kwargs.get('max_spans', 10000)
+        self.spans = []
+        self.__lock = threading.Lock()
+
+    def start(self, name, attributes):
+        parent = _active_span.get()
+        span = {
+            'id': next(_ids),
+            'parent_id': parent['id'] if parent else None,
+            'name': name,
+            'attributes': dict(attributes),
+            'start': time.time(),
+            'end': None,
+            'error': None
+        }
+        return MemorySpan(self, span, _active_span.set(span))
+
+    def finish(self, span):
+        with self.__lock:
+            if len(self.spans) < self.max_spans:
+                self.spans.append(span)
+
+    def get_spans(self):
+        with self.__lock:
+            return list(self.spans)
+
+    def clear(self):
+        with self.__lock:
+            self.spans.clear()
+
+
+class MemorySpan:
+
+    def __init__(self, tracer, span, token):
+        self.tracer = tracer
+        self.span = span
+        self.token = token
+
+    def end(self, attributes, error=None):
+        self.span['attributes'].update(attributes)
+        self.span['error'] = repr(error) if error else None
+        self.span['end'] = time.time()
+        self.tracer.finish(self.span)
+        try:
+            _active_span.reset(self.token)
+        except (ValueError, RuntimeError):
+            pass
+
+
+class OpenTelemetryTracer:
+
+    def __init__(self, **kwargs):
+        from opentelemetry import trace  # pylint: disable=C
+        self.trace = trace
+        self.tracer = kwargs.get('tracer') or trace.get_tracer('syngenta_digital_dta')
+
+    def start(self, name, attributes):
+        span = self.tracer.start_span(name, attributes=attributes)
+        activation = self.trace.use_span(span, end_on_exit=False)
+        activation.__enter__()
+        return OpenTelemetrySpan(self.trace, span, activation)
+
+
+class OpenTelemetrySpan:
+
+    def __init__(self, trace, span, activation):
+        self.trace = trace
+        self.span = span
+        self.activation = activation
+
+    def end(self, attributes, error=None):
+        self.span.set_attributes(attributes)
+        if error:
+            self.span.record_exception(error)
+            self.span.set_status(self.trace.Status(self.trace.StatusCode.ERROR, str(error)))
+        self.span.end()
+        try:
+            self.activation.__exit__(None, None, None)
+        except Exception:
+            pass
+
+
+TRACERS = {
+    'memory': MemoryTracer,
+    'opentelemetry': OpenTelemetryTracer
+}
+
+
+def get_tracer(tracer=None, **kwargs):
+    if not tracer:
+        return None
+    if tracer is True:
+        tracer = 'opentelemetry'
+    if not isinstance(tracer, str):
+        return tracer
+    if tracer not in TRACERS:
+        raise TracingException(f'tracer must be one of {list(TRACERS)}')
+    return registry.get_or_create(f'{tracer}_tracer', kwargs, lambda: TRACERS[tracer](**kwargs))
+
+
+def traced(operation):
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.metrics.measure(operation, 'call'):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class TracingException(Exception):
+    pass
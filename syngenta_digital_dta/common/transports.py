@@ -0,0 +1,168 @@
+import collections
+import threading
+import time
+
+from syngenta_digital_dta.common import json_helper
+from syngenta_digital_dta.common import logger
+from syngenta_digital_dta.common import publisher
+from syngenta_digital_dta.common import registry
+
+DEFAULT_CAPACITY = 10000
+
+
+class SQSTransport:
+
+    def __init__(self, **kwargs):
+        self.queue_url = kwargs['queue_url']
+        self.client_options = {
+            'region': kwargs.get('region'),
+            'endpoint': kwargs.get('endpoint'),
+            'pool_size': kwargs.get('pool_size') or publisher.DEFAULT_POOL_SIZE
+        }
+        self.__client = None
+
+    def publish(self, **kwargs):
+        if not kwargs.get('data'):
+            return
+        try:
+            send_kwargs = {
+                'QueueUrl': self.queue_url,
+                'MessageBody': publisher.create_message(kwargs['data'], kwargs.get('claim_check')),
+                'MessageAttributes': kwargs.get('attributes', {})
+            }
+            if kwargs.get('fifo_group_id'):
+                send_kwargs['MessageGroupId'] = kwargs['fifo_group_id']
+            if kwargs.get('fifo_duplication_id'):
+                send_kwargs['MessageDeduplicationId'] = kwargs['fifo_duplication_id']
+            self.__get_client().send_message(**send_kwargs)
+        except Exception as e:
+            logger.log(level='WARN', log={'error': f'publish_sqs_error: {e}'})
+
+    def publish_batch(self, **kwargs):
+        if not kwargs.get('entries'):
+            return
+        try:
+            entries = [
+                publisher.create_batch_entry(index, entry, **kwargs)
+                for index, entry in enumerate(kwargs['entries'])
+            ]
+            client = self.__get_client()
+        except Exception as e:
+            logger.log(level='WARN', log={'error': f'publish_sqs_error: {e}'})
+            return
+        for batch in publisher.coalesce([entry for entry in entries if entry]):
+            try:
+                response = client.send_message_batch(
+                    QueueUrl=self.queue_url,
+                    Entries=[self.__to_sqs_entry(entry) for entry in batch]
+                )
+                for failed in response.get('Failed', []):
+                    error = f'publish_sqs_batch_error: {failed["Id"]}: {failed.get("Message")}'
+                    logger.log(level='WARN', log={'error': error})
+            except Exception as e:
+                logger.log(level='WARN', log={'error': f'publish_sqs_error: {e}'})
+
+    def __to_sqs_entry(self, entry):
+        sqs_entry = {key: value for key, value in entry.items() if key != 'Message'}
+        sqs_entry['MessageBody'] = entry['Message']
+        return sqs_entry
+
+    def __get_client(self):
+        if self.__client is None:
+            self.__client = registry.get_or_create(
+                'sqs', self.client_options, lambda: _create_sqs_client(**self.client_options)
+            )
+        return self.__client
+
+
+class MemoryTransport:
+
+    def __init__(self, **kwargs):
+        self.capacity = kwargs.get('capacity') or DEFAULT_CAPACITY
+        self.messages = collections.deque(maxlen=self.capacity)
+
+    def publish(self, **kwargs):
+        if kwargs.get('data'):
+            self.messages.append(_create_record(kwargs, kwargs))
+
+    def publish_batch(self, **kwargs):
+        self.messages.extend(_create_record(entry, kwargs) for entry in kwargs.get('entries', []) if entry.get('data'))
+
+    def get_messages(self):
+        return list(self.messages)
+
+    def clear(self):
+        self.messages.clear()
+
+
+class FileTransport:
+
+    def __init__(self, **kwargs):
+        self.path = kwargs['path']
+        self.__lock = threading.Lock()
+        self.__file = None
+
+    def publish(self, **kwargs):
+        if kwargs.get('data'):
+            self.__write([_create_record(kwargs, kwargs)])
+
+    def publish_batch(self, **kwargs):
+        self.__write([_create_record(entry, kwargs) for entry in kwargs.get('entries', []) if entry.get('data')])
+
+    def close(self):
+        with self.__lock:
+            if self.__file is not None:
+                self.__file.close()
+                self.__file = None
+
+    def __write(self, records):
+        if not records:
+            return
+        lines = ''.join(f'{json_helper.dumps(record)}\n' for record in records)
+        with self.__lock:
+            if self.__file is None:
+                self.__file = open(self.path, 'a', encoding='utf-8')  # pylint: disable=R1732
+            self.__file.write(lines)
+            self.__file.flush()
+
+
+TRANSPORTS = {
+    'sqs': SQSTransport,
+    'memory': MemoryTransport,
+    'file': FileTransport
+}
+
+
+def get_transport(transport=None, **kwargs):
+    if transport is None or transport == 'sns':
+        return publisher
+    if not isinstance(transport, str):
+        return transport
+    if transport not in TRANSPORTS:
+        raise TransportException(f'transport must be one of {["sns", *TRANSPORTS]}')
+    return registry.get_or_create(f'{transport}_transport', kwargs, lambda: TRANSPORTS[transport](**kwargs))
+
+
+def _create_record(message, defaults):
+    return {
+        'timestamp': time.time(),
+        'attributes': message.get('attributes', defaults.get('attributes', {})),
+        'data': message['data'],
+        'fifo_group_id': message.get('fifo_group_id', defaults.get('fifo_group_id')),
+        'fifo_duplication_id': message.get('fifo_duplication_id')
+    }
+
+
+def _create_sqs_client(**config):
+    import boto3  # pylint: disable=C
+    from botocore.config import Config  # pylint: disable=C
+    return boto3.client(
+        'sqs',
+        region_name=config['region'],
+        endpoint_url=config['endpoint'],
+        config=Config(max_pool_connections=config['pool_size'], tcp_keepalive=True)
+    )
+
+
+class TransportException(Exception):
+    pass
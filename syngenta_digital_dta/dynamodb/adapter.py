@@ -1,11 +1,25 @@
-from functools import lru_cache
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 import boto3
 from boto3.dynamodb.conditions import Attr
 
 from syngenta_digital_dta.common import schema_mapper
 from syngenta_digital_dta.common import dict_merger
+from syngenta_digital_dta.common import registry
+from syngenta_digital_dta.common import tracing
 from syngenta_digital_dta.common.base_adapter import BaseAdapter
+from syngenta_digital_dta.dynamodb import pagination
+from syngenta_digital_dta.dynamodb import update_expression
+
+
+MAX_BATCH_GET_KEYS = 100
+MAX_BATCH_WRITE_ITEMS = 25
+SESSION_OPTIONS = ('region', 'aws_access_key_id', 'aws_secret_access_key', 'aws_session_token')
+
+_resource_classes = {}
 
 
 class BatchItemException(Exception):
@@ -16,15 +30,29 @@ class DynamodbAdapter(BaseAdapter):
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.table = self._get_dynamo_table(kwargs['table'], kwargs.get('endpoint'))
+        self.shared = kwargs.get('shared', False)
+        self.endpoint = kwargs.get('endpoint')
+        self.session_options = {option: kwargs[option] for option in SESSION_OPTIONS if kwargs.get(option)}
+        self.table_name = kwargs['table']
         self.model_schema_file = kwargs['model_schema_file']
         self.model_schema = kwargs['model_schema']
         self.model_identifier = kwargs['model_identifier']
         self.model_version_key = kwargs['model_version_key']
+        self.client = self._get_dynamo_client()
+        self.__local = threading.local()
+
+    @property
+    def table(self):
+        table = getattr(self.__local, 'table', None)
+        if table is None:
+            table = self.__local.table = _resource_classes['dynamodb'](client=self.client).Table(self.table_name)
+        return table
 
-    @lru_cache(maxsize=128)
-    def _get_dynamo_table(self, table, endpoint=None):
-        return boto3.resource('dynamodb', endpoint_url=endpoint).Table(table)
+    def _get_dynamo_client(self):
+        config = {'endpoint': self.endpoint, **self.session_options}
+        if self.shared:
+            return registry.get_or_create('dynamodb_client', config, lambda: _create_client(**config))
+        return _create_client(**config)
 
     def create(self, **kwargs):
         if kwargs.get('operation') == 'overwrite':
@@ -38,68 +66,298 @@ class DynamodbAdapter(BaseAdapter):
             return self.scan(**kwargs)
         return self.get(**kwargs)
 
+    @tracing.traced('scan')
     def scan(self, **kwargs):
+        with self.metrics.measure('scan', 'db') as measurement:
+            result = self.table.scan(**kwargs.get('query', {}))
+            measurement.count(items=result.get('Count', 0))
+            measurement.count_payload(result.get('Items', []))
         if kwargs.get('raw_scan'):
-            return self.table.scan(**kwargs.get('query', {}))
-        return self.table.scan(**kwargs.get('query', {})).get('Items', [])
+            return result
+        return result.get('Items', [])
 
+    def scan_iter(self, **kwargs):
+        fetch = self.__trace_page('scan_iter', self.table.scan)
+        return pagination.PageIterator(fetch, self.__get_key_names, **kwargs)
+
+    @tracing.traced('parallel_scan')
+    def parallel_scan(self, **kwargs):
+        scan = pagination.ParallelScan(self.__fetch_segment_page, **kwargs)
+        if kwargs.get('callback'):
+            scan.run()
+        return scan
+
+    @tracing.traced('get')
     def get(self, **kwargs):
-        return self.table.get_item(**kwargs.get('query', {})).get('Item', {})
+        with self.metrics.measure('get', 'db', items=1) as measurement:
+            item = self.table.get_item(**kwargs.get('query', {})).get('Item', {})
+            measurement.count_payload(item)
+        return item
 
+    @tracing.traced('batch_get')
+    def batch_get(self, **kwargs):
+        if not isinstance(kwargs['keys'], list):
+            raise BatchItemException('Batched keys must be contained within a list')
+        key_names = self.__get_key_names()
+        fingerprints = [self.__fingerprint('batch_get', key, key_names) for key in kwargs['keys']]
+        unique_keys = list({
+            fingerprint: dict(zip(key_names, fingerprint)) for fingerprint in fingerprints
+        }.values())
+        batch_size = min(kwargs.get('batch_size', MAX_BATCH_GET_KEYS), MAX_BATCH_GET_KEYS)
+        chunks = [unique_keys[pos:pos + batch_size] for pos in range(0, len(unique_keys), batch_size)]
+        request = self.__create_batch_get_request(kwargs.get('query', {}), key_names)
+        found = {}
+        with ThreadPoolExecutor(kwargs.get('workers', 4), thread_name_prefix='dta-batch-get') as executor:
+            pages = executor.map(lambda chunk: self.__batch_get_chunk(chunk, request, **kwargs), chunks)
+            for items in pages:
+                found.update((self.__fingerprint('batch_get', item, key_names), item) for item in items)
+        return [found.get(fingerprint, {}) for fingerprint in fingerprints]
+
+    @tracing.traced('query')
     def query(self, **kwargs):
+        with self.metrics.measure('query', 'db') as measurement:
+            result = self.table.query(**kwargs.get('query', {}))
+            measurement.count(items=result.get('Count', 0))
+            measurement.count_payload(result.get('Items', []))
         if kwargs.get('raw_query'):
-            return self.table.query(**kwargs.get('query', {}))
-        return self.table.query(**kwargs.get('query', {})).get('Items', [])
+            return result
+        return result.get('Items', [])
+
+    def query_iter(self, **kwargs):
+        fetch = self.__trace_page('query_iter', self.table.query)
+        return pagination.PageIterator(fetch, self.__get_key_names, **kwargs)
 
+    @tracing.traced('overwrite')
     def overwrite(self, **kwargs):
-        overwrite_item = schema_mapper.map_to_schema(kwargs['data'], self.model_schema_file, self.model_schema)
-        self.table.put_item(Item=overwrite_item)
+        with self.metrics.measure('overwrite', 'map'):
+            overwrite_item = schema_mapper.map_to_schema(kwargs['data'], self.model_schema_file, self.model_schema)
+        with self.metrics.measure('overwrite', 'db', items=1) as measurement:
+            measurement.count_payload(overwrite_item)
+            self.table.put_item(Item=overwrite_item)
         super().publish('create', overwrite_item, **kwargs)
         return overwrite_item
 
+    @tracing.traced('insert')
     def insert(self, **kwargs):
-        new_item = schema_mapper.map_to_schema(kwargs['data'], self.model_schema_file, self.model_schema)
-        self.table.put_item(Item=new_item, ConditionExpression=Attr(self.model_identifier).not_exists())
+        with self.metrics.measure('insert', 'map'):
+            new_item = schema_mapper.map_to_schema(kwargs['data'], self.model_schema_file, self.model_schema)
+        with self.metrics.measure('insert', 'db', items=1) as measurement:
+            measurement.count_payload(new_item)
+            self.table.put_item(Item=new_item, ConditionExpression=Attr(self.model_identifier).not_exists())
         super().publish('create', new_item, **kwargs)
         return new_item
 
+    @tracing.traced('batch_insert')
     def batch_insert(self, **kwargs):
-        data = kwargs['data']
-        batch_size = kwargs.get('batch_size', 25)
-
-        if not isinstance(data, list):
+        if not isinstance(kwargs['data'], list):
             raise BatchItemException('Batched data must be contained within a list')
+        started = time.perf_counter()
+        key_names = self.__get_key_names()
+        unique_items = {}
+        with self.metrics.measure('batch_insert', 'map', items=len(kwargs['data'])):
+            mapping = kwargs.get('mapping', {})
+            for item in schema_mapper.map_many(kwargs['data'], self.model_schema_file, self.model_schema, **mapping):
+                unique_items[self.__fingerprint('batch_insert', item, key_names)] = item
+        items = list(unique_items.values())
+        batch_size = min(kwargs.get('batch_size', MAX_BATCH_WRITE_ITEMS), MAX_BATCH_WRITE_ITEMS)
+        chunks = [items[pos:pos + batch_size] for pos in range(0, len(items), batch_size)]
+        requests = 0
+        unprocessed = []
+        with ThreadPoolExecutor(kwargs.get('workers', 4), thread_name_prefix='dta-batch-insert') as executor:
+            results = executor.map(lambda chunk: self.__batch_write_chunk(chunk, **kwargs), chunks)
+            for chunk_requests, chunk_unprocessed in results:
+                requests += chunk_requests
+                unprocessed.extend(chunk_unprocessed)
+        failed = {self.__fingerprint('batch_insert', item, key_names) for item in unprocessed}
+        written = [item for fingerprint, item in unique_items.items() if fingerprint not in failed]
+        super().publish_items('batch_create', written, **kwargs)
+        if unprocessed and not kwargs.get('allow_unprocessed'):
+            retries = kwargs.get('max_retries', 8)
+            raise BatchItemException(
+                f'batch_insert: {len(unprocessed)} items still unprocessed after {retries} retries'
+            )
+        duration = time.perf_counter() - started
+        return {
+            'items': len(written),
+            'duplicates': len(kwargs['data']) - len(items),
+            'unprocessed': unprocessed,
+            'requests': requests,
+            'duration': duration,
+            'throughput': len(written) / duration if duration else 0.0
+        }
 
-        batched_data = (data[pos:pos + batch_size] for pos in range(0, len(data), batch_size))
-        with self.table.batch_writer() as writer:
-            for batch in batched_data:
-                for item in batch:
-                    writer.put_item(Item=item)
-
+    @tracing.traced('delete')
     def delete(self, **kwargs):
         kwargs['query']['ReturnValues'] = 'ALL_OLD'
-        result = self.table.delete_item(**kwargs['query']).get('Attributes', {})
+        with self.metrics.measure('delete', 'db', items=1) as measurement:
+            result = self.table.delete_item(**kwargs['query']).get('Attributes', {})
+            measurement.count_payload(result)
         super().publish('delete', result, **kwargs)
         return result
 
+    @tracing.traced('batch_delete')
     def batch_delete(self, **kwargs):
         batch_size = kwargs.get('batch_size', 25)
         if not isinstance(kwargs['data'], list):
             raise BatchItemException('Batched data must be contained within a list')
         batched_data = (kwargs['data'][pos:pos + batch_size] for pos in range(0, len(kwargs['data']), batch_size))
-        with self.table.batch_writer() as writer:
+        with self.metrics.measure('batch_delete', 'db', items=len(kwargs['data'])) as measurement, \
+                self.table.batch_writer() as writer:
+            measurement.count_payload(kwargs['data'])
             for batch in batched_data:
                 for item in batch:
                     writer.delete_item(Key=item)
+        super().publish_items('batch_delete', kwargs['data'], **kwargs)
 
+    @tracing.traced('update')
     def update(self, **kwargs):
+        if kwargs.get('native'):
+            return self.__update_native(**kwargs)
         original_data = self._get_original_data(**kwargs)
-        merged_data = dict_merger.merge(original_data, kwargs['data'], **kwargs)
-        updated_data = schema_mapper.map_to_schema(merged_data, self.model_schema_file, self.model_schema)
-        self.table.put_item(Item=updated_data, ConditionExpression=Attr(self.model_version_key).eq(original_data[self.model_version_key]))
+        with self.metrics.measure('update', 'merge'):
+            merged_data = dict_merger.merge(original_data, kwargs['data'], **kwargs)
+        with self.metrics.measure('update', 'map'):
+            updated_data = schema_mapper.map_to_schema(merged_data, self.model_schema_file, self.model_schema)
+        with self.metrics.measure('update', 'db', items=1) as measurement:
+            if kwargs.get('partial'):
+                self.__update_changes(original_data, updated_data, measurement)
+            else:
+                measurement.count_payload(updated_data)
+                condition = Attr(self.model_version_key).eq(original_data[self.model_version_key])
+                self.table.put_item(Item=updated_data, ConditionExpression=condition)
         super().publish('update', updated_data, **kwargs)
         return updated_data
 
+    def __update_native(self, **kwargs):
+        if 'Key' not in kwargs.get('query', {}):
+            raise Exception('update: native updates require a query Key')
+        if self.model_version_key and kwargs.get('check_version', True) and 'expected_version' not in kwargs:
+            raise Exception('update: native updates require expected_version; pass check_version=False to skip it')
+        key = kwargs['query']['Key']
+        key_names = self.__get_key_names()
+        with self.metrics.measure('update', 'map'):
+            patch = schema_mapper.map_partial(kwargs['data'], self.model_schema_file, self.model_schema)
+        expression = update_expression.build(update_expression.compile_patch(
+            patch,
+            exclude=key_names,
+            add=kwargs.get('add', {}),
+            update_list_operation=kwargs.get('update_list_operation', 'append'),
+            update_dict_operation=kwargs.get('update_dict_operation', 'upsert')
+        ))
+        if not expression.has_actions():
+            return dict(patch, **key)
+        expression.condition_exists(key_names[0])
+        if self.model_version_key and kwargs.get('check_version', True):
+            expression.condition_equals(self.model_version_key, kwargs['expected_version'])
+        update = expression.to_kwargs()
+        with self.metrics.measure('update', 'db', items=1) as measurement:
+            measurement.count_payload(update)
+            response = self.table.update_item(
+                Key=key,
+                ReturnValues=kwargs.get('return_values', 'ALL_NEW'),
+                **update
+            )
+        updated_data = response.get('Attributes') or dict(patch, **key)
+        super().publish('update', updated_data, **kwargs)
+        return updated_data
+
+    def __fetch_page(self, operation, fetch):
+        def fetch_page(**query):
+            with self.metrics.measure(operation, 'db') as measurement:
+                page = fetch(**query)
+                measurement.count(items=page.get('Count', 0))
+                measurement.count_payload(page.get('Items', []))
+            return page
+        return fetch_page
+
+    def __trace_page(self, operation, fetch):
+        fetch_page = self.__fetch_page(operation, fetch)
+
+        def trace_page(**query):
+            with self.metrics.measure(operation, 'call'):
+                return fetch_page(**query)
+        return trace_page
+
+    def __fetch_segment_page(self, **query):
+        return self.__fetch_page('scan', self.table.scan)(**query)
+
+    def __batch_get_chunk(self, chunk, request, **kwargs):
+        pending = {self.table_name: dict(request, Keys=chunk)}
+        responses, pending = self.__send_batch('batch_get', self.client.batch_get_item, pending,
+                                               'UnprocessedKeys', **kwargs)
+        if pending:
+            unprocessed = len(pending[self.table_name]['Keys'])
+            retries = len(responses) - 1
+            raise BatchItemException(f'batch_get: {unprocessed} keys still unprocessed after {retries} retries')
+        return [item for response in responses for item in response.get('Responses', {}).get(self.table_name, [])]
+
+    def __batch_write_chunk(self, chunk, **kwargs):
+        pending = {self.table_name: [{'PutRequest': {'Item': item}} for item in chunk]}
+        responses, pending = self.__send_batch('batch_insert', self.client.batch_write_item, pending,
+                                               'UnprocessedItems', **kwargs)
+        unprocessed = [request['PutRequest']['Item'] for request in (pending or {}).get(self.table_name, [])]
+        return len(responses), unprocessed
+
+    def __send_batch(self, operation, send, pending, unprocessed_key, **kwargs):
+        responses = []
+        retries = kwargs.get('max_retries', 8)
+        for attempt in range(retries + 1):
+            with self.metrics.measure(operation, 'db', items=self.__count_requests(pending)) as measurement:
+                measurement.count_payload(pending)
+                responses.append(send(RequestItems=pending))
+                if 'Responses' in responses[-1]:
+                    measurement.count_payload(responses[-1]['Responses'])
+            pending = responses[-1].get(unprocessed_key)
+            if not pending:
+                return responses, None
+            if attempt < retries:
+                time.sleep(random.uniform(0, min(kwargs.get('max_backoff', 5), 0.05 * 2 ** attempt)))
+        return responses, pending
+
+    def __count_requests(self, pending):
+        request = pending[self.table_name]
+        return len(request['Keys']) if isinstance(request, dict) else len(request)
+
+    def __create_batch_get_request(self, query, key_names):
+        request = dict(query)
+        if request.get('ProjectionExpression'):
+            names = dict(request.get('ExpressionAttributeNames', {}))
+            projected = [request['ProjectionExpression']]
+            for index, name in enumerate(key_names):
+                names[f'#dta_key{index}'] = name
+                projected.append(f'#dta_key{index}')
+            request['ProjectionExpression'] = ', '.join(projected)
+            request['ExpressionAttributeNames'] = names
+        return request
+
+    def __fingerprint(self, operation, key, key_names):
+        try:
+            return tuple(key[name] for name in key_names)
+        except KeyError as error:
+            raise BatchItemException(f'{operation}: key is missing attribute {error}') from error
+
+    def __get_key_names(self, index_name=None):
+        names = [key['AttributeName'] for key in self.table.key_schema]
+        if index_name:
+            indexes = (self.table.global_secondary_indexes or []) + (self.table.local_secondary_indexes or [])
+            for index in indexes:
+                if index['IndexName'] == index_name:
+                    names.extend(key['AttributeName'] for key in index['KeySchema']
+                                 if key['AttributeName'] not in names)
+        return names
+
+    def __update_changes(self, original_data, updated_data, measurement):
+        key_names = [key['AttributeName'] for key in self.table.key_schema]
+        changes = dict_merger.diff(original_data, updated_data)
+        changes = [change for change in changes if change.path[0] not in key_names]
+        if not changes:
+            return
+        expression = update_expression.build(changes)
+        expression.condition_equals(self.model_version_key, original_data[self.model_version_key])
+        update = expression.to_kwargs()
+        measurement.count_payload(update)
+        self.table.update_item(Key={name: original_data[name] for name in key_names}, **update)
+
     def _get_original_data(self, **kwargs):
         if kwargs['operation'] == 'get':
             original_data = self.get(**kwargs)
@@ -108,3 +366,18 @@ class DynamodbAdapter(BaseAdapter):
         if not original_data:
             raise Exception('update: no data found to update')
         return original_data
+
+
+def _create_client(endpoint=None, **options):
+    if options:
+        session = boto3.session.Session(
+            region_name=options.get('region'),
+            aws_access_key_id=options.get('aws_access_key_id'),
+            aws_secret_access_key=options.get('aws_secret_access_key'),
+            aws_session_token=options.get('aws_session_token')
+        )
+        resource = session.resource('dynamodb', endpoint_url=endpoint)
+    else:
+        resource = boto3.resource('dynamodb', endpoint_url=endpoint)
+    _resource_classes.setdefault('dynamodb', type(resource))
+    return resource.meta.client
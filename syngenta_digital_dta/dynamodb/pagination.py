@@ -0,0 +1,249 @@
+import base64
+import binascii
+import copy
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from boto3.dynamodb.types import Binary
+from boto3.dynamodb.types import TypeDeserializer
+from boto3.dynamodb.types import TypeSerializer
+
+from syngenta_digital_dta.common import json_helper
+
+DEFAULT_SEGMENTS = 4
+
+_serializer = TypeSerializer()
+_deserializer = TypeDeserializer()
+
+
+class PageIterator:
+
+    def __init__(self, fetch, key_names, **kwargs):
+        self.fetch = fetch
+        self.key_names = key_names
+        self.query = dict(kwargs.get('query', {}))
+        self.page_size = kwargs.get('page_size') or self.query.get('Limit')
+        self.max_items = kwargs.get('max_items')
+        self.count = 0
+        self.pages = 0
+        self.done = False
+        self.__start_key = decode_cursor(kwargs['cursor']) if kwargs.get('cursor') else None
+        self.__last_item = None
+        self.__items = self.__iterate()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self.__items)
+
+    @property
+    def cursor(self):
+        if self.done:
+            return None
+        if self.__last_item is not None:
+            names = self.key_names(self.query.get('IndexName'))
+            missing = [name for name in names if name not in self.__last_item]
+            if missing:
+                raise CursorException(f'cannot build a cursor mid-page; projection is missing key attributes {missing}')
+            return encode_cursor({name: self.__last_item[name] for name in names})
+        if self.__start_key is not None:
+            return encode_cursor(self.__start_key)
+        return None
+
+    def iter_pages(self):
+        while not self.done:
+            page = self.fetch(**self.__page_query())
+            self.pages += 1
+            items = page.get('Items', [])
+            self.count += len(items)
+            self.__end_page(page.get('LastEvaluatedKey'))
+            yield items
+
+    def __iterate(self):
+        while not self.__reached_max():
+            page = self.fetch(**self.__page_query())
+            self.pages += 1
+            items = page.get('Items', [])
+            for index, item in enumerate(items):
+                if self.__reached_max():
+                    return
+                self.count += 1
+                if index == len(items) - 1:
+                    self.__end_page(page.get('LastEvaluatedKey'))
+                else:
+                    self.__last_item = item
+                yield item
+            if not items:
+                self.__end_page(page.get('LastEvaluatedKey'))
+            if self.done:
+                return
+
+    def __end_page(self, last_key):
+        self.__last_item = None
+        self.__start_key = last_key
+        self.done = last_key is None
+
+    def __reached_max(self):
+        return self.max_items is not None and self.count >= self.max_items
+
+    def __page_query(self):
+        query = dict(self.query)
+        limits = [limit for limit in (self.page_size, self.__remaining()) if limit]
+        if limits:
+            query['Limit'] = min(limits)
+        if self.__start_key is not None:
+            query['ExclusiveStartKey'] = self.__start_key
+        return query
+
+    def __remaining(self):
+        return self.max_items - self.count if self.max_items is not None else None
+
+
+class ParallelScan:
+
+    def __init__(self, fetch, **kwargs):
+        self.fetch = fetch
+        self.query = dict(kwargs.get('query', {}))
+        self.page_size = kwargs.get('page_size')
+        self.callback = kwargs.get('callback')
+        self.on_checkpoint = kwargs.get('on_checkpoint')
+        checkpoint = copy.deepcopy(kwargs.get('checkpoint') or {})
+        self.total_segments = checkpoint.get('total_segments') or kwargs.get('segments') or DEFAULT_SEGMENTS
+        if kwargs.get('segments') and kwargs['segments'] != self.total_segments:
+            raise CursorException(f'checkpoint was created with {self.total_segments} segments')
+        self.workers = min(kwargs.get('workers') or self.total_segments, self.total_segments)
+        self.segments = {
+            str(segment): {'cursor': None, 'done': False, 'count': 0} for segment in range(self.total_segments)
+        }
+        self.segments.update(checkpoint.get('segments', {}))
+        self.__lock = threading.Lock()
+
+    @property
+    def checkpoint(self):
+        with self.__lock:
+            return self.__snapshot()
+
+    @property
+    def count(self):
+        with self.__lock:
+            return sum(state['count'] for state in self.segments.values())
+
+    @property
+    def done(self):
+        with self.__lock:
+            return all(state['done'] for state in self.segments.values())
+
+    def run(self, callback=None):
+        callback = callback or self.callback
+        stop = threading.Event()
+
+        def scan(segment):
+            def handle(items, cursor):
+                callback(items, int(segment))
+                self.__commit(segment, items, cursor)
+            self.__scan_segment(segment, handle, stop)
+
+        with ThreadPoolExecutor(self.workers, thread_name_prefix='dta-parallel-scan') as executor:
+            futures = [executor.submit(scan, segment) for segment in self.__pending()]
+            try:
+                for future in futures:
+                    future.result()
+            finally:
+                stop.set()
+        return self.checkpoint
+
+    def __iter__(self):
+        pages = queue.Queue(maxsize=self.workers * 2)
+        stop = threading.Event()
+        segments = self.__pending()
+        executor = ThreadPoolExecutor(self.workers, thread_name_prefix='dta-parallel-scan')
+        for segment in segments:
+            executor.submit(self.__feed, segment, pages, stop)
+        remaining = len(segments)
+        try:
+            while remaining:
+                segment, items, cursor, error = pages.get()
+                if error is not None:
+                    raise error
+                if items is None:
+                    remaining -= 1
+                    continue
+                yield from items
+                self.__commit(segment, items, cursor)
+        finally:
+            stop.set()
+            executor.shutdown(wait=True)
+
+    def __feed(self, segment, pages, stop):
+        try:
+            def handle(items, cursor):
+                self.__put(pages, (segment, items, cursor, None), stop)
+            self.__scan_segment(segment, handle, stop)
+            self.__put(pages, (segment, None, None, None), stop)
+        except Exception as error:
+            self.__put(pages, (segment, None, None, error), stop)
+
+    def __put(self, pages, page, stop):
+        while not stop.is_set():
+            try:
+                pages.put(page, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def __scan_segment(self, segment, handle, stop):
+        query = dict(self.query, Segment=int(segment), TotalSegments=self.total_segments)
+        iterator = PageIterator(self.fetch, None, query=query, page_size=self.page_size,
+                                cursor=self.segments[segment]['cursor'])
+        for items in iterator.iter_pages():
+            if stop.is_set():
+                return
+            handle(items, iterator.cursor)
+
+    def __commit(self, segment, items, cursor):
+        with self.__lock:
+            state = self.segments[segment]
+            state['cursor'] = cursor
+            state['done'] = cursor is None
+            state['count'] += len(items)
+            if self.on_checkpoint:
+                self.on_checkpoint(self.__snapshot())
+
+    def __pending(self):
+        return [segment for segment, state in self.segments.items() if not state['done']]
+
+    def __snapshot(self):
+        return {'total_segments': self.total_segments, 'segments': copy.deepcopy(self.segments)}
+
+
+def encode_cursor(key):
+    serialized = {name: _encode_value(_serializer.serialize(value)) for name, value in key.items()}
+    token = json_helper.dumps(serialized, compact=True, sort_keys=True).encode('utf-8')
+    return base64.urlsafe_b64encode(token).decode('ascii')
+
+
+def decode_cursor(cursor):
+    try:
+        serialized = json_helper.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return {name: _deserializer.deserialize(_decode_value(value)) for name, value in serialized.items()}
+    except (ValueError, TypeError, AttributeError, binascii.Error) as error:
+        raise CursorException(f'invalid cursor: {cursor}') from error
+
+
+def _encode_value(value):
+    if 'B' in value:
+        binary = value['B'].value if isinstance(value['B'], Binary) else value['B']
+        return {'B': base64.b64encode(binary).decode('ascii')}
+    return value
+
+
+def _decode_value(value):
+    if 'B' in value:
+        return {'B': base64.b64decode(value['B'])}
+    return value
+
+
+class CursorException(Exception):
+    pass
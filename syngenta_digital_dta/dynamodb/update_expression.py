@@ -0,0 +1,115 @@
+from syngenta_digital_dta.common.dict_merger import Change
+
+
+class UpdateExpression:
+
+    def __init__(self):
+        self.names = {}
+        self.values = {}
+        self.clauses = {'SET': [], 'REMOVE': [], 'ADD': []}
+        self.conditions = []
+
+    def apply(self, change):
+        path = self.path(change.path)
+        if change.operation == 'set':
+            self.clauses['SET'].append(f'{path} = {self.value(change.value)}')
+        elif change.operation == 'append':
+            self.clauses['SET'].append(f'{path} = list_append({path}, {self.value(change.value)})')
+        elif change.operation == 'extend':
+            existing = f'if_not_exists({path}, {self.value([])})'
+            self.clauses['SET'].append(f'{path} = list_append({existing}, {self.value(change.value)})')
+        elif change.operation == 'add':
+            self.clauses['ADD'].append(f'{path} {self.value(change.value)}')
+        elif change.operation == 'unset':
+            self.clauses['REMOVE'].append(path)
+        else:
+            raise UpdateExpressionException(f'unsupported update operation: {change.operation}')
+        return self
+
+    def condition_equals(self, key, value):
+        self.conditions.append(f'{self.path((key,))} = {self.value(value)}')
+        return self
+
+    def condition_exists(self, key):
+        self.conditions.append(f'attribute_exists({self.path((key,))})')
+        return self
+
+    def has_actions(self):
+        return any(self.clauses.values())
+
+    def path(self, path):
+        return '.'.join(self.name(key) for key in path)
+
+    def name(self, key):
+        if key not in self.names:
+            self.names[key] = f'#n{len(self.names)}'
+        return self.names[key]
+
+    def value(self, value):
+        placeholder = f':v{len(self.values)}'
+        self.values[placeholder] = value
+        return placeholder
+
+    def to_kwargs(self):
+        expression = ' '.join(
+            f'{clause} {", ".join(actions)}' for clause, actions in self.clauses.items() if actions
+        )
+        kwargs = {
+            'UpdateExpression': expression,
+            'ExpressionAttributeNames': {placeholder: key for key, placeholder in self.names.items()}
+        }
+        if self.values:
+            kwargs['ExpressionAttributeValues'] = self.values
+        if self.conditions:
+            kwargs['ConditionExpression'] = ' AND '.join(self.conditions)
+        return kwargs
+
+
+def build(changes):
+    expression = UpdateExpression()
+    for change in changes:
+        expression.apply(change)
+    return expression
+
+
+def compile_patch(data, **kwargs):
+    changes = []
+    exclude = kwargs.get('exclude', ())
+    _compile_dict({key: value for key, value in data.items() if key not in exclude}, (), changes, **kwargs)
+    for path, value in kwargs.get('add', {}).items():
+        changes.append(Change('add', tuple(path.split('.')), value))
+    _check_overlaps(changes)
+    return changes
+
+
+def _compile_dict(data, path, changes, **kwargs):
+    remove = kwargs.get('update_dict_operation', 'upsert') == 'remove'
+    for key, value in data.items():
+        key_path = path + (key,)
+        if isinstance(value, dict) and remove:
+            _compile_dict(value, key_path, changes, **kwargs)
+        elif isinstance(value, list):
+            changes.append(_compile_list(key_path, value, kwargs.get('update_list_operation', 'append')))
+        elif remove:
+            changes.append(Change('unset', key_path, None))
+        else:
+            changes.append(Change('set', key_path, value))
+
+
+def _compile_list(path, value, update_list_operation):
+    if update_list_operation == 'append':
+        return Change('extend', path, value)
+    if update_list_operation == 'replace':
+        return Change('set', path, value)
+    raise UpdateExpressionException(f'update_list_operation {update_list_operation} requires the original item')
+
+
+def _check_overlaps(changes):
+    paths = sorted(change.path for change in changes)
+    for path, next_path in zip(paths, paths[1:]):
+        if next_path[:len(path)] == path:
+            raise UpdateExpressionException(f'update paths overlap: {".".join(path)} and {".".join(next_path)}')
+
+
+class UpdateExpressionException(Exception):
+    pass
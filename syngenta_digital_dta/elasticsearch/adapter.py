@@ -1,6 +1,11 @@
+from elasticsearch import helpers
+
+from syngenta_digital_dta.common import registry
 from syngenta_digital_dta.common import schema_mapper
+from syngenta_digital_dta.common import tracing
 from syngenta_digital_dta.common.base_adapter import BaseAdapter
 from syngenta_digital_dta.elasticsearch.es_connection import es_connection
+from syngenta_digital_dta.elasticsearch.es_connector import ESConnector
 from syngenta_digital_dta.elasticsearch import es_mapper
 
 
@@ -18,8 +23,22 @@ class ElasticsearchAdapter(BaseAdapter):
         self.user = kwargs.get('user')
         self.password = kwargs.get('password')
         self.size = kwargs.get('size', 10)
+        self.shared = kwargs.get('shared', False)
         self.connection = None
-        self.__connect()
+        if self.shared:
+            self.connection = self.__connect_shared()
+        else:
+            self.__connect()
+
+    def __connect_shared(self):
+        config = {
+            'endpoint': self.endpoint,
+            'port': self.port,
+            'authentication': self.authentication,
+            'user': self.user,
+            'password': self.password
+        }
+        return registry.get_or_create('elasticsearch', config, lambda: ESConnector(self).connect())
 
     @es_connection
     def __connect(self):
@@ -42,25 +61,56 @@ class ElasticsearchAdapter(BaseAdapter):
                 create_args['body'] = self.__create_template_body(**kwargs)
             self.connection.indices.create(**create_args)
 
+    @tracing.traced('create')
     def create(self, **kwargs):
-        data = schema_mapper.map_to_schema(kwargs['data'], self.model_schema_file, self.model_schema)
-        response = self.connection.index(
-            index=self.index,
-            id=data[self.model_identifier],
-            body=data,
-            op_type='create',
-            refresh=kwargs.get('refresh', True)
-        )
+        with self.metrics.measure('create', 'map'):
+            data = schema_mapper.map_to_schema(kwargs['data'], self.model_schema_file, self.model_schema)
+        with self.metrics.measure('create', 'db', items=1) as measurement:
+            measurement.count_payload(data)
+            response = self.connection.index(
+                index=self.index,
+                id=data[self.model_identifier],
+                body=data,
+                op_type='create',
+                refresh=kwargs.get('refresh', True)
+            )
         super().publish('create', data, **kwargs)
         return response
 
-    def update(self, **kwargs):
-        response = self.connection.update(
-            index=self.index,
-            id=kwargs['data'][self.model_identifier],
-            body={'doc': kwargs['data']},
-            refresh=kwargs.get('refresh', True)
+    @tracing.traced('batch_create')
+    def batch_create(self, **kwargs):
+        created = 0
+        batches = schema_mapper.map_batches(
+            kwargs['data'],
+            self.model_schema_file,
+            self.model_schema,
+            kwargs.get('batch_size', 500),
+            **kwargs.get('mapping', {})
         )
+        for data in batches:
+            actions = [
+                {'_op_type': 'create', '_index': self.index, '_id': item[self.model_identifier], '_source': item}
+                for item in data
+            ]
+            with self.metrics.measure('batch_create', 'db', items=len(actions)) as measurement:
+                measurement.count_payload(data)
+                success, _ = helpers.bulk(self.connection, actions, refresh=False)
+            created += success
+            super().publish_items('batch_create', data, **kwargs)
+        if kwargs.get('refresh', True):
+            self.connection.indices.refresh(index=self.index)
+        return created
+
+    @tracing.traced('update')
+    def update(self, **kwargs):
+        with self.metrics.measure('update', 'db', items=1) as measurement:
+            measurement.count_payload(kwargs['data'])
+            response = self.connection.update(
+                index=self.index,
+                id=kwargs['data'][self.model_identifier],
+                body={'doc': kwargs['data']},
+                refresh=kwargs.get('refresh', True)
+            )
         super().publish('update', kwargs['data'], **kwargs)
         return response
 
@@ -69,15 +119,18 @@ class ElasticsearchAdapter(BaseAdapter):
             return self.update(**kwargs)
         return self.create(**kwargs)
 
+    @tracing.traced('delete')
     def delete(self, identifier_value, **kwargs):
-        response = self.connection.delete(
-            index=self.index,
-            id=identifier_value,
-            refresh=kwargs.get('refresh', True)
-        )
+        with self.metrics.measure('delete', 'db', items=1):
+            response = self.connection.delete(
+                index=self.index,
+                id=identifier_value,
+                refresh=kwargs.get('refresh', True)
+            )
         super().publish('delete', {self.model_identifier: identifier_value}, **kwargs)
         return response
 
+    @tracing.traced('get')
     def get(self, identifier_value, **kwargs):
         try:
             response = self.connection.get(index=self.index, id=identifier_value)
@@ -87,12 +140,16 @@ class ElasticsearchAdapter(BaseAdapter):
             response = {}
         return response
 
+    @tracing.traced('query')
     def query(self, **kwargs):
-        response = self.connection.search(
-            index=self.index,
-            size=self.size,
-            body={'query': kwargs['query']}
-        )
+        with self.metrics.measure('query', 'db') as measurement:
+            response = self.connection.search(
+                index=self.index,
+                size=self.size,
+                body={'query': kwargs['query']}
+            )
+            measurement.count(items=len(response.get('hits', {}).get('hits', [])))
+            measurement.count_payload(response.get('hits', {}).get('hits', []))
         if kwargs.get('normalize'):
             response = self.__normalize_hits(response)
         return response
@@ -1,8 +1,6 @@
 from functools import lru_cache
 
-import boto3
 from elasticsearch import Elasticsearch, RequestsHttpConnection
-from requests_aws4auth import AWS4Auth
 
 
 class ESConnector:
@@ -45,6 +43,8 @@ class ESConnector:
         return config
 
     def __authenticate_lambda(self):
+        import boto3  # pylint: disable=C
+        from requests_aws4auth import AWS4Auth  # pylint: disable=C
         session = boto3.Session()
         credentials = session.get_credentials()
         awsauth = AWS4Auth(
@@ -1,11 +1,9 @@
 import os
 import shutil
 
-import jsonpickle
-import requests
-
+from syngenta_digital_dta.common import json_helper
+from syngenta_digital_dta.common import tracing
 from syngenta_digital_dta.common.base_adapter import BaseAdapter
-from syngenta_digital_dta.s3.adapter import S3Adapter
 
 
 class FileSystemAdapter(BaseAdapter):
@@ -14,25 +12,28 @@ class FileSystemAdapter(BaseAdapter):
         self.sns_attributes = kwargs.get('sns_attributes')
         self.sns_arn = kwargs.get('sns_arn')
 
+    @tracing.traced('create')
     def create(self, **kwargs):
         body = self.__set_body(**kwargs)
         destination_path = kwargs['destination_path']
 
         self.__create_destination_directory(destination_path)
 
-        with open(destination_path, 'wb') as file:
+        with self.metrics.measure('create', 'db', bytes=len(body)), open(destination_path, 'wb') as file:
             file.write(body)
 
         if kwargs.get('publish', True):
             data = {'file_path': destination_path}
             super().publish('create', data)
 
+    @tracing.traced('read')
     def read(self, **kwargs) -> bytes:
-        with open(kwargs['file_path'], 'rb') as file:
+        with self.metrics.measure('read', 'db') as measurement, open(kwargs['file_path'], 'rb') as file:
             body = file.read()
+            measurement.count(bytes=len(body))
 
         if kwargs.get('json', False):
-            return jsonpickle.decode(body)
+            return json_helper.loads(body)
         return body
 
     def update(self, **kwargs):
@@ -43,6 +44,7 @@ class FileSystemAdapter(BaseAdapter):
 
         self.create(**kwargs)
 
+    @tracing.traced('delete')
     def delete(self, **kwargs):
         path = kwargs['path']
 
@@ -74,10 +76,12 @@ class FileSystemAdapter(BaseAdapter):
         link = kwargs['http_link']
         headers = kwargs.get('headers')
 
+        import requests  # pylint: disable=C
         response = requests.request('GET', link, headers=headers, timeout=kwargs.get('timeout'))
         return response.content
 
     def __init_s3_adapter(self, **kwargs):
+        from syngenta_digital_dta.s3.adapter import S3Adapter  # pylint: disable=C
         return S3Adapter(
             region=kwargs.get('region'),
             endpoint=kwargs.get('s3_enpoint'),
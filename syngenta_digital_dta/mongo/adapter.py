@@ -1,10 +1,11 @@
-from functools import lru_cache
-
 from pymongo import MongoClient, operations
+from pymongo.results import InsertManyResult
 
 from syngenta_digital_dta.common.base_adapter import BaseAdapter
 from syngenta_digital_dta.common import dict_merger
+from syngenta_digital_dta.common import registry
 from syngenta_digital_dta.common import schema_mapper
+from syngenta_digital_dta.common import tracing
 
 
 class MongoAdapter(BaseAdapter):
@@ -27,33 +28,59 @@ class MongoAdapter(BaseAdapter):
             'list_indexes'
         ]
 
-    @lru_cache(maxsize=128)
     def __connect(self, **kwargs):
-        client = MongoClient(kwargs['endpoint'], username=kwargs['user'], password=kwargs['password'])
+        if kwargs.get('shared'):
+            config = {'endpoint': kwargs['endpoint'], 'user': kwargs['user'], 'password': kwargs['password']}
+            client = registry.get_or_create('mongo', config, lambda: MongoClient(
+                kwargs['endpoint'], username=kwargs['user'], password=kwargs['password']))
+        else:
+            client = MongoClient(kwargs['endpoint'], username=kwargs['user'], password=kwargs['password'])
         db = client[kwargs['database']]
         return db[kwargs['collection']]
 
+    @tracing.traced('create')
     def create(self, **kwargs):
-        data = schema_mapper.map_to_schema(kwargs['data'], self.__model_schema_file, self.__model_schema)
+        with self.metrics.measure('create', 'map'):
+            data = schema_mapper.map_to_schema(kwargs['data'], self.__model_schema_file, self.__model_schema)
         data['_id'] = data[self.__model_identifier]
-        self.__collection.insert_one(data)
+        with self.metrics.measure('create', 'db', items=1) as measurement:
+            measurement.count_payload(data)
+            self.__collection.insert_one(data)
         super().publish('create', data, **kwargs)
         return data
 
-    def __map_documents(self, **kwargs):
-        items = []
-        for item in kwargs['data']:
-            item = schema_mapper.map_to_schema(item, self.__model_schema_file, self.__model_schema)
-            item['_id'] = item[self.__model_identifier]
-            items.append(item)
-        return items
-
+    def __map_batches(self, operation, **kwargs):
+        batches = schema_mapper.map_batches(
+            kwargs['data'],
+            self.__model_schema_file,
+            self.__model_schema,
+            kwargs.get('batch_size', 1000),
+            **kwargs.get('mapping', {})
+        )
+        while True:
+            with self.metrics.measure(operation, 'map') as measurement:
+                items = next(batches, None)
+                measurement.count(items=len(items or []))
+            if items is None:
+                return
+            for item in items:
+                item['_id'] = item[self.__model_identifier]
+            yield items
+
+    @tracing.traced('batch_create')
     def batch_create(self, **kwargs):
-        items = self.__map_documents(**kwargs)
-        insert_result = self.__collection.insert_many(items, **kwargs.get('params', {}))
-        super().publish('batch_create', items, **kwargs)
-        return insert_result
-
+        inserted_ids = []
+        acknowledged = True
+        for items in self.__map_batches('batch_create', **kwargs):
+            with self.metrics.measure('batch_create', 'db', items=len(items)) as measurement:
+                measurement.count_payload(items)
+                insert_result = self.__collection.insert_many(items, **kwargs.get('params', {}))
+            inserted_ids.extend(insert_result.inserted_ids)
+            acknowledged = acknowledged and insert_result.acknowledged
+            super().publish_items('batch_create', items, **kwargs)
+        return InsertManyResult(inserted_ids, acknowledged)
+
+    @tracing.traced('batch_upsert')
     def batch_upsert(self, **kwargs):
         data = kwargs['data']
         batch_size = kwargs.get('batch_size', 25)
@@ -67,9 +94,11 @@ class MongoAdapter(BaseAdapter):
             bulk_operations = [
                 operations.ReplaceOne(filter={'_id': item[self.__model_identifier]}, replacement=item, upsert=True) for item in items
             ]
-            batch_results = self.__collection.bulk_write(bulk_operations, **kwargs.get('params', {}))
+            with self.metrics.measure('batch_upsert', 'db', items=len(items)) as measurement:
+                measurement.count_payload(items)
+                batch_results = self.__collection.bulk_write(bulk_operations, **kwargs.get('params', {}))
             results.append(batch_results)
-            super().publish('batch_upsert', items, **kwargs)
+            super().publish_items('batch_upsert', items, **kwargs)
 
         return results
 
@@ -78,6 +107,7 @@ class MongoAdapter(BaseAdapter):
             return self.find(**kwargs)
         return self.find_one(**kwargs)
 
+    @tracing.traced('query')
     def query(self, **kwargs):
         if kwargs['operation'] not in self.__allowed_queries:
             raise Exception(
@@ -85,50 +115,97 @@ class MongoAdapter(BaseAdapter):
         query = getattr(self.__collection, kwargs['operation'])
         return query(kwargs['query'])
 
+    @tracing.traced('find_one')
     def find_one(self, **kwargs):
-        return self.__collection.find_one(kwargs['query'])
+        with self.metrics.measure('find_one', 'db', items=1) as measurement:
+            result = self.__collection.find_one(kwargs['query'])
+            measurement.count_payload(result)
+        return result
 
+    @tracing.traced('find')
     def find(self, **kwargs):
-        results = self.__collection.find(kwargs['query'], **kwargs.get('params', {}))
-        return list(results)
+        with self.metrics.measure('find', 'db') as measurement:
+            results = list(self.__collection.find(kwargs['query'], **kwargs.get('params', {})))
+            measurement.count(items=len(results))
+            measurement.count_payload(results)
+        return results
 
+    @tracing.traced('count')
     def count(self, **kwargs):
         return self.__collection.count_documents(kwargs.get('query', {}), **kwargs.get('params', {}))
 
+    @tracing.traced('update')
     def update(self, **kwargs):
         original_data = self.find_one(**kwargs)
         if not original_data:
             raise Exception(f'no document found by query: {kwargs["query"]}')
-        merged_data = dict_merger.merge(original_data, kwargs['data'], **kwargs)
-        updated_data = schema_mapper.map_to_schema(merged_data, self.__model_schema_file, self.__model_schema)
-        self.__collection.replace_one(kwargs['query'], updated_data, upsert=False)
+        with self.metrics.measure('update', 'merge'):
+            merged_data = dict_merger.merge(original_data, kwargs['data'], **kwargs)
+        with self.metrics.measure('update', 'map'):
+            updated_data = schema_mapper.map_to_schema(merged_data, self.__model_schema_file, self.__model_schema)
+        with self.metrics.measure('update', 'db', items=1) as measurement:
+            if kwargs.get('partial'):
+                self.__update_changes(kwargs['query'], original_data, updated_data, measurement)
+            else:
+                measurement.count_payload(updated_data)
+                self.__collection.replace_one(kwargs['query'], updated_data, upsert=False)
         super().publish('update', updated_data, **kwargs)
         return updated_data
 
+    @tracing.traced('upsert')
     def upsert(self, **kwargs):
         original_data = self.find_one(**kwargs)
-        if original_data:
-            merged_data = dict_merger.merge(original_data, kwargs['data'], **kwargs)
-        else:
-            merged_data = kwargs['data']
-        data = schema_mapper.map_to_schema(merged_data, self.__model_schema_file, self.__model_schema)
+        with self.metrics.measure('upsert', 'merge'):
+            if original_data:
+                merged_data = dict_merger.merge(original_data, kwargs['data'], **kwargs)
+            else:
+                merged_data = kwargs['data']
+        with self.metrics.measure('upsert', 'map'):
+            data = schema_mapper.map_to_schema(merged_data, self.__model_schema_file, self.__model_schema)
         data['_id'] = data[self.__model_identifier]
-        self.__collection.replace_one(kwargs['query'], data, upsert=True)
+        with self.metrics.measure('upsert', 'db', items=1) as measurement:
+            if original_data and kwargs.get('partial'):
+                self.__update_changes(kwargs['query'], original_data, data, measurement)
+            else:
+                measurement.count_payload(data)
+                self.__collection.replace_one(kwargs['query'], data, upsert=True)
         super().publish('upsert', data, **kwargs)
         return data
 
+    def __update_changes(self, query, original_data, updated_data, measurement):
+        update = {}
+        for change in dict_merger.diff(original_data, updated_data):
+            if change.path[0] == '_id':
+                continue
+            path = '.'.join(change.path)
+            if change.operation == 'set':
+                update.setdefault('$set', {})[path] = change.value
+            elif change.operation == 'unset':
+                update.setdefault('$unset', {})[path] = ''
+            elif change.operation == 'append':
+                update.setdefault('$push', {})[path] = {'$each': change.value}
+        if update:
+            measurement.count_payload(update)
+            self.__collection.update_one(query, update, upsert=False)
+
+    @tracing.traced('delete')
     def delete(self, **kwargs):
         data = self.find_one(**kwargs)
-        result = self.__collection.delete_one(kwargs['query'])
+        with self.metrics.measure('delete', 'db', items=1) as measurement:
+            measurement.count_payload(kwargs['query'])
+            result = self.__collection.delete_one(kwargs['query'])
         super().publish('delete', data, **kwargs)
         return result
 
+    @tracing.traced('batch_delete')
     def batch_delete(self, **kwargs):
-        items = self.__map_documents(**kwargs)
+        items = [item for batch in self.__map_batches('batch_delete', **kwargs) for item in batch]
         bulk_operations = []
         for item in items:
             bulk_operations.append(operations.DeleteOne(filter={'_id': item['_id']}))
 
-        results = self.__collection.bulk_write(bulk_operations, **kwargs.get('params', {}))
-        super().publish('batch_delete', items, **kwargs)
+        with self.metrics.measure('batch_delete', 'db', items=len(items)) as measurement:
+            measurement.count_payload([item['_id'] for item in items])
+            results = self.__collection.bulk_write(bulk_operations, **kwargs.get('params', {}))
+        super().publish_items('batch_delete', items, **kwargs)
         return results
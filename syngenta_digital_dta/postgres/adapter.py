@@ -1,12 +1,17 @@
+from psycopg2 import sql
 from psycopg2.extensions import AsIs
+from psycopg2.extras import execute_values
 
 from syngenta_digital_dta.postgres import json_formatting
 from syngenta_digital_dta.common import dict_merger
 from syngenta_digital_dta.common import logger
 from syngenta_digital_dta.common import publisher
+from syngenta_digital_dta.common import registry
 from syngenta_digital_dta.common import schema_mapper
+from syngenta_digital_dta.common import tracing
 from syngenta_digital_dta.common.base_adapter import BaseAdapter
 from syngenta_digital_dta.postgres.sql_connection import sql_connection
+from syngenta_digital_dta.postgres.sql_connector import SQLConnectionPool
 from syngenta_digital_dta.postgres.sql_connector import SQLConnector
 
 
@@ -28,21 +33,68 @@ class PostgresAdapter(BaseAdapter):
         self.sns_arn = kwargs.get('sns_arn')
         self.author_identifier = kwargs.get('author_identifier')
         self.event_publisher = publisher
-        self.connection = None
-        self.cursor = None
+        self.shared = kwargs.get('shared', False)
+        self.pool_size = kwargs.get('pool_size', 10)
+        self.pool = None
+        self.__connection = None
+        self.__cursor = None
+
+    @property
+    def connection(self):
+        if not self.shared:
+            return self.__connection
+        return self.pool.thread_connection() if self.pool is not None else None
+
+    @connection.setter
+    def connection(self, connection):
+        self.__connection = connection
+
+    @property
+    def cursor(self):
+        if not self.shared:
+            return self.__cursor
+        return self.pool.thread_cursor() if self.pool is not None else None
+
+    @cursor.setter
+    def cursor(self, cursor):
+        self.__cursor = cursor
 
     @sql_connection
     def connect(self, connector: SQLConnector):
-        self.connection = connector.connect()
-        self.cursor = connector.cursor()
+        if self.shared:
+            self.pool = registry.get_or_create('postgres', self.__pool_config(), lambda: SQLConnectionPool(self))
+        else:
+            self.connection = connector.connect()
+            self.cursor = connector.cursor()
 
     def commit(self, commit=True):
         if commit:
             self.connection.commit()
+            self.__release()
+
+    def rollback(self):
+        self.connection.rollback()
+        self.__release()
+
+    def __pool_config(self):
+        return {
+            'endpoint': self.endpoint,
+            'database': self.database,
+            'user': self.user,
+            'password': self.password,
+            'port': self.port,
+            'autocommit': self.autocommit,
+            'pool_size': self.pool_size
+        }
+
+    def __release(self):
+        if self.shared:
+            self.pool.release()
 
     def create(self, **kwargs):
         return self.insert(**kwargs)
 
+    @tracing.traced('insert')
     def insert(self, **kwargs):
         query = 'INSERT INTO %(table)s (%(columns)s) VALUES %(values)s'
         params = self.__get_data_params(**kwargs)
@@ -53,13 +105,42 @@ class PostgresAdapter(BaseAdapter):
         super().publish('create', params['data'], **kwargs)
         return params['data']
 
+    def batch_create(self, **kwargs):
+        return self.batch_insert(**kwargs)
+
+    @tracing.traced('batch_insert')
+    def batch_insert(self, **kwargs):
+        count = 0
+        batches = schema_mapper.map_batches(
+            kwargs['data'],
+            self.model_schema_file,
+            self.model_schema,
+            kwargs.get('batch_size', 1000),
+            **kwargs.get('mapping', {})
+        )
+        for data in batches:
+            columns = list(data[0].keys())
+            query = sql.SQL('INSERT INTO {} ({}) VALUES %s').format(
+                sql.Identifier(self.table),
+                sql.SQL(', ').join(map(sql.Identifier, columns))
+            )
+            values = [tuple(item.get(column) for column in columns) for item in data]
+            self.__execute_values(query, values, **kwargs)
+            count += len(data)
+            super().publish_items('batch_create', data, **kwargs)
+        return count
+
+    @tracing.traced('update')
     def update(self, **kwargs):
         exists = self.__get_existing(**kwargs)
         if not exists:
             self.__raise_error('NOT_EXISTS', **kwargs)
-        kwargs['data'] = dict_merger.merge(exists, kwargs['data'], **kwargs)
-        update = self.__create_update_query(kwargs['data'])
-        self.__execute(update['query'], update['params'], **kwargs)
+        with self.metrics.measure('update', 'merge'):
+            kwargs['data'] = dict_merger.merge(exists, kwargs['data'], **kwargs)
+        update_data = self.__get_changed_columns(exists, kwargs['data']) if kwargs.get('partial') else kwargs['data']
+        if update_data:
+            update = self.__create_update_query(update_data)
+            self.__execute(update['query'], update['params'], **kwargs)
         super().publish('update', kwargs['data'], **kwargs)
         return kwargs['data']
 
@@ -69,6 +150,7 @@ class PostgresAdapter(BaseAdapter):
             return self.update(**kwargs)
         return self.insert(**kwargs)
 
+    @tracing.traced('delete')
     def delete(self, identifier_value, **kwargs):
         query = 'DELETE FROM %(table)s WHERE %(identifier)s = %(identifier_value)s'
         params = self.__compose_params(data={f'{self.model_identifier}': identifier_value})
@@ -78,6 +160,7 @@ class PostgresAdapter(BaseAdapter):
     def read(self, identifier_value, **kwargs):
         return self.get(identifier_value, **kwargs)
 
+    @tracing.traced('get')
     def get(self, identifier_value, **kwargs):
         query = 'SELECT * FROM %(table)s WHERE %(identifier)s = %(identifier_value)s'
         params = self.__compose_params(data={f'{self.model_identifier}': identifier_value})
@@ -87,22 +170,26 @@ class PostgresAdapter(BaseAdapter):
     def read_all(self, **kwargs):
         return self.get_all(**kwargs)
 
+    @tracing.traced('get_all')
     def get_all(self, **kwargs):
         get_query = self.__create_get_all_query(**kwargs)
         self.__execute(get_query['query'], get_query['params'], **kwargs)
         return self.__get_data(all=True)
 
+    @tracing.traced('get_relationship')
     def get_relationship(self, relationship, **kwargs):
         join = self.__create_join_query(relationship, **kwargs)
         self.__execute(join['query'], join['params'], **kwargs)
         return self.__get_data(all=True)
 
+    @tracing.traced('create_table')
     def create_table(self, **kwargs):
         if not kwargs['query'].lower().startswith('create table'):
             self.__raise_error('TABLE_WRITE_ONLY', **kwargs)
         query = kwargs.pop('query')
         self.__execute(query, params={}, commit=True, rollback=True)
 
+    @tracing.traced('query')
     def query(self, **kwargs):
         if 'params' not in kwargs:
             self.__raise_error('PARAMS_REQUIRED', **kwargs)
@@ -113,6 +200,7 @@ class PostgresAdapter(BaseAdapter):
         self.__execute(query, params, **kwargs)
         return self.__get_data(all=True)
 
+    @tracing.traced('bulk_insert_json')
     def bulk_insert_json(self, **kwargs):
 
         statement = json_formatting.insert_json_into_table(
@@ -214,6 +302,15 @@ class PostgresAdapter(BaseAdapter):
             'params': params
         }
 
+    def __get_changed_columns(self, original_data, updated_data):
+        changes = dict_merger.diff(original_data, updated_data)
+        columns = {change.path[0] for change in changes if change.operation != 'unset'}
+        if not columns:
+            return {}
+        changed_data = {column: updated_data[column] for column in columns}
+        changed_data[self.model_identifier] = updated_data[self.model_identifier]
+        return changed_data
+
     def __get_existing(self, **kwargs):
         query = 'SELECT * FROM %(table)s WHERE %(identifier)s = %(identifier_value)s LIMIT 1'
         params = self.__compose_params(kwargs['data'])
@@ -224,31 +321,51 @@ class PostgresAdapter(BaseAdapter):
         return False
 
     def __get_data_params(self, **kwargs):
-        data = schema_mapper.map_to_schema(kwargs['data'], self.model_schema_file, self.model_schema)
+        with self.metrics.measure('insert', 'map'):
+            data = schema_mapper.map_to_schema(kwargs['data'], self.model_schema_file, self.model_schema)
         columns = data.keys()
         values = [data[column] for column in columns]
         return self.__compose_params(data, columns, values)
 
     def __get_data(self, **kwargs):
+        cursor = self.pool.last_cursor() if self.shared else self.cursor
         if kwargs.get('all', False):
-            get = self.cursor.fetchall
+            get = cursor.fetchall
         else:
-            get = self.cursor.fetchone
+            get = cursor.fetchone
         try:
             return get()
         except:
             return [] if kwargs.get('all', False) else None
 
     def __execute(self, query, params, **kwargs):
+        cursor = self.cursor
         try:
-            self.__debug(query, params, kwargs.get('debug', False))
-            self.cursor.execute(query, params)
-            self.commit(kwargs.get('commit', False))
+            self.__debug(cursor, query, params, kwargs.get('debug', False))
+            with self.metrics.measure(query.split(None, 1)[0].lower(), 'db') as measurement:
+                cursor.execute(query, params)
+                self.commit(kwargs.get('commit', False))
+                measurement.count(items=max(cursor.rowcount, 0), bytes=len(cursor.query or b''))
+            self.__release()
         except Exception as error:
-            self.__debug(query, params, True)
+            self.__debug(cursor, query, params, True)
             logger.log(level='ERROR', log={'error': error})
             if kwargs.get('rollback'):
-                self.connection.rollback()
+                self.rollback()
+            raise Exception(f'error with execution, check logs - {error}') from error
+
+    def __execute_values(self, query, values, **kwargs):
+        try:
+            with self.metrics.measure('batch_insert', 'db', items=len(values)) as measurement:
+                cursor = self.cursor
+                execute_values(cursor, query, values, page_size=len(values))
+                measurement.count(bytes=len(cursor.query or b''))
+                self.commit(kwargs.get('commit', False))
+            self.__release()
+        except Exception as error:
+            logger.log(level='ERROR', log={'error': error, 'query': str(query)})
+            if kwargs.get('rollback'):
+                self.rollback()
             raise Exception(f'error with execution, check logs - {error}') from error
 
     def __compose_params(self, data, columns='*', values=None):
@@ -263,9 +380,10 @@ class PostgresAdapter(BaseAdapter):
             'identifier_value': data[self.model_identifier]
         }
 
-    def __debug(self, query, params, debug=False):
-        if debug and self.cursor:
-            logger.log(level='INFO', log=self.cursor.mogrify(query, params))
+    def __debug(self, cursor, query, params, debug=False):
+        level = 'INFO' if debug else 'DEBUG'
+        if cursor and logger.is_enabled(level):
+            logger.log(level=level, log=lambda: cursor.mogrify(query, params).decode('utf-8'))
 
     def __raise_error(self, error_type, **kwargs):
         if error_type == 'PARAMS_REQUIRED':
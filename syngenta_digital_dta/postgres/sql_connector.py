@@ -1,7 +1,10 @@
+import threading
 from functools import lru_cache
 
 import psycopg2
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
 from psycopg2.extras import RealDictCursor
+from psycopg2.pool import ThreadedConnectionPool
 
 
 class SQLConnector:
@@ -36,3 +39,47 @@ class SQLConnector:
     @lru_cache(maxsize=128)
     def cursor(self):
         return self.connection.cursor(cursor_factory=RealDictCursor)
+
+
+class SQLConnectionPool(ThreadedConnectionPool):
+    def __init__(self, cls):
+        self.autocommit = cls.autocommit
+        self.local = threading.local()
+        super().__init__(
+            1,
+            cls.pool_size,
+            dbname=cls.database,
+            host=cls.endpoint,
+            port=cls.port,
+            user=cls.user,
+            password=cls.password
+        )
+
+    def getconn(self, key=None):
+        connection = super().getconn(key)
+        if connection.autocommit != self.autocommit:
+            connection.autocommit = self.autocommit
+        return connection
+
+    def thread_connection(self):
+        if getattr(self.local, 'connection', None) is None:
+            self.local.connection = self.getconn()
+            self.local.cursor = self.local.connection.cursor(cursor_factory=RealDictCursor)
+        return self.local.connection
+
+    def thread_cursor(self):
+        self.thread_connection()
+        return self.local.cursor
+
+    def last_cursor(self):
+        return getattr(self.local, 'cursor', None)
+
+    def release(self):
+        connection = getattr(self.local, 'connection', None)
+        if connection is not None and connection.info.transaction_status == TRANSACTION_STATUS_IDLE:
+            self.local.connection = None
+            self.putconn(connection)
+
+    def close(self):
+        if not self.closed:
+            self.closeall()
@@ -3,10 +3,12 @@ from io import BytesIO
 
 import boto3
 import botocore
-import jsonpickle
 from botocore.config import Config
 from botocore.exceptions import ClientError
 
+from syngenta_digital_dta.common import json_helper
+from syngenta_digital_dta.common import registry
+from syngenta_digital_dta.common import tracing
 from syngenta_digital_dta.common.base_adapter import BaseAdapter
 
 
@@ -21,8 +23,18 @@ class S3Adapter(BaseAdapter):
         self.aws_access_key_id = kwargs.get('aws_access_key_id')
         self.aws_secret_access_key = kwargs.get('aws_secret_access_key')
         self.region = kwargs.get('region')
-        self.client = self.__make_client()
-        self.resource = self.__make_resource()
+        self.shared = kwargs.get('shared', False)
+        self.client = self.__make_shared('s3_client', self.__make_client) if self.shared else self.__make_client()
+        self.resource = self.__make_shared('s3_resource', self.__make_resource) if self.shared else self.__make_resource()
+
+    def __make_shared(self, kind, factory):
+        config = {
+            'endpoint': self.endpoint,
+            'aws_access_key_id': self.aws_access_key_id,
+            'aws_secret_access_key': self.aws_secret_access_key,
+            'region': self.region
+        }
+        return registry.get_or_create(kind, config, factory)
 
     def __make_client(self, config=None):
         return boto3.client(
@@ -48,19 +60,22 @@ class S3Adapter(BaseAdapter):
         result = self.put(**kwargs)
         return result
 
+    @tracing.traced('put')
     def put(self, **kwargs):
         acl = self.__set_acl(kwargs.get('public_read', False))
         body = self.__set_body(**kwargs)
-        results = self.client.put_object(
-            ACL=acl,
-            Body=body,
-            Bucket=self.bucket,
-            Key=kwargs['s3_path']
-        )
+        with self.metrics.measure('put', 'db', bytes=len(body)):
+            results = self.client.put_object(
+                ACL=acl,
+                Body=body,
+                Bucket=self.bucket,
+                Key=kwargs['s3_path']
+            )
         if kwargs.get('publish', True):
             super().publish('create', self.__generate_publish_data(**kwargs), **kwargs)
         return results
 
+    @tracing.traced('upload_stream')
     def upload_stream(self, **kwargs):
         conf = boto3.s3.transfer.TransferConfig(
             multipart_threshold=kwargs.get('threshold', 10000),
@@ -92,6 +107,7 @@ class S3Adapter(BaseAdapter):
         if kwargs.get('publish', True):
             super().publish('create', self.__generate_publish_data(**kwargs), **kwargs)
 
+    @tracing.traced('delete')
     def delete(self, **kwargs):
         result = self.client.delete_object(
             Bucket=self.bucket,
@@ -102,18 +118,23 @@ class S3Adapter(BaseAdapter):
     def read(self, **kwargs):
         return self.get(**kwargs)
 
+    @tracing.traced('get')
     def get(self, **kwargs):
-        results = self.client.get_object(
-            Bucket=self.bucket,
-            Key=kwargs['s3_path']
-        )
+        with self.metrics.measure('get', 'db') as measurement:
+            results = self.client.get_object(
+                Bucket=self.bucket,
+                Key=kwargs['s3_path']
+            )
+            measurement.count(bytes=results.get('ContentLength', 0))
         return self.__set_results(results, **kwargs)
 
+    @tracing.traced('download')
     def download(self, **kwargs):
         self.__create_download_directory(kwargs['download_path'])
         self.client.download_file(self.bucket, kwargs['s3_path'], kwargs['download_path'])
         return kwargs['download_path']
 
+    @tracing.traced('multipart_upload')
     def multipart_upload(self, **kwargs):
         multipart = self.client.create_multipart_upload(Bucket=self.bucket, Key=kwargs['s3_path'])
         parts = []
@@ -217,8 +238,7 @@ class S3Adapter(BaseAdapter):
 
     def __set_results(self, results, **kwargs):
         if kwargs.get('json'):
-            body = results['Body'].read().decode('utf-8')
-            return jsonpickle.decode(body)
+            return json_helper.loads(results['Body'].read())
         if kwargs.get('decode', True):
             return results['Body'].read().decode('utf-8')
         return results
@@ -226,7 +246,7 @@ class S3Adapter(BaseAdapter):
     def __set_body(self, **kwargs):
         data = kwargs['data']
         if kwargs.get('json'):
-            data = jsonpickle.dumps(data, unpicklable=False, use_decimal=True)
+            data = json_helper.dumps(data)
         if kwargs.get('encode', True):
             data = bytes(data.encode('UTF-8'))
         return data
@@ -0,0 +1,161 @@
+import threading
+import unittest
+from unittest import mock
+
+from syngenta_digital_dta.common import async_publisher
+from syngenta_digital_dta.common import registry
+from syngenta_digital_dta.common.base_adapter import BaseAdapter
+
+
+class AsyncPublisherTest(unittest.TestCase):
+
+    def setUp(self, *args, **keywargs):
+        self.maxDiff = None
+        self.mock_sns_arn = 'arn:aws:sns:us-east-2:111111111111:unittest-mock-sns-topic'
+        self.release = threading.Event()
+        self.transport = mock.MagicMock()
+        self.transport.publish.side_effect = lambda **kwargs: self.release.wait(5)
+
+    def tearDown(self):
+        self.release.set()
+        registry.close_all()
+
+    def test_publish_flush(self):
+        self.release.set()
+        async_pub = async_publisher.AsyncPublisher(transport=self.transport)
+        for index in range(20):
+            async_pub.publish(arn=self.mock_sns_arn, data={'index': index})
+        self.assertTrue(async_pub.flush(5))
+        self.assertEqual(self.transport.publish.call_count, 20)
+        metrics = async_pub.get_metrics()
+        self.assertEqual(metrics['published'], 20)
+        self.assertEqual(metrics['depth'], 0)
+        self.assertEqual(metrics['in_flight'], 0)
+
+    def test_flush_timeout(self):
+        async_pub = async_publisher.AsyncPublisher(transport=self.transport, workers=1)
+        async_pub.publish(arn=self.mock_sns_arn, data={'key': 'value'})
+        self.assertFalse(async_pub.flush(0.05))
+        self.release.set()
+        self.assertTrue(async_pub.flush(5))
+
+    def test_backpressure_drop_oldest(self):
+        async_pub = async_publisher.AsyncPublisher(
+            transport=self.transport, workers=1, queue_size=2, backpressure='drop_oldest'
+        )
+        for index in range(6):
+            async_pub.publish(arn=self.mock_sns_arn, data={'index': index})
+        self.release.set()
+        async_pub.flush(5)
+        published = [call.kwargs['data']['index'] for call in self.transport.publish.call_args_list]
+        self.assertEqual(published[-2:], [4, 5])
+        self.assertEqual(async_pub.get_metrics()['dropped'], 6 - len(published))
+
+    def test_backpressure_fail(self):
+        async_pub = async_publisher.AsyncPublisher(
+            transport=self.transport, workers=1, queue_size=1, backpressure='fail'
+        )
+        with self.assertRaises(async_publisher.PublishQueueFullException):
+            for index in range(5):
+                async_pub.publish(arn=self.mock_sns_arn, data={'index': index})
+        self.assertEqual(async_pub.get_metrics()['rejected'], 1)
+
+    def test_backpressure_block(self):
+        async_pub = async_publisher.AsyncPublisher(transport=self.transport, workers=1, queue_size=1)
+        threading.Timer(0.05, self.release.set).start()
+        for index in range(5):
+            async_pub.publish(arn=self.mock_sns_arn, data={'index': index})
+        async_pub.flush(5)
+        self.assertEqual(self.transport.publish.call_count, 5)
+
+    def test_invalid_backpressure(self):
+        with self.assertRaises(async_publisher.PublishQueueException):
+            async_publisher.AsyncPublisher(backpressure='unknown')
+
+    def test_transport_error(self):
+        self.transport.publish.side_effect = Exception('unit-test')
+        async_pub = async_publisher.AsyncPublisher(transport=self.transport)
+        async_pub.publish(arn=self.mock_sns_arn, data={'key': 'value'})
+        async_pub.flush(5)
+        self.assertEqual(async_pub.get_metrics()['failed'], 1)
+
+    def test_close_rejects_publish(self):
+        self.release.set()
+        async_pub = async_publisher.AsyncPublisher(transport=self.transport)
+        async_pub.publish(arn=self.mock_sns_arn, data={'key': 'value'})
+        self.assertTrue(async_pub.close(5))
+        with self.assertRaises(async_publisher.PublishQueueClosedException):
+            async_pub.publish(arn=self.mock_sns_arn, data={'key': 'value'})
+        self.assertEqual(self.transport.publish.call_count, 1)
+        self.assertEqual(async_pub.get_metrics()['rejected'], 1)
+
+    def test_close_wakes_blocked_publish(self):
+        async_pub = async_publisher.AsyncPublisher(transport=self.transport, queue_size=1, workers=1)
+        async_pub.publish(arn=self.mock_sns_arn, data={'index': 0})
+        async_pub.publish(arn=self.mock_sns_arn, data={'index': 1})
+        errors = []
+
+        def blocked_publish():
+            try:
+                async_pub.publish(arn=self.mock_sns_arn, data={'index': 2})
+            except async_publisher.PublishQueueClosedException as error:
+                errors.append(error)
+
+        thread = threading.Thread(target=blocked_publish)
+        thread.start()
+        with mock.patch('syngenta_digital_dta.common.async_publisher.logger'):
+            async_pub.close(0.05)
+        thread.join(5)
+        self.release.set()
+        self.assertEqual(len(errors), 1)
+
+    def test_close_timeout_drops_queued(self):
+        async_pub = async_publisher.AsyncPublisher(transport=self.transport, workers=1)
+        for index in range(3):
+            async_pub.publish(arn=self.mock_sns_arn, data={'index': index})
+        with mock.patch('syngenta_digital_dta.common.async_publisher.logger') as mock_logger:
+            self.assertFalse(async_pub.close(0.05))
+        self.assertIn('dropped 2 queued messages', mock_logger.log.call_args.kwargs['log']['error'])
+        metrics = async_pub.get_metrics()
+        self.assertEqual(metrics['dropped'], 2)
+        self.assertEqual(metrics['depth'], 0)
+        self.release.set()
+        self.assertTrue(async_pub.flush(5))
+        self.assertEqual(self.transport.publish.call_count, 1)
+
+    def test_close_all_is_bounded(self):
+        async_pub = async_publisher.get_publisher(transport=self.transport, workers=1)
+        async_pub.publish(arn=self.mock_sns_arn, data={'key': 'value'})
+        threading.Timer(0.1, self.release.set).start()
+        with mock.patch.object(async_pub, 'flush', wraps=async_pub.flush) as flush:
+            registry.close_all()
+        flush.assert_called_once_with(async_publisher.CLOSE_TIMEOUT)
+
+    def test_flush_on_exit(self):
+        async_pub = async_publisher.AsyncPublisher(transport=self.transport, workers=1)
+
+        @async_publisher.flush_on_exit
+        def handler(event, context):
+            async_pub.publish(arn=self.mock_sns_arn, data=event)
+            threading.Timer(0.05, self.release.set).start()
+            return 'done'
+
+        self.assertEqual(handler({'key': 'value'}, None), 'done')
+        self.assertEqual(async_pub.get_metrics()['published'], 1)
+
+    def test_get_publisher_shared(self):
+        first = async_publisher.get_publisher(queue_size=10)
+        second = async_publisher.get_publisher(queue_size=10)
+        other = async_publisher.get_publisher(queue_size=10, backpressure='fail')
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+
+    def test_base_adapter_sns_async(self):
+        adapter = BaseAdapter(sns_arn=self.mock_sns_arn, sns_async=True, sns_queue_size=5)
+        self.assertIsInstance(adapter.publisher, async_publisher.AsyncPublisher)
+        self.assertEqual(adapter.publisher.queue_size, 5)
+        adapter.publisher.transport = self.transport
+        self.release.set()
+        adapter.publish('create', {'key': 'value'})
+        self.assertTrue(adapter.publisher.flush(5))
+        self.transport.publish.assert_called_once()
@@ -1,7 +1,10 @@
+import threading
 import unittest
 import warnings
+from unittest import mock
 
 from syngenta_digital_dta.common.base_adapter import BaseAdapter
+from syngenta_digital_dta.common.base_adapter import FrozenDict
 
 
 class BaseAdapterTest(unittest.TestCase):
@@ -168,3 +171,66 @@ class BaseAdapterTest(unittest.TestCase):
                 }
             }
         )
+
+    def test_publish_batch(self):
+        base_adapter = BaseAdapter(sns_arn=self.mock_sns_arn, sns_region='us-east-2', model_schema='unit-test')
+        base_adapter.publisher = mock.MagicMock()
+        items = [{'id': 'a'}, {'id': 'b'}]
+        base_adapter.publish_batch(
+            'batch_create', items, fifo_group_id=lambda item: item['id'], fifo_duplication_id='unit-test'
+        )
+        kwargs = base_adapter.publisher.publish_batch.call_args.kwargs
+        self.assertEqual(kwargs['region'], 'us-east-2')
+        self.assertEqual(kwargs['attributes']['operation']['StringValue'], 'batch_create')
+        self.assertListEqual(
+            kwargs['entries'],
+            [
+                {'data': {'id': 'a'}, 'fifo_group_id': 'a', 'fifo_duplication_id': 'unit-test-0'},
+                {'data': {'id': 'b'}, 'fifo_group_id': 'b', 'fifo_duplication_id': 'unit-test-1'}
+            ]
+        )
+
+    def test_publish_items(self):
+        base_adapter = BaseAdapter(sns_arn=self.mock_sns_arn, model_schema='unit-test')
+        base_adapter.publisher = mock.MagicMock()
+        base_adapter.publish_items('batch_create', [{'id': 'a'}])
+        self.assertEqual(base_adapter.publisher.publish.call_args.kwargs['data'], [{'id': 'a'}])
+        base_adapter.sns_per_item = True
+        base_adapter.publish_items('batch_create', [{'id': 'a'}])
+        entries = base_adapter.publisher.publish_batch.call_args.kwargs['entries']
+        self.assertListEqual([entry['data'] for entry in entries], [{'id': 'a'}])
+
+    def test_format_attributes_cached_and_immutable(self):
+        base_adapter = BaseAdapter(model_schema='test-dynamo-model', sns_arn=self.mock_sns_arn)
+        result = base_adapter.create_format_attibutes('create')
+        self.assertIs(result, base_adapter.create_format_attibutes('create'))
+        self.assertIs(base_adapter.create_format_attibutes('custom'), base_adapter.create_format_attibutes('custom'))
+        self.assertIsInstance(result, FrozenDict)
+        self.assertNotIn('operation', base_adapter.default_attributes)
+        with self.assertRaises(TypeError):
+            result['operation'] = {'DataType': 'String', 'StringValue': 'delete'}
+        with self.assertRaises(TypeError):
+            result['operation']['StringValue'] = 'delete'
+
+    def test_publish_attributes_threads(self):
+        base_adapter = BaseAdapter(model_schema='test-dynamo-model', sns_arn=self.mock_sns_arn)
+        published = []
+        base_adapter.publisher = mock.MagicMock()
+        base_adapter.publisher.publish.side_effect = lambda **kwargs: published.append(kwargs)
+        operations = ['create', 'update', 'delete', 'batch_create', 'custom']
+        barrier = threading.Barrier(len(operations))
+
+        def worker(operation):
+            barrier.wait()
+            for _ in range(500):
+                base_adapter.publish(operation, {'operation': operation})
+
+        threads = [threading.Thread(target=worker, args=(operation,)) for operation in operations]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(published), 2500)
+        for kwargs in published:
+            self.assertEqual(kwargs['attributes']['operation']['StringValue'], kwargs['data']['operation'])
+            self.assertEqual(kwargs['attributes']['model_schema']['StringValue'], 'test-dynamo-model')
@@ -0,0 +1,74 @@
+import json
+import unittest
+import warnings
+from unittest import mock
+
+import boto3
+
+from syngenta_digital_dta.common import claim_check
+from syngenta_digital_dta.common import publisher
+from syngenta_digital_dta.common import registry
+from syngenta_digital_dta.common.base_adapter import BaseAdapter
+
+
+class ClaimCheckTest(unittest.TestCase):
+
+    def setUp(self, *args, **keywargs):
+        warnings.simplefilter('ignore', ResourceWarning)
+        self.maxDiff = None
+        self.bucket = 'unit-test-claim-check'
+        self.endpoint = 'http://localhost:4566'
+        self.mock_sns_arn = 'arn:aws:sns:us-east-2:111111111111:unittest-mock-sns-topic'
+        s3_client = boto3.client('s3', endpoint_url=self.endpoint, region_name='us-east-2')
+        try:
+            s3_client.create_bucket(Bucket=self.bucket, CreateBucketConfiguration={'LocationConstraint': 'us-east-2'})
+        except s3_client.exceptions.BucketAlreadyOwnedByYou:
+            pass
+
+    def tearDown(self):
+        registry.close_all()
+
+    def test_check_small_message_inline(self):
+        check = claim_check.ClaimCheck(bucket=self.bucket, endpoint=self.endpoint, threshold=100)
+        message = json.dumps({'key': 'value'})
+        self.assertEqual(check.check(message), message)
+
+    def test_check_and_resolve(self):
+        check = claim_check.ClaimCheck(bucket=self.bucket, endpoint=self.endpoint, threshold=100)
+        data = {'payload': 'x' * 1000}
+        pointer = json.loads(check.check(json.dumps(data)))
+        self.assertTrue(claim_check.is_pointer(pointer))
+        self.assertEqual(pointer['claim_check']['bucket'], self.bucket)
+        self.assertIsNone(pointer['claim_check']['encoding'])
+        self.assertDictEqual(claim_check.resolve(pointer, endpoint=self.endpoint), data)
+
+    def test_check_and_resolve_compressed(self):
+        check = claim_check.ClaimCheck(bucket=self.bucket, endpoint=self.endpoint, threshold=100, compress=True)
+        data = {'payload': 'x' * 1000}
+        message = check.check(json.dumps(data))
+        self.assertTrue(json.loads(message)['claim_check']['key'].endswith('.json.gz'))
+        self.assertDictEqual(claim_check.resolve(message, endpoint=self.endpoint), data)
+
+    def test_resolve_inline_message(self):
+        self.assertDictEqual(claim_check.resolve('{"key": "value"}'), {'key': 'value'})
+
+    def test_adapter_publish_offloads(self):
+        adapter = BaseAdapter(
+            sns_arn=self.mock_sns_arn,
+            sns_region='us-east-2',
+            sns_pool_size=7,
+            sns_claim_check_bucket=self.bucket,
+            sns_claim_check_endpoint=self.endpoint,
+            sns_claim_check_threshold=100
+        )
+        data = {'payload': 'x' * 1000}
+        with mock.patch.object(publisher, '_create_client') as mock_create_client:
+            adapter.publish('create', data)
+            adapter.publish_batch('batch_create', [data, {'key': 'value'}])
+            client = mock_create_client.return_value
+        message = client.publish.call_args.kwargs['Message']
+        self.assertEqual(client.publish.call_args.kwargs['MessageAttributes']['operation']['StringValue'], 'create')
+        self.assertDictEqual(claim_check.resolve(message, endpoint=self.endpoint), data)
+        entries = client.publish_batch.call_args.kwargs['PublishBatchRequestEntries']
+        self.assertDictEqual(claim_check.resolve(entries[0]['Message'], endpoint=self.endpoint), data)
+        self.assertDictEqual(json.loads(entries[1]['Message']), {'key': 'value'})
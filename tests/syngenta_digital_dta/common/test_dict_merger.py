@@ -47,3 +47,92 @@ class DictMergerTest(unittest.TestCase):
         }
         results = dict_merger.merge(old_dict_list, new_dict_list, update_dict_operation='replace')
         self.assertDictEqual(results, old_dict_list)
+
+    def test_merge_does_not_modify_original(self):
+        old_dict = {
+            'key1': {'nested': {'value': 1}, 'other': 'value'},
+            'list1': [0, 1],
+            'untouched': {'nested': [{'value': 1}]}
+        }
+        new_dict = {
+            'key1': {'nested': {'value': 2}},
+            'list1': [2]
+        }
+        results = dict_merger.merge(old_dict, new_dict)
+        self.assertDictEqual(results, {
+            'key1': {'nested': {'value': 2}, 'other': 'value'},
+            'list1': [0, 1, 2],
+            'untouched': {'nested': [{'value': 1}]}
+        })
+        self.assertDictEqual(old_dict, {
+            'key1': {'nested': {'value': 1}, 'other': 'value'},
+            'list1': [0, 1],
+            'untouched': {'nested': [{'value': 1}]}
+        })
+        self.assertIs(results['untouched'], old_dict['untouched'])
+        self.assertIsNot(results['key1'], old_dict['key1'])
+
+    def test_merge_remove_nested_key(self):
+        old_dict = {
+            'key1': {'nested': 'value', 'other': 'value'}
+        }
+        results = dict_merger.merge(old_dict, {'key1': {'nested': None}}, update_dict_operation='remove')
+        self.assertDictEqual(results, {'key1': {'other': 'value'}})
+        self.assertDictEqual(old_dict, {'key1': {'nested': 'value', 'other': 'value'}})
+
+    def test_merge_add_unique_objects(self):
+        old_dict = {
+            'list1': [{'id': 1, 'nested': {'a': 1, 'b': 2}}, {'id': 2}]
+        }
+        new_dict = {
+            'list1': [{'nested': {'b': 2, 'a': 1}, 'id': 1}, {'id': 3}, {'id': 3}]
+        }
+        results = dict_merger.merge(old_dict, new_dict)
+        self.assertListEqual(results['list1'], [{'id': 1, 'nested': {'a': 1, 'b': 2}}, {'id': 2}, {'id': 3}])
+        self.assertEqual(len(old_dict['list1']), 2)
+
+    def test_merge_remove_list_items(self):
+        old_dict = {
+            'list1': [{'id': 1, 'tags': ['a']}, {'id': 2}, {'id': 1, 'tags': ['a']}, {'id': 3}, 'value']
+        }
+        new_dict = {
+            'list1': [{'tags': ['a'], 'id': 1}, {'id': 3}, 'value']
+        }
+        results = dict_merger.merge(old_dict, new_dict, update_list_operation='remove')
+        self.assertListEqual(results['list1'], [{'id': 2}])
+        self.assertEqual(len(old_dict['list1']), 5)
+
+    def test_merge_replace_list(self):
+        results = dict_merger.merge({'list1': [0, 1, 2]}, {'list1': [3]}, update_list_operation='replace')
+        self.assertListEqual(results['list1'], [3])
+
+    def test_diff(self):
+        original = {
+            'key1': 'value1',
+            'nested': {'same': 1, 'changed': 1, 'removed': 1},
+            'list1': [1, 2],
+            'list2': [1, 2],
+            'removed': True
+        }
+        updated = {
+            'key1': 'value1',
+            'nested': {'same': 1, 'changed': 2, 'added': 3},
+            'list1': [1, 2, 3],
+            'list2': [2],
+            'added': None
+        }
+        changes = dict_merger.diff(original, updated)
+        self.assertListEqual(changes, [
+            dict_merger.Change('set', ('nested', 'changed'), 2),
+            dict_merger.Change('set', ('nested', 'added'), 3),
+            dict_merger.Change('unset', ('nested', 'removed'), None),
+            dict_merger.Change('append', ('list1',), [3]),
+            dict_merger.Change('set', ('list2',), [2]),
+            dict_merger.Change('set', ('added',), None),
+            dict_merger.Change('unset', ('removed',), None)
+        ])
+
+    def test_diff_merge(self):
+        original = {'key1': 'value1', 'list1': [1], 'untouched': {'nested': [1, 2]}}
+        merged = dict_merger.merge(original, {'list1': [2]})
+        self.assertListEqual(dict_merger.diff(original, merged), [dict_merger.Change('append', ('list1',), [2])])
@@ -0,0 +1,134 @@
+import collections
+import datetime
+import importlib
+import json
+import os
+import unittest
+import uuid
+from decimal import Decimal
+from unittest import mock
+
+from syngenta_digital_dta.common import json_helper
+
+
+class JSONHelperTest(unittest.TestCase):
+
+    def setUp(self, *args, **keywargs):
+        self.maxDiff = None
+        self.backend = json_helper.get_backend()
+        self.data = {
+            'integer': Decimal('10'),
+            'exponent': Decimal('1E+2'),
+            'float': Decimal('1.5'),
+            'created': datetime.datetime(2020, 10, 5, 12, 30, 15),
+            'day': datetime.date(2020, 10, 5),
+            'raw': b'unit-test',
+            'tags': ('a', 'b'),
+            'nested': [{'value': Decimal('-0.25')}]
+        }
+        self.expected = {
+            'integer': 10,
+            'exponent': 100,
+            'float': 1.5,
+            'created': '2020-10-05T12:30:15',
+            'day': '2020-10-05',
+            'raw': 'dW5pdC10ZXN0',
+            'tags': ['a', 'b'],
+            'nested': [{'value': -0.25}]
+        }
+
+    def tearDown(self):
+        json_helper.set_backend(self.backend)
+
+    def available_backends(self):
+        backends = []
+        for backend in json_helper.BACKENDS:
+            try:
+                importlib.import_module(backend)
+            except ImportError:
+                continue
+            backends.append(backend)
+        return backends
+
+    def test_backends_consistent(self):
+        for backend in self.available_backends():
+            with self.subTest(backend=backend):
+                json_helper.set_backend(backend)
+                self.assertEqual(json_helper.get_backend(), backend)
+                encoded = json_helper.dumps(self.data)
+                self.assertIsInstance(encoded, str)
+                self.assertDictEqual(json.loads(encoded), self.expected)
+                self.assertDictEqual(json_helper.loads(encoded), self.expected)
+                self.assertDictEqual(json_helper.loads(encoded.encode('utf-8')), self.expected)
+
+    def test_compact_sorted(self):
+        for backend in self.available_backends():
+            with self.subTest(backend=backend):
+                json_helper.set_backend(backend)
+                encoded = json_helper.dumps({'b': 1, 'a': [1, 2]}, compact=True, sort_keys=True)
+                self.assertEqual(encoded, '{"a":[1,2],"b":1}')
+
+    def test_high_precision_decimal(self):
+        for backend in self.available_backends():
+            with self.subTest(backend=backend):
+                json_helper.set_backend(backend)
+                encoded = json_helper.dumps({'value': Decimal('0.12345678901234567890123')}, compact=True)
+                self.assertEqual(encoded, '{"value":0.12345678901234567890123}')
+                self.assertEqual(json.loads(encoded, parse_float=Decimal)['value'], Decimal('0.12345678901234567890123'))
+
+    def test_38_digit_decimal(self):
+        value = Decimal('9' * 38)
+        for backend in self.available_backends():
+            with self.subTest(backend=backend):
+                json_helper.set_backend(backend)
+                encoded = json_helper.dumps({'value': value, 'negative': Decimal('-' + '9' * 38)}, compact=True)
+                self.assertEqual(encoded, f'{{"value":{"9" * 38},"negative":-{"9" * 38}}}')
+                self.assertEqual(json_helper.loads(encoded)['value'], int('9' * 38))
+                self.assertEqual(json_helper.loads(encoded.encode('utf-8'))['negative'], -int('9' * 38))
+
+    def test_non_finite_decimal(self):
+        for backend in self.available_backends():
+            with self.subTest(backend=backend):
+                json_helper.set_backend(backend)
+                self.assertEqual(json_helper.dumps({'value': Decimal('NaN')}, compact=True), '{"value":null}')
+
+    def test_uuid(self):
+        value = uuid.UUID('6f1c2b8e-0b7a-4d4e-9a51-3c0e2f6d1a77')
+        for backend in self.available_backends():
+            with self.subTest(backend=backend):
+                json_helper.set_backend(backend)
+                self.assertEqual(json_helper.dumps({'id': value}, compact=True), f'{{"id":"{value}"}}')
+
+    def test_dumps_options(self):
+        for backend in self.available_backends():
+            with self.subTest(backend=backend):
+                json_helper.set_backend(backend)
+                self.assertEqual(json_helper.dumps({'b': 1, 'a': 2}, compact=True, sort_keys=True), '{"a":2,"b":1}')
+
+    def test_dumps_unsupported(self):
+        for backend in self.available_backends():
+            with self.subTest(backend=backend):
+                json_helper.set_backend(backend)
+                with self.assertRaises(TypeError):
+                    json_helper.dumps({'value': object()})
+                self.assertEqual(json_helper.try_encode_json({'value': 1j}), {'value': 1j})
+
+    def test_namedtuple_as_list(self):
+        Point = collections.namedtuple('Point', ['x', 'y'])
+        for backend in self.available_backends():
+            with self.subTest(backend=backend):
+                json_helper.set_backend(backend)
+                self.assertEqual(json.loads(json_helper.dumps({'point': Point(1, 2)})), {'point': [1, 2]})
+
+    def test_set_backend_env(self):
+        with mock.patch.dict(os.environ, {'DTA_JSON_BACKEND': 'json'}):
+            self.assertEqual(json_helper.set_backend(), 'json')
+        self.assertEqual(json_helper.get_backend(), 'json')
+
+    def test_set_backend_unknown(self):
+        with self.assertRaises(json_helper.JSONBackendException):
+            json_helper.set_backend('unknown')
+
+    def test_try_decode_json(self):
+        self.assertDictEqual(json_helper.try_decode_json('{"key": "value"}'), {'key': 'value'})
+        self.assertEqual(json_helper.try_decode_json('not json'), 'not json')
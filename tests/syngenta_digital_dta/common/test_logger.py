@@ -0,0 +1,93 @@
+import json
+import os
+import threading
+import unittest
+from unittest import mock
+
+from syngenta_digital_dta.common import logger
+
+
+class LoggerTest(unittest.TestCase):
+
+    def setUp(self, *args, **keywargs):
+        self.maxDiff = None
+        self.records = []
+        logger.configure(level='INFO', enabled=True, handler=self.records.append)
+
+    def tearDown(self):
+        logger.configure()
+
+    def test_log(self):
+        self.assertTrue(logger.log(level='WARN', log={'error': 'unit-test'}))
+        self.assertListEqual(self.records, [{'level': 'WARN', 'log': {'error': 'unit-test'}}])
+
+    def test_level_filtered_before_payload(self):
+        payload = mock.MagicMock(return_value={'query': 'select 1'})
+        self.assertFalse(logger.log(level='DEBUG', log=payload))
+        payload.assert_not_called()
+        self.assertListEqual(self.records, [])
+        self.assertTrue(logger.log(level='ERROR', log=payload))
+        payload.assert_called_once()
+        self.assertListEqual(self.records, [{'level': 'ERROR', 'log': {'query': 'select 1'}}])
+
+    def test_disabled_in_unittest_mode(self):
+        with mock.patch.dict(os.environ, {'RUN_MODE': 'unittest'}):
+            logger.configure(handler=self.records.append)
+        self.assertFalse(logger.is_enabled('ERROR'))
+        self.assertFalse(logger.log(level='ERROR', log={'error': 'unit-test'}))
+        self.assertListEqual(self.records, [])
+
+    def test_level_from_env(self):
+        with mock.patch.dict(os.environ, {'DTA_LOG_LEVEL': 'DEBUG'}):
+            logger.configure(enabled=True, handler=self.records.append)
+        self.assertTrue(logger.is_enabled('DEBUG'))
+
+    def test_unknown_level(self):
+        with self.assertRaises(logger.LoggerException):
+            logger.configure(level='LOUD')
+
+    def test_sampling(self):
+        with mock.patch.object(logger.random, 'random', side_effect=[0.05, 0.5, 0.95]):
+            results = [logger.log(level='INFO', log={'index': index}, sample=0.1) for index in range(3)]
+        self.assertListEqual(results, [True, False, False])
+        self.assertListEqual(self.records, [{'level': 'INFO', 'log': {'index': 0}}])
+
+    def test_print_handler(self):
+        with mock.patch('builtins.print') as mock_print:
+            logger.print_handler({'level': 'ERROR', 'log': {'error': Exception('unit-test')}})
+        self.assertDictEqual(json.loads(mock_print.call_args.args[0]), {'level': 'ERROR', 'log': {'error': 'unit-test'}})
+
+    def test_async_handler(self):
+        handled = []
+        release = threading.Event()
+        handler = logger.AsyncHandler(handler=lambda record: release.wait(5) and handled.append(record), queue_size=5)
+        logger.configure(level='INFO', enabled=True, handler=handler)
+        for index in range(10):
+            logger.log(level='INFO', log={'index': index})
+        self.assertFalse(handler.flush(0.01))
+        release.set()
+        self.assertTrue(handler.flush(5))
+        self.assertEqual(len(handled) + handler.dropped, 10)
+        self.assertEqual(handled[0], {'level': 'INFO', 'log': {'index': 0}})
+
+    def test_async_handler_close(self):
+        handled = []
+        release = threading.Event()
+        handler = logger.AsyncHandler(handler=lambda record: release.wait(5) and handled.append(record))
+        handler({'level': 'INFO', 'log': {'index': 0}})
+        self.assertFalse(handler.close(0.01))
+        self.assertTrue(logger.flush_all(0.01))
+        release.set()
+        self.assertTrue(handler.flush(5))
+        handler({'level': 'INFO', 'log': {'index': 1}})
+        self.assertTrue(logger.flush_all(5))
+        self.assertEqual(len(handled), 2)
+        handler.close(5)
+
+    def test_async_handler_flush_is_bounded(self):
+        release = threading.Event()
+        handler = logger.AsyncHandler(handler=lambda record: release.wait(5))
+        handler({'level': 'INFO', 'log': {}})
+        self.assertFalse(logger.flush_all(0.01))
+        release.set()
+        self.assertTrue(handler.close(5))
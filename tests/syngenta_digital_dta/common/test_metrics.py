@@ -0,0 +1,113 @@
+import json
+import socket
+import unittest
+from unittest import mock
+
+from syngenta_digital_dta.common import metrics
+from syngenta_digital_dta.common import registry
+from syngenta_digital_dta.common.base_adapter import BaseAdapter
+
+
+class MetricsTest(unittest.TestCase):
+
+    def setUp(self, *args, **keywargs):
+        self.maxDiff = None
+        registry.close_all()
+
+    def tearDown(self):
+        registry.close_all()
+
+    def test_null_instrumentation(self):
+        instrumentation = metrics.get_instrumentation()
+        self.assertIs(instrumentation, metrics.NULL_INSTRUMENTATION)
+        with instrumentation.measure('create', 'db', items=1) as measurement:
+            measurement.count(bytes=10)
+            measurement.count_payload({'id': 1})
+        self.assertIs(measurement, metrics.NULL_MEASUREMENT)
+
+    def test_count_payload(self):
+        sink = metrics.MemorySink()
+        instrumentation = metrics.get_instrumentation(sink, engine='unit-test')
+        with instrumentation.measure('create', 'db') as measurement:
+            measurement.count_payload({'id': 'é'})
+            measurement.count_payload(object())
+        [stats] = sink.get_stats()
+        self.assertEqual(stats['bytes'], len('{"id":"é"}'.encode('utf-8')))
+
+    def test_memory_sink(self):
+        instrumentation = metrics.get_instrumentation('memory', engine='unit-test')
+        for _ in range(3):
+            with instrumentation.measure('create', 'db', items=2) as measurement:
+                measurement.count(bytes=100)
+        with self.assertRaises(ValueError):
+            with instrumentation.measure('create', 'db'):
+                raise ValueError('unit-test')
+        [stats] = metrics.get_sink('memory').get_stats()
+        self.assertEqual(stats['engine'], 'unit-test')
+        self.assertEqual(stats['operation'], 'create')
+        self.assertEqual(stats['phase'], 'db')
+        self.assertEqual(stats['count'], 4)
+        self.assertEqual(stats['errors'], 1)
+        self.assertEqual(stats['items'], 6)
+        self.assertEqual(stats['bytes'], 300)
+        self.assertLessEqual(stats['min'], stats['p50'])
+        self.assertLessEqual(stats['p99'], stats['max'])
+
+    def test_memory_sink_percentiles(self):
+        sink = metrics.MemorySink()
+        for duration in [0.001] * 98 + [1.0, 3.0]:
+            sink.record({'engine': 'e', 'operation': 'o', 'phase': 'p', 'duration': duration, 'error': False, 'counts': {}})
+        [stats] = sink.get_stats()
+        self.assertEqual(stats['p50'], 0.001)
+        self.assertEqual(stats['p99'], 1.0)
+        self.assertEqual(stats['max'], 3.0)
+        sink.reset()
+        self.assertListEqual(sink.get_stats(), [])
+
+    def test_statsd_sink(self):
+        server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        server.bind(('127.0.0.1', 0))
+        server.settimeout(5)
+        sink = metrics.StatsDSink(port=server.getsockname()[1], prefix='dta')
+        sink.record({'engine': 'dynamodb', 'operation': 'insert', 'phase': 'db', 'duration': 0.0125,
+                     'error': True, 'counts': {'items': 1}})
+        lines = server.recv(4096).decode('utf-8').split('\n')
+        sink.close()
+        server.close()
+        self.assertListEqual(lines, [
+            'dta.dynamodb.insert.db.duration:12.500|ms',
+            'dta.dynamodb.insert.db.errors:1|c',
+            'dta.dynamodb.insert.db.items:1|c'
+        ])
+
+    def test_emf_sink(self):
+        lines = []
+        sink = metrics.EMFSink(namespace='unit-test', handler=lines.append)
+        sink.record({'engine': 'mongo', 'operation': 'find', 'phase': 'db', 'duration': 0.002,
+                     'error': False, 'counts': {'items': 5}})
+        record = json.loads(lines[0])
+        self.assertEqual(record['_aws']['CloudWatchMetrics'][0]['Namespace'], 'unit-test')
+        self.assertListEqual(record['_aws']['CloudWatchMetrics'][0]['Dimensions'], [['engine', 'operation', 'phase']])
+        self.assertEqual(record['duration'], 2.0)
+        self.assertEqual(record['errors'], 0)
+        self.assertEqual(record['items'], 5)
+
+    def test_unknown_sink(self):
+        with self.assertRaises(metrics.MetricsException):
+            metrics.get_instrumentation('unknown')
+
+    def test_sink_errors_ignored(self):
+        sink = mock.MagicMock()
+        sink.record.side_effect = Exception('unit-test')
+        with metrics.get_instrumentation(sink).measure('create', 'db'):
+            pass
+        sink.record.assert_called_once()
+
+    def test_base_adapter_publish_metrics(self):
+        adapter = BaseAdapter(engine='unit-test', metrics='memory', sns_transport='memory')
+        adapter.publish('create', {'key': 'value'})
+        adapter.publish_batch('batch_create', [{'key': 'value'}, {'key': 'other'}])
+        stats = {stats['operation']: stats for stats in metrics.get_sink('memory').get_stats()}
+        self.assertEqual(stats['create']['phase'], 'publish')
+        self.assertEqual(stats['create']['count'], 1)
+        self.assertEqual(stats['batch_create']['items'], 2)
@@ -1,5 +1,6 @@
 import unittest
 import warnings
+from unittest import mock
 
 from syngenta_digital_dta.common import publisher
 
@@ -20,3 +21,52 @@ class PublisherTest(unittest.TestCase):
             region='us-east-2',
             operation='create'
         )
+
+    def test_get_client_cached(self):
+        first = publisher.get_client(region='us-east-2', endpoint='http://localhost:4000')
+        second = publisher.get_client(region='us-east-2', endpoint='http://localhost:4000')
+        other = publisher.get_client(region='us-east-2', endpoint='http://localhost:4000', pool_size=50)
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.assertEqual(other.meta.config.max_pool_connections, 50)
+
+    def test_publish_reuses_client(self):
+        with mock.patch.object(publisher, '_create_client') as mock_create_client:
+            for _ in range(3):
+                publisher.publish(arn=self.mock_sns_arn, data={'key': 'value'}, region='us-west-1', pool_size=3)
+            mock_create_client.assert_called_once()
+            self.assertEqual(mock_create_client.return_value.publish.call_count, 3)
+
+    def test_publish_batch_coalesces_entries(self):
+        entries = [{'data': {'index': index}} for index in range(25)]
+        with mock.patch.object(publisher, '_create_client') as mock_create_client:
+            mock_create_client.return_value.publish_batch.return_value = {'Successful': [], 'Failed': []}
+            publisher.publish_batch(arn=self.mock_sns_arn, entries=entries, region='us-west-2', pool_size=4)
+            calls = mock_create_client.return_value.publish_batch.call_args_list
+        self.assertEqual([len(call.kwargs['PublishBatchRequestEntries']) for call in calls], [10, 10, 5])
+        ids = [entry['Id'] for call in calls for entry in call.kwargs['PublishBatchRequestEntries']]
+        self.assertEqual(len(set(ids)), 25)
+
+    def test_publish_batch_byte_limit(self):
+        entries = [{'data': {'payload': 'x' * 100000}} for _ in range(5)]
+        with mock.patch.object(publisher, '_create_client') as mock_create_client:
+            publisher.publish_batch(arn=self.mock_sns_arn, entries=entries, region='us-west-2', pool_size=5)
+            calls = mock_create_client.return_value.publish_batch.call_args_list
+        self.assertEqual([len(call.kwargs['PublishBatchRequestEntries']) for call in calls], [2, 2, 1])
+
+    def test_publish_batch_fifo(self):
+        entries = [
+            {'data': {'index': 0}, 'fifo_duplication_id': 'dedup-0'},
+            {'data': {'index': 1}, 'fifo_group_id': 'other', 'fifo_duplication_id': 'dedup-1'},
+            {'data': None}
+        ]
+        with mock.patch.object(publisher, '_create_client') as mock_create_client:
+            publisher.publish_batch(
+                arn=self.mock_sns_arn, entries=entries, fifo_group_id='group', region='us-west-2', pool_size=6
+            )
+            batch = mock_create_client.return_value.publish_batch.call_args.kwargs['PublishBatchRequestEntries']
+        self.assertEqual(len(batch), 2)
+        self.assertEqual(batch[0]['MessageGroupId'], 'group')
+        self.assertEqual(batch[0]['MessageDeduplicationId'], 'dedup-0')
+        self.assertEqual(batch[1]['MessageGroupId'], 'other')
+        self.assertEqual(batch[1]['MessageDeduplicationId'], 'dedup-1')
@@ -0,0 +1,91 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+from syngenta_digital_dta.common import registry
+
+
+class RegistryTest(unittest.TestCase):
+
+    def setUp(self, *args, **keywargs):
+        self.maxDiff = None
+        registry.close_all()
+
+    def tearDown(self):
+        registry.close_all()
+
+    def test_get_or_create_shared(self):
+        first = registry.get_or_create('unit-test', {'endpoint': 'a'}, object)
+        second = registry.get_or_create('unit-test', {'endpoint': 'a'}, object)
+        other = registry.get_or_create('unit-test', {'endpoint': 'b'}, object)
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+
+    def test_get_or_create_threads(self):
+        created = []
+
+        def factory():
+            time.sleep(0.01)
+            created.append(object())
+            return created[-1]
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(registry.get_or_create('unit-test', {}, factory)))
+            for _ in range(10)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(created), 1)
+        self.assertTrue(all(result is created[0] for result in results))
+
+    def test_get_or_create_does_not_block_other_keys(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_factory():
+            started.set()
+            release.wait(5)
+            return object()
+
+        thread = threading.Thread(target=lambda: registry.get_or_create('unit-test', {'endpoint': 'slow'}, slow_factory))
+        thread.start()
+        started.wait(5)
+        fast = registry.get_or_create('unit-test', {'endpoint': 'fast'}, object)
+        self.assertFalse(release.is_set())
+        release.set()
+        thread.join()
+        self.assertIsInstance(fast, object)
+        self.assertEqual(len(registry.get_stats()), 2)
+
+    def test_get_or_create_nested(self):
+        inner = registry.get_or_create(
+            'unit-test', {'endpoint': 'outer'}, lambda: registry.get_or_create('unit-test', {'endpoint': 'inner'}, object)
+        )
+        self.assertIs(inner, registry.get_or_create('unit-test', {'endpoint': 'inner'}, object))
+
+    def test_get_or_create_factory_error(self):
+        def failing_factory():
+            raise ValueError('unreachable')
+
+        with self.assertRaises(ValueError):
+            registry.get_or_create('unit-test', {}, failing_factory)
+        self.assertIsInstance(registry.get_or_create('unit-test', {}, object), object)
+
+    def test_get_stats(self):
+        registry.get_or_create('unit-test', {'endpoint': 'a', 'password': 'secret'}, object)
+        registry.get_or_create('unit-test', {'endpoint': 'a', 'password': 'secret'}, object)
+        stats = registry.get_stats()
+        self.assertEqual(len(stats), 1)
+        self.assertEqual(stats[0]['hits'], 1)
+        self.assertDictEqual(stats[0]['config'], {'endpoint': 'a', 'password': '***'})
+
+    def test_close_all(self):
+        client = mock.MagicMock()
+        registry.get_or_create('unit-test', {}, lambda: client)
+        registry.close_all()
+        client.close.assert_called_once_with()
+        self.assertListEqual(registry.get_stats(), [])
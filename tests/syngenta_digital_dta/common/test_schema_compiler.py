@@ -0,0 +1,70 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from syngenta_digital_dta.common import schema_compiler
+from syngenta_digital_dta.common import schema_loader
+
+
+class SchemaCompilerTest(unittest.TestCase):
+
+    def setUp(self, *args, **keywargs):
+        self.maxDiff = None
+        self.temp_dir = tempfile.mkdtemp()
+        self.schema_file = os.path.join(self.temp_dir, 'openapi.yml')
+        shutil.copy('tests/openapi.yml', self.schema_file)
+        schema_loader.invalidate()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_compile_schemas(self):
+        output = schema_compiler.compile_schemas(self.schema_file)
+        self.assertEqual(output, schema_loader.artifact_path(self.schema_file))
+        before = schema_loader.get_stats()['artifacts']
+        schema = schema_loader.load_schema(self.schema_file, 'v1-test-request')
+        self.assertEqual(schema_loader.get_stats()['artifacts'], before + 1)
+        self.assertEqual(schema['allOf'][0]['properties']['test_id']['type'], 'string')
+
+    def test_compile_schemas_without_source(self):
+        schema_compiler.compile_schemas(self.schema_file, schema_keys=['test-dynamo-model'])
+        os.remove(self.schema_file)
+        schema = schema_loader.load_schema(self.schema_file, 'test-dynamo-model')
+        self.assertIn('array_objects', schema['properties'])
+
+    def test_compile_schemas_stale_artifact(self):
+        schema_compiler.compile_schemas(self.schema_file)
+        with open(self.schema_file, 'a', encoding='UTF-8') as openapi:
+            openapi.write('        test-added-model:\n            type: object\n')
+        before = schema_loader.get_stats()['artifacts']
+        schema = schema_loader.load_schema(self.schema_file, 'test-added-model')
+        self.assertEqual(schema['type'], 'object')
+        self.assertEqual(schema_loader.get_stats()['artifacts'], before)
+
+    def test_compile_schemas_missing_key_falls_back_to_source(self):
+        schema_compiler.compile_schemas(self.schema_file, schema_keys=['test-dynamo-model'])
+        schema = schema_loader.load_schema(self.schema_file, 'test-mongo-model')
+        self.assertIn('test_id', schema['properties'])
+
+    def test_compile_schemas_recursive_ref(self):
+        with open(self.schema_file, 'a', encoding='UTF-8') as openapi:
+            openapi.write(
+                '        test-recursive-model:\n'
+                '            type: object\n'
+                '            properties:\n'
+                '                children:\n'
+                '                    type: array\n'
+                '                    items:\n'
+                "                        $ref: '#/components/schemas/test-recursive-model'\n"
+            )
+        with self.assertRaises(schema_compiler.SchemaCompileException) as context:
+            schema_compiler.compile_schemas(self.schema_file)
+        self.assertIn('test-recursive-model/properties/children/items', str(context.exception))
+        self.assertFalse(os.path.exists(schema_loader.artifact_path(self.schema_file)))
+        schema_compiler.compile_schemas(self.schema_file, schema_keys=['test-dynamo-model'])
+        self.assertTrue(os.path.exists(schema_loader.artifact_path(self.schema_file)))
+
+    def test_main(self):
+        schema_compiler.main([self.schema_file, '--schema', 'test-dynamo-model'])
+        self.assertTrue(os.path.exists(schema_loader.artifact_path(self.schema_file)))
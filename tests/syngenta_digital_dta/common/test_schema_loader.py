@@ -0,0 +1,55 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from syngenta_digital_dta.common import schema_loader
+
+
+class SchemaLoaderTest(unittest.TestCase):
+
+    def setUp(self, *args, **keywargs):
+        self.maxDiff = None
+        self.temp_dir = tempfile.mkdtemp()
+        self.schema_file = os.path.join(self.temp_dir, 'openapi.yml')
+        shutil.copy('tests/openapi.yml', self.schema_file)
+        schema_loader.invalidate()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_load_schema(self):
+        schema = schema_loader.load_schema(self.schema_file, 'test-dynamo-model')
+        self.assertEqual(schema['type'], 'object')
+        self.assertIn('array_objects', schema['properties'])
+
+    def test_load_schema_resolves_refs(self):
+        schema = schema_loader.load_schema(self.schema_file, 'v1-test-request')
+        self.assertEqual(schema['allOf'][0]['properties']['test_id']['type'], 'string')
+
+    def test_load_schema_cached(self):
+        before = schema_loader.get_stats()
+        first = schema_loader.load_schema(self.schema_file, 'test-dynamo-model')
+        second = schema_loader.load_schema(self.schema_file, 'test-mongo-model')
+        third = schema_loader.load_schema(self.schema_file, 'test-dynamo-model')
+        after = schema_loader.get_stats()
+        self.assertIs(first, third)
+        self.assertIsNot(first, second)
+        self.assertEqual(after['misses'] - before['misses'], 1)
+        self.assertEqual(after['hits'] - before['hits'], 2)
+
+    def test_load_schema_reloads_changed_file(self):
+        first = schema_loader.load_schema(self.schema_file, 'test-dynamo-model')
+        with open(self.schema_file, 'a', encoding='UTF-8') as openapi:
+            openapi.write('        test-added-model:\n            type: object\n')
+        added = schema_loader.load_schema(self.schema_file, 'test-added-model')
+        second = schema_loader.load_schema(self.schema_file, 'test-dynamo-model')
+        self.assertEqual(added['type'], 'object')
+        self.assertIsNot(first, second)
+
+    def test_invalidate(self):
+        first = schema_loader.load_schema(self.schema_file, 'test-dynamo-model')
+        schema_loader.invalidate(self.schema_file)
+        second = schema_loader.load_schema(self.schema_file, 'test-dynamo-model')
+        self.assertIsNot(first, second)
+        self.assertEqual(schema_loader.get_stats()['files'], 1)
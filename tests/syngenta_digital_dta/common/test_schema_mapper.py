@@ -68,3 +68,89 @@ class SchemaMapperTest(unittest.TestCase):
             'created': None,
             'modified': None}
         )
+
+    def test_map_to_schema_all_of(self):
+        data = {
+            'test_id': 'abc456',
+            'test_query_id': 'def789',
+            'object_key': {
+                'string_key': 'nothing',
+                'ignore_key': True
+            },
+            'array_number': [1, 2, 3],
+            'array_objects': [
+                {
+                    'array_string_key': 'a',
+                    'array_number_key': 1
+                },
+                'not-an-object'
+            ],
+            'created': '2020-10-05',
+            'modified': '2020-10-05'
+        }
+        results = schema_mapper.map_to_schema(data, 'tests/openapi.yml', 'v1-test-request')
+        self.assertDictEqual(results, {
+            'test_id': 'abc456',
+            'test_query_id': 'def789',
+            'object_key': {
+                'string_key': 'nothing'
+            },
+            'array_number': [1, 2, 3],
+            'array_objects': [
+                {
+                    'array_string_key': 'a',
+                    'array_number_key': 1
+                },
+                {}
+            ],
+            'created': '2020-10-05',
+            'modified': '2020-10-05'
+        })
+
+    def test_compile_schema_cached(self):
+        plan = schema_mapper.compile_schema('tests/openapi.yml', 'test-dynamo-model')
+        self.assertIs(plan, schema_mapper.compile_schema('tests/openapi.yml', 'test-dynamo-model'))
+
+    def test_compile_schema_project(self):
+        plan = schema_mapper.compile_schema('tests/openapi.yml', 'test-dynamo-model')
+        records = [{'test_id': str(index), 'object_key': None, 'array_objects': None} for index in range(3)]
+        results = [plan.project(record) for record in records]
+        self.assertEqual([result['test_id'] for result in results], ['0', '1', '2'])
+        self.assertDictEqual(results[0]['object_key'], {})
+        self.assertListEqual(results[0]['array_objects'], [])
+
+    def test_map_partial(self):
+        data = {
+            'modified': '2020-10-06',
+            'object_key': {'string_key': 'something', 'ignore_key': True},
+            'array_objects': [{'array_string_key': 'b', 'ignore_key': True}],
+            'ignore_key': True
+        }
+        results = schema_mapper.map_partial(data, 'tests/openapi.yml', 'test-dynamo-model')
+        self.assertDictEqual(results, {
+            'modified': '2020-10-06',
+            'object_key': {'string_key': 'something'},
+            'array_objects': [{'array_string_key': 'b', 'array_number_key': None}]
+        })
+
+    def test_map_many(self):
+        records = ({'test_id': str(index), 'ignore_key': True} for index in range(5))
+        results = schema_mapper.map_many(records, 'tests/openapi.yml', 'test-dynamo-model')
+        first = next(results)
+        self.assertEqual(first['test_id'], '0')
+        self.assertNotIn('ignore_key', first)
+        self.assertEqual([result['test_id'] for result in results], ['1', '2', '3', '4'])
+
+    def test_map_many_processes(self):
+        records = [{'test_id': str(index), 'array_objects': [{'array_string_key': 'a'}]} for index in range(25)]
+        expected = [schema_mapper.map_to_schema(record, 'tests/openapi.yml', 'test-dynamo-model') for record in records]
+        results = schema_mapper.map_many(records, 'tests/openapi.yml', 'test-dynamo-model', processes=2, chunk_size=4)
+        self.assertListEqual(list(results), expected)
+
+    def test_map_batches(self):
+        records = ({'test_id': str(index), 'ignore_key': True} for index in range(5))
+        batches = schema_mapper.map_batches(records, 'tests/openapi.yml', 'test-dynamo-model', 2)
+        first = next(batches)
+        self.assertListEqual([result['test_id'] for result in first], ['0', '1'])
+        self.assertNotIn('ignore_key', first[0])
+        self.assertListEqual([len(batch) for batch in batches], [2, 1])
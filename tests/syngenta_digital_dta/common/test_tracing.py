@@ -0,0 +1,103 @@
+import contextvars
+import importlib.util
+import unittest
+
+from syngenta_digital_dta.common import registry
+from syngenta_digital_dta.common import tracing
+from syngenta_digital_dta.common.base_adapter import BaseAdapter
+
+OPENTELEMETRY_INSTALLED = importlib.util.find_spec('opentelemetry.sdk') is not None
+
+
+class UnitTestAdapter(BaseAdapter):
+
+    @tracing.traced('create')
+    def create(self, **kwargs):
+        with self.metrics.measure('create', 'db', items=len(kwargs['data'])):
+            if kwargs.get('fail'):
+                raise ValueError('unit-test')
+        super().publish('create', kwargs['data'])
+        return kwargs['data']
+
+
+class TracingTest(unittest.TestCase):
+
+    def setUp(self, *args, **keywargs):
+        self.maxDiff = None
+        registry.close_all()
+
+    def tearDown(self):
+        registry.close_all()
+
+    def test_no_tracer(self):
+        self.assertIsNone(tracing.get_tracer())
+        adapter = UnitTestAdapter(engine='unit-test')
+        self.assertEqual(adapter.create(data=[1]), [1])
+
+    def test_unknown_tracer(self):
+        with self.assertRaises(tracing.TracingException):
+            tracing.get_tracer('unknown')
+
+    def test_memory_tracer_spans(self):
+        adapter = UnitTestAdapter(engine='unit-test', table='unit-table', tracing='memory', sns_transport='memory')
+        adapter.create(data=[1, 2])
+        spans = {span['name']: span for span in tracing.get_tracer('memory').get_spans()}
+        self.assertListEqual(
+            sorted(spans),
+            ['unit-test.create', 'unit-test.create.db', 'unit-test.create.publish']
+        )
+        call = spans['unit-test.create']
+        self.assertIsNone(call['parent_id'])
+        self.assertEqual(spans['unit-test.create.db']['parent_id'], call['id'])
+        self.assertEqual(spans['unit-test.create.publish']['parent_id'], call['id'])
+        self.assertDictEqual(
+            spans['unit-test.create.db']['attributes'],
+            {
+                'db.system': 'unit-test',
+                'db.operation': 'create',
+                'dta.phase': 'db',
+                'dta.resource': 'unit-table',
+                'dta.items': 2
+            }
+        )
+        self.assertLessEqual(call['start'], call['end'])
+
+    def test_memory_tracer_error(self):
+        adapter = UnitTestAdapter(engine='unit-test', tracing='memory')
+        with self.assertRaises(ValueError):
+            adapter.create(data=[1], fail=True)
+        spans = tracing.get_tracer('memory').get_spans()
+        self.assertEqual(len(spans), 2)
+        self.assertTrue(all('unit-test' in span['error'] for span in spans))
+
+    def test_memory_span_ended_in_other_context(self):
+        tracer = tracing.get_tracer('memory')
+        span = contextvars.copy_context().run(tracer.start, 'unit-test.create', {})
+        contextvars.Context().run(span.end, {'dta.items': 1})
+        spans = tracer.get_spans()
+        self.assertEqual(len(spans), 1)
+        self.assertEqual(spans[0]['attributes'], {'dta.items': 1})
+
+    @unittest.skipUnless(OPENTELEMETRY_INSTALLED, 'opentelemetry-sdk is not installed')
+    def test_opentelemetry_tracer(self):
+        from opentelemetry.sdk.trace import TracerProvider  # pylint: disable=C
+        from opentelemetry.sdk.trace.export import SimpleSpanProcessor  # pylint: disable=C
+        from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter  # pylint: disable=C
+        exporter = InMemorySpanExporter()
+        provider = TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(exporter))
+        tracer = tracing.OpenTelemetryTracer(tracer=provider.get_tracer('unit-test'))
+        adapter = UnitTestAdapter(engine='unit-test', collection='unit-collection', tracing=tracer)
+        adapter.create(data=[1])
+        with self.assertRaises(ValueError):
+            adapter.create(data=[1], fail=True)
+        spans = exporter.get_finished_spans()
+        by_name = {}
+        for span in spans:
+            by_name.setdefault(span.name, []).append(span)
+        call, failed_call = by_name['unit-test.create']
+        db_span = by_name['unit-test.create.db'][0]
+        self.assertEqual(db_span.parent.span_id, call.context.span_id)
+        self.assertEqual(db_span.attributes['dta.resource'], 'unit-collection')
+        self.assertEqual(db_span.attributes['dta.items'], 1)
+        self.assertFalse(failed_call.status.is_ok)
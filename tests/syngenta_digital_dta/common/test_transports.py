@@ -0,0 +1,93 @@
+import json
+import os
+import tempfile
+import unittest
+import warnings
+from unittest import mock
+
+from syngenta_digital_dta.common import async_publisher
+from syngenta_digital_dta.common import publisher
+from syngenta_digital_dta.common import registry
+from syngenta_digital_dta.common import transports
+from syngenta_digital_dta.common.base_adapter import BaseAdapter
+
+
+class TransportsTest(unittest.TestCase):
+
+    def setUp(self, *args, **keywargs):
+        warnings.simplefilter('ignore', ResourceWarning)
+        self.maxDiff = None
+        registry.close_all()
+
+    def tearDown(self):
+        registry.close_all()
+
+    def test_get_transport_default(self):
+        self.assertIs(transports.get_transport(), publisher)
+        self.assertIs(transports.get_transport('sns'), publisher)
+
+    def test_get_transport_custom(self):
+        custom = mock.MagicMock()
+        self.assertIs(transports.get_transport(custom), custom)
+
+    def test_get_transport_shared(self):
+        self.assertIs(transports.get_transport('memory'), transports.get_transport('memory'))
+        self.assertIsNot(transports.get_transport('memory'), transports.get_transport('memory', capacity=5))
+
+    def test_get_transport_unknown(self):
+        with self.assertRaises(transports.TransportException):
+            transports.get_transport('unknown')
+
+    def test_memory_transport_ring_buffer(self):
+        transport = transports.MemoryTransport(capacity=3)
+        for index in range(5):
+            transport.publish(data={'index': index}, attributes={'operation': 'create'})
+        transport.publish(data=None)
+        transport.publish_batch(entries=[{'data': {'index': 5}, 'fifo_duplication_id': 'dedup-5'}], fifo_group_id='group')
+        messages = transport.get_messages()
+        self.assertEqual([message['data']['index'] for message in messages], [3, 4, 5])
+        self.assertEqual(messages[-1]['fifo_group_id'], 'group')
+        self.assertEqual(messages[-1]['fifo_duplication_id'], 'dedup-5')
+        transport.clear()
+        self.assertListEqual(transport.get_messages(), [])
+
+    def test_file_transport(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'events.jsonl')
+            transport = transports.FileTransport(path=path)
+            transport.publish(data={'index': 0}, attributes={'operation': 'create'})
+            transport.publish_batch(entries=[{'data': {'index': 1}}, {'data': {'index': 2}}])
+            transport.close()
+            with open(path, encoding='utf-8') as events:
+                records = [json.loads(line) for line in events]
+        self.assertEqual([record['data']['index'] for record in records], [0, 1, 2])
+        self.assertDictEqual(records[0]['attributes'], {'operation': 'create'})
+
+    def test_sqs_transport(self):
+        transport = transports.SQSTransport(queue_url='http://localhost:4000/queue/unit-test', region='us-east-2')
+        with mock.patch.object(transports, '_create_sqs_client') as mock_create_client:
+            transport.publish(data={'key': 'value'}, fifo_group_id='group', fifo_duplication_id='dedup')
+            transport.publish_batch(entries=[{'data': {'index': index}} for index in range(12)])
+            client = mock_create_client.return_value
+        mock_create_client.assert_called_once()
+        self.assertDictEqual(json.loads(client.send_message.call_args.kwargs['MessageBody']), {'key': 'value'})
+        self.assertEqual(client.send_message.call_args.kwargs['MessageGroupId'], 'group')
+        batches = [call.kwargs['Entries'] for call in client.send_message_batch.call_args_list]
+        self.assertEqual([len(batch) for batch in batches], [10, 2])
+        self.assertDictEqual(json.loads(batches[0][0]['MessageBody']), {'index': 0})
+        self.assertNotIn('Message', batches[0][0])
+
+    def test_adapter_memory_transport(self):
+        adapter = BaseAdapter(sns_transport='memory', model_schema='unit-test')
+        adapter.publish('create', {'key': 'value'})
+        adapter.publish_batch('batch_create', [{'index': 0}, {'index': 1}])
+        messages = transports.get_transport('memory').get_messages()
+        self.assertEqual(len(messages), 3)
+        self.assertEqual(messages[0]['attributes']['operation']['StringValue'], 'create')
+
+    def test_adapter_async_transport(self):
+        adapter = BaseAdapter(sns_transport='memory', sns_transport_options={'capacity': 50}, sns_async=True)
+        self.assertIsInstance(adapter.publisher, async_publisher.AsyncPublisher)
+        adapter.publish('create', {'key': 'value'})
+        adapter.publisher.flush(5)
+        self.assertEqual(len(transports.get_transport('memory', capacity=50).get_messages()), 1)
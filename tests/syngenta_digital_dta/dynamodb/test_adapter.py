@@ -1,9 +1,12 @@
 import unittest
 import warnings
+from unittest import mock
 
 import boto3
 
 import syngenta_digital_dta
+from syngenta_digital_dta.common import metrics
+from syngenta_digital_dta.common import tracing
 from tests.syngenta_digital_dta.dynamodb.mock_table import MockTable
 from syngenta_digital_dta.dynamodb.adapter import BatchItemException
 
@@ -136,6 +139,99 @@ class DynamoDBAdapterTest(unittest.TestCase):
         data = self.adapter.scan()
         self.assertTrue(len(data) == 101)  # Table comes initialized with one test record
 
+    def test_adapter_batch_insert_publishes_batch(self):
+        item_list = [{'test_id': str(x), 'test_query_id': str(x)} for x in range(3)]
+        with mock.patch.object(self.adapter, 'publisher') as mock_publisher:
+            self.adapter.batch_insert(data=item_list)
+            self.adapter.batch_delete(data=item_list)
+        mock_publisher.publish_batch.assert_not_called()
+        insert_call, delete_call = mock_publisher.publish.call_args_list
+        self.assertEqual([item['test_id'] for item in insert_call.kwargs['data']], ['0', '1', '2'])
+        self.assertEqual(delete_call.kwargs['attributes']['operation']['StringValue'], 'batch_delete')
+
+    def test_adapter_batch_insert_publishes_items(self):
+        item_list = [{'test_id': str(x), 'test_query_id': str(x)} for x in range(3)]
+        self.adapter.sns_per_item = True
+        with mock.patch.object(self.adapter, 'publisher') as mock_publisher:
+            self.adapter.batch_insert(data=item_list)
+            self.adapter.batch_delete(data=item_list)
+        insert_call, delete_call = mock_publisher.publish_batch.call_args_list
+        self.assertEqual([entry['data']['test_id'] for entry in insert_call.kwargs['entries']], ['0', '1', '2'])
+        self.assertIsNone(insert_call.kwargs['entries'][0]['data']['modified'])
+        self.assertEqual(insert_call.kwargs['attributes']['operation']['StringValue'], 'batch_create')
+        self.assertEqual(delete_call.kwargs['attributes']['operation']['StringValue'], 'batch_delete')
+
+    def test_adapter_metrics(self):
+        adapter = syngenta_digital_dta.adapter(
+            engine='dynamodb',
+            table='unittestsort',
+            endpoint='http://localhost:4000',
+            model_schema='test-dynamo-model',
+            model_schema_file='tests/openapi.yml',
+            model_identifier='test_id',
+            model_version_key='modified',
+            metrics=metrics.MemorySink()
+        )
+        adapter.insert(data={'test_id': 'metrics', 'test_query_id': 'metrics', 'modified': '2020-10-05'})
+        adapter.scan()
+        stats = {(stats['operation'], stats['phase']): stats for stats in adapter.metrics.sink.get_stats()}
+        self.assertEqual(stats[('insert', 'map')]['count'], 1)
+        self.assertEqual(stats[('insert', 'db')]['items'], 1)
+        self.assertGreater(stats[('insert', 'db')]['bytes'], 0)
+        self.assertEqual(stats[('create', 'publish')]['count'], 1)
+        self.assertNotIn('bytes', stats[('create', 'publish')])
+        self.assertGreaterEqual(stats[('scan', 'db')]['items'], 1)
+        self.assertGreater(stats[('scan', 'db')]['bytes'], stats[('insert', 'db')]['bytes'])
+        self.assertEqual(stats[('scan', 'db')]['engine'], 'dynamodb')
+
+    def test_adapter_batch_insert_maps_and_deduplicates(self):
+        item_list = [
+            {'test_id': '1', 'test_query_id': '1', 'created': 'first', 'not_in_schema': True},
+            {'test_id': '2', 'test_query_id': '2'},
+            {'test_id': '1', 'test_query_id': '1', 'created': 'last'}
+        ]
+        result = self.adapter.batch_insert(data=item_list, batch_size=1, workers=2)
+        self.assertEqual(result['items'], 2)
+        self.assertEqual(result['duplicates'], 1)
+        self.assertEqual(result['requests'], 2)
+        self.assertListEqual(result['unprocessed'], [])
+        self.assertGreater(result['throughput'], 0)
+        item = self.adapter.get(query={'Key': {'test_id': '1', 'test_query_id': '1'}})
+        self.assertEqual(item['created'], 'last')
+        self.assertNotIn('not_in_schema', item)
+
+    def test_adapter_batch_insert_unprocessed_items(self):
+        item = {'test_id': '1', 'test_query_id': '1'}
+        responses = [
+            {'UnprocessedItems': {'unittestsort': [{'PutRequest': {'Item': {'test_id': '1', 'test_query_id': '1'}}}]}},
+            {'UnprocessedItems': {'unittestsort': [{'PutRequest': {'Item': {'test_id': '1', 'test_query_id': '1'}}}]}}
+        ]
+        with mock.patch.object(self.adapter.table.meta.client, 'batch_write_item', side_effect=responses), \
+                mock.patch('syngenta_digital_dta.dynamodb.adapter.time.sleep') as sleep, \
+                mock.patch.object(self.adapter, 'publisher') as mock_publisher:
+            result = self.adapter.batch_insert(
+                data=[item, {'test_id': '2', 'test_query_id': '2'}],
+                max_retries=1,
+                allow_unprocessed=True
+            )
+        self.assertEqual(result['items'], 1)
+        self.assertEqual(result['requests'], 2)
+        self.assertListEqual(result['unprocessed'], [item])
+        self.assertEqual(sleep.call_count, 1)
+        published = mock_publisher.publish.call_args.kwargs['data']
+        self.assertEqual([item['test_id'] for item in published], ['2'])
+
+    def test_adapter_batch_insert_unprocessed_items_raise(self):
+        item = {'test_id': '1', 'test_query_id': '1'}
+        response = {'UnprocessedItems': {'unittestsort': [{'PutRequest': {'Item': item}}]}}
+        with mock.patch.object(self.adapter.client, 'batch_write_item', side_effect=[response, response]), \
+                mock.patch('syngenta_digital_dta.dynamodb.adapter.time.sleep'), \
+                mock.patch.object(self.adapter, 'publisher') as mock_publisher:
+            with self.assertRaisesRegex(BatchItemException, '1 items still unprocessed after 1 retries'):
+                self.adapter.batch_insert(data=[item, {'test_id': '2', 'test_query_id': '2'}], max_retries=1)
+        published = mock_publisher.publish.call_args.kwargs['data']
+        self.assertEqual([item['test_id'] for item in published], ['2'])
+
     def test_adapter_batch_insert_fail(self):
         item_tuple = {'data': (1, 2, 3)}
         self.assertRaises(BatchItemException, self.adapter.batch_insert, **item_tuple)
@@ -234,6 +330,42 @@ class DynamoDBAdapterTest(unittest.TestCase):
         )
         self.assertDictEqual(updated_data, new_data)
 
+    def test_adapter_update_partial(self):
+        new_data = {
+            'test_id': 'abc456-update-partial',
+            'test_query_id': 'def789',
+            'object_key': {
+                'string_key': 'nothing'
+            },
+            'array_number': [1, 2, 3],
+            'array_objects': [
+                {
+                    'array_string_key': 'a',
+                    'array_number_key': 1
+                }
+            ],
+            'created': '2020-10-05',
+            'modified': '2020-10-05'
+        }
+        self.adapter.create(data=new_data)
+        query = {
+            'Key': {
+                'test_id': 'abc456-update-partial',
+                'test_query_id': 'def789'
+            }
+        }
+        updated_data = self.adapter.update(
+            data={'object_key': {'string_key': 'something'}, 'array_number': [4], 'modified': '2020-10-06'},
+            operation='get',
+            partial=True,
+            query=query
+        )
+        new_data['object_key']['string_key'] = 'something'
+        new_data['array_number'] = [1, 2, 3, 4]
+        new_data['modified'] = '2020-10-06'
+        self.assertDictEqual(updated_data, new_data)
+        self.assertDictEqual(self.adapter.get(query=query), new_data)
+
     def test_adapter_delete(self):
         new_data = {
             'test_id': 'abc456-delete',
@@ -271,3 +403,212 @@ class DynamoDBAdapterTest(unittest.TestCase):
             }
         )
         self.assertDictEqual(deleted_data, {})
+
+    def test_adapter_scan_iter(self):
+        items = [dict(self.mock_table.mock_data, test_id=f'scan-{index}') for index in range(5)]
+        self.adapter.batch_insert(data=items)
+        iterator = self.adapter.scan_iter(page_size=2)
+        scanned = [item['test_id'] for item in iterator]
+        self.assertEqual(len(scanned), 6)
+        self.assertEqual(len(set(scanned)), 6)
+        self.assertIsNone(iterator.cursor)
+
+    def test_adapter_scan_iter_traced(self):
+        adapter = syngenta_digital_dta.adapter(
+            engine='dynamodb',
+            table='unittestsort',
+            endpoint='http://localhost:4000',
+            model_schema='test-dynamo-model',
+            model_schema_file='tests/openapi.yml',
+            model_identifier='test_id',
+            model_version_key='modified',
+            tracing='memory'
+        )
+        tracer = tracing.get_tracer('memory')
+        tracer.clear()
+        self.assertEqual(len(list(adapter.scan_iter(page_size=1))), 1)
+        spans = tracer.get_spans()
+        calls = [span for span in spans if span['name'] == 'dynamodb.scan_iter']
+        pages = [span for span in spans if span['name'] == 'dynamodb.scan_iter.db']
+        self.assertEqual(len(calls), len(pages))
+        self.assertTrue(calls)
+        self.assertSetEqual({span['parent_id'] for span in pages}, {span['id'] for span in calls})
+
+    def test_adapter_scan_iter_resume(self):
+        items = [dict(self.mock_table.mock_data, test_id=f'scan-{index}') for index in range(5)]
+        self.adapter.batch_insert(data=items)
+        first = self.adapter.scan_iter(page_size=4, max_items=3)
+        consumed = [item['test_id'] for item in first]
+        self.assertEqual(len(consumed), 3)
+        rest = [item['test_id'] for item in self.adapter.scan_iter(page_size=4, cursor=first.cursor)]
+        self.assertEqual(sorted(consumed + rest), sorted(['abc123'] + [item['test_id'] for item in items]))
+
+    def test_adapter_query_iter_index(self):
+        items = [dict(self.mock_table.mock_data, test_id=f'query-{index}') for index in range(3)]
+        self.adapter.batch_insert(data=items)
+        query = {
+            'IndexName': 'test_query_id',
+            'KeyConditionExpression': 'test_query_id = :test_query_id',
+            'ExpressionAttributeValues': {':test_query_id': 'def345'}
+        }
+        first = self.adapter.query_iter(query=query, page_size=3, max_items=2)
+        consumed = [item['test_id'] for item in first]
+        rest = [item['test_id'] for item in self.adapter.query_iter(query=query, cursor=first.cursor)]
+        self.assertEqual(sorted(consumed + rest), ['abc123', 'query-0', 'query-1', 'query-2'])
+
+    def test_adapter_parallel_scan(self):
+        items = [dict(self.mock_table.mock_data, test_id=f'parallel-{index}') for index in range(9)]
+        self.adapter.batch_insert(data=items)
+        scanned = [item['test_id'] for item in self.adapter.parallel_scan(segments=3, page_size=2)]
+        self.assertEqual(sorted(scanned), sorted(['abc123'] + [item['test_id'] for item in items]))
+
+    def test_adapter_parallel_scan_callback(self):
+        items = [dict(self.mock_table.mock_data, test_id=f'parallel-{index}') for index in range(9)]
+        self.adapter.batch_insert(data=items)
+        segments = {}
+        scan = self.adapter.parallel_scan(
+            segments=3,
+            callback=lambda page, segment: segments.setdefault(segment, []).extend(page)
+        )
+        self.assertTrue(scan.done)
+        self.assertEqual(scan.count, 10)
+        self.assertEqual(sum(len(page) for page in segments.values()), 10)
+
+    def test_adapter_parallel_scan_uses_configured_client(self):
+        clients = set()
+        scan = self.adapter.parallel_scan(
+            segments=3,
+            callback=lambda page, segment: clients.add(self.adapter.table.meta.client)
+        )
+        with mock.patch('boto3.session.Session', side_effect=AssertionError('unconfigured session')):
+            scanned = [item['test_id'] for item in self.adapter.parallel_scan(segments=3)]
+        self.assertEqual(scan.count, 1)
+        self.assertEqual(scanned, ['abc123'])
+        self.assertEqual(clients, {self.adapter.client})
+
+    def test_adapter_batch_get(self):
+        items = [dict(self.mock_table.mock_data, test_id=f'get-{index}') for index in range(150)]
+        self.adapter.batch_insert(data=items)
+        keys = [{'test_id': f'get-{index}', 'test_query_id': 'def345'} for index in (149, 3, 77, 3)]
+        keys.append({'test_id': 'missing', 'test_query_id': 'def345'})
+        results = self.adapter.batch_get(keys=keys, batch_size=2, workers=2)
+        self.assertListEqual([result.get('test_id') for result in results], ['get-149', 'get-3', 'get-77', 'get-3', None])
+        self.assertDictEqual(results[1], items[3])
+
+    def test_adapter_batch_get_projection(self):
+        results = self.adapter.batch_get(
+            keys=[{'test_id': 'abc123', 'test_query_id': 'def345', 'created': 'ignored'}],
+            query={'ProjectionExpression': '#modified', 'ExpressionAttributeNames': {'#modified': 'modified'}}
+        )
+        self.assertListEqual(results, [{'test_id': 'abc123', 'test_query_id': 'def345', 'modified': '2020-10-05'}])
+
+    def test_adapter_batch_get_unprocessed_keys(self):
+        key = {'test_id': 'abc123', 'test_query_id': 'def345'}
+        responses = [
+            {'Responses': {'unittestsort': []}, 'UnprocessedKeys': {'unittestsort': {'Keys': [key]}}},
+            {'Responses': {'unittestsort': [self.mock_table.mock_data]}, 'UnprocessedKeys': {}}
+        ]
+        with mock.patch.object(self.adapter.table.meta.client, 'batch_get_item', side_effect=responses) as batch_get_item, \
+                mock.patch('syngenta_digital_dta.dynamodb.adapter.time.sleep') as sleep:
+            results = self.adapter.batch_get(keys=[key])
+        self.assertListEqual(results, [self.mock_table.mock_data])
+        self.assertEqual(batch_get_item.call_count, 2)
+        self.assertEqual(sleep.call_count, 1)
+        self.assertDictEqual(batch_get_item.call_args.kwargs['RequestItems'], {'unittestsort': {'Keys': [key]}})
+
+    def test_adapter_batch_get_unprocessed_keys_exhausted(self):
+        key = {'test_id': 'abc123', 'test_query_id': 'def345'}
+        response = {'Responses': {}, 'UnprocessedKeys': {'unittestsort': {'Keys': [key]}}}
+        with mock.patch.object(self.adapter.table.meta.client, 'batch_get_item', return_value=response), \
+                mock.patch('syngenta_digital_dta.dynamodb.adapter.time.sleep'):
+            with self.assertRaises(BatchItemException):
+                self.adapter.batch_get(keys=[key], max_retries=2)
+
+    def test_adapter_batch_get_missing_key_attribute(self):
+        with self.assertRaisesRegex(BatchItemException, '^batch_get: key is missing attribute'):
+            self.adapter.batch_get(keys=[{'test_id': 'abc123'}])
+
+    def test_adapter_batch_insert_missing_key_attribute(self):
+        item = {'test_id': 'abc123'}
+        with mock.patch('syngenta_digital_dta.dynamodb.adapter.schema_mapper.map_many', return_value=[item]):
+            with self.assertRaisesRegex(BatchItemException, '^batch_insert: key is missing attribute'):
+                self.adapter.batch_insert(data=[item])
+
+    def test_adapter_update_native(self):
+        query = {'Key': {'test_id': 'abc123', 'test_query_id': 'def345'}}
+        with mock.patch.object(self.adapter.table, 'get_item') as get_item, \
+                mock.patch.object(self.adapter, 'publisher') as mock_publisher:
+            updated_data = self.adapter.update(
+                native=True,
+                query=query,
+                data={
+                    'test_id': 'ignored',
+                    'object_key': {'string_key': 'something'},
+                    'array_number': [4],
+                    'modified': '2020-10-06',
+                    'not_in_schema': True
+                },
+                add={'views': 2},
+                expected_version='2020-10-05'
+            )
+        get_item.assert_not_called()
+        expected = dict(
+            self.mock_table.mock_data,
+            object_key={'string_key': 'something'},
+            array_number=[1, 2, 3, 4],
+            modified='2020-10-06',
+            views=2
+        )
+        self.assertDictEqual(updated_data, expected)
+        self.assertDictEqual(self.adapter.get(query=query), expected)
+        self.assertDictEqual(mock_publisher.publish.call_args.kwargs['data'], expected)
+
+    def test_adapter_update_native_version_conflict(self):
+        with self.assertRaises(self.adapter.table.meta.client.exceptions.ConditionalCheckFailedException):
+            self.adapter.update(
+                native=True,
+                query={'Key': {'test_id': 'abc123', 'test_query_id': 'def345'}},
+                data={'created': '2020-10-06'},
+                expected_version='2020-01-01'
+            )
+
+    def test_adapter_update_native_missing_item(self):
+        query = {'Key': {'test_id': 'missing', 'test_query_id': 'def345'}}
+        with self.assertRaises(self.adapter.table.meta.client.exceptions.ConditionalCheckFailedException):
+            self.adapter.update(native=True, query=query, data={'created': 'x'}, expected_version='2020-10-05')
+        self.assertDictEqual(self.adapter.get(query=query), {})
+
+    def test_adapter_update_native_requires_version(self):
+        query = {'Key': {'test_id': 'abc123', 'test_query_id': 'def345'}}
+        with mock.patch.object(self.adapter.table, 'update_item') as update_item:
+            with self.assertRaisesRegex(Exception, 'expected_version'):
+                self.adapter.update(native=True, query=query, data={'created': '2020-10-06'})
+        update_item.assert_not_called()
+        updated_data = self.adapter.update(native=True, query=query, data={'created': '2020-10-06'}, check_version=False)
+        self.assertEqual(updated_data['created'], '2020-10-06')
+
+    def test_adapter_update_native_nested_objects(self):
+        query = {'Key': {'test_id': 'abc123', 'test_query_id': 'def345'}}
+        self.adapter.table.update_item(
+            Key=query['Key'],
+            UpdateExpression='REMOVE object_key'
+        )
+        for object_key in ({'string_key': 'created'}, {}):
+            updated_data = self.adapter.update(
+                native=True,
+                query=query,
+                data={'object_key': object_key},
+                expected_version='2020-10-05'
+            )
+            self.assertDictEqual(updated_data['object_key'], object_key)
+            self.assertDictEqual(self.adapter.get(query=query)['object_key'], object_key)
+
+    def test_adapter_update_native_return_none(self):
+        updated_data = self.adapter.update(
+            native=True,
+            query={'Key': {'test_id': 'abc123', 'test_query_id': 'def345'}},
+            data={'created': '2020-10-06'},
+            expected_version='2020-10-05',
+            return_values='NONE'
+        )
+        self.assertDictEqual(updated_data, {'test_id': 'abc123', 'test_query_id': 'def345', 'created': '2020-10-06'})
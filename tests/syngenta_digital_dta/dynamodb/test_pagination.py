@@ -0,0 +1,137 @@
+import unittest
+from decimal import Decimal
+
+from boto3.dynamodb.types import Binary
+
+from syngenta_digital_dta.dynamodb import pagination
+
+
+class FakeTable:
+
+    def __init__(self, items):
+        self.items = items
+        self.calls = []
+
+    def scan(self, **query):
+        self.calls.append(query)
+        start = 0
+        if 'ExclusiveStartKey' in query:
+            start = [item['id'] for item in self.items].index(query['ExclusiveStartKey']['id']) + 1
+        limit = query.get('Limit', 3)
+        page = self.items[start:start + limit]
+        result = {'Items': page, 'Count': len(page)}
+        if start + limit < len(self.items):
+            result['LastEvaluatedKey'] = {'id': page[-1]['id']}
+        return result
+
+
+class FakeSegmentedTable(FakeTable):
+
+    def __init__(self, items, fail_segment=None):
+        super().__init__(items)
+        self.fail_segment = fail_segment
+
+    def scan(self, **query):
+        if query['Segment'] == self.fail_segment:
+            raise ValueError('unit-test')
+        segment_items = [item for item in self.items if item['id'] % query['TotalSegments'] == query['Segment']]
+        return FakeTable(segment_items).scan(**query)
+
+
+class PaginationTest(unittest.TestCase):
+
+    def setUp(self, *args, **keywargs):
+        self.maxDiff = None
+        self.table = FakeTable([{'id': Decimal(index), 'value': f'value-{index}'} for index in range(10)])
+
+    def create_iterator(self, **kwargs):
+        return pagination.PageIterator(self.table.scan, lambda index_name: ['id'], **kwargs)
+
+    def test_follows_last_evaluated_key(self):
+        iterator = self.create_iterator()
+        self.assertListEqual([item['id'] for item in iterator], list(range(10)))
+        self.assertEqual(iterator.pages, 4)
+        self.assertTrue(iterator.done)
+        self.assertIsNone(iterator.cursor)
+
+    def test_lazy(self):
+        iterator = self.create_iterator(page_size=2)
+        self.assertEqual(self.table.calls, [])
+        next(iterator)
+        self.assertEqual(len(self.table.calls), 1)
+        self.assertEqual(self.table.calls[0]['Limit'], 2)
+
+    def test_max_items_limits_requests(self):
+        iterator = self.create_iterator(page_size=4, max_items=6)
+        self.assertEqual(len(list(iterator)), 6)
+        self.assertListEqual([call['Limit'] for call in self.table.calls], [4, 2])
+        self.assertFalse(iterator.done)
+
+    def test_resume_from_cursor_mid_page(self):
+        first = self.create_iterator(page_size=4)
+        consumed = [next(first)['id'] for _ in range(2)]
+        second = self.create_iterator(page_size=4, cursor=first.cursor)
+        self.assertListEqual(consumed + [item['id'] for item in second], list(range(10)))
+
+    def test_resume_from_cursor_after_max_items(self):
+        first = self.create_iterator(max_items=3)
+        consumed = [item['id'] for item in first]
+        second = self.create_iterator(cursor=first.cursor)
+        self.assertListEqual(consumed + [item['id'] for item in second], list(range(10)))
+
+    def test_cursor_mid_page_missing_key_attribute(self):
+        iterator = pagination.PageIterator(self.table.scan, lambda index_name: ['id', 'sort'], page_size=4)
+        next(iterator)
+        with self.assertRaisesRegex(pagination.CursorException, 'missing key attributes'):
+            iterator.cursor
+
+    def test_cursor_round_trip(self):
+        key = {'id': 'abc', 'sort': Decimal('1.5'), 'blob': Binary(b'\x00\x01')}
+        self.assertDictEqual(pagination.decode_cursor(pagination.encode_cursor(key)), key)
+
+    def test_invalid_cursor(self):
+        with self.assertRaises(pagination.CursorException):
+            pagination.decode_cursor('not a cursor')
+
+    def test_parallel_scan_iterator(self):
+        table = FakeSegmentedTable(self.table.items)
+        scan = pagination.ParallelScan(table.scan, segments=3, page_size=2)
+        self.assertListEqual(sorted(item['id'] for item in scan), list(range(10)))
+        self.assertTrue(scan.done)
+        self.assertEqual(scan.count, 10)
+
+    def test_parallel_scan_callback_checkpoints(self):
+        table = FakeSegmentedTable(self.table.items)
+        pages = []
+        checkpoints = []
+        scan = pagination.ParallelScan(table.scan, segments=2, page_size=2, on_checkpoint=checkpoints.append)
+        checkpoint = scan.run(lambda items, segment: pages.append((segment, [item['id'] for item in items])))
+        self.assertListEqual(sorted(item for _, items in pages for item in items), list(range(10)))
+        self.assertTrue(all(int(item) % 2 == segment for segment, items in pages for item in items))
+        self.assertEqual(len(checkpoints), len(pages))
+        self.assertDictEqual(checkpoint['segments']['1'], {'cursor': None, 'done': True, 'count': 5})
+
+    def test_parallel_scan_resume(self):
+        table = FakeSegmentedTable(self.table.items)
+        checkpoints = []
+        first = pagination.ParallelScan(table.scan, segments=2, page_size=2, on_checkpoint=checkpoints.append)
+        iterator = iter(first)
+        consumed = [next(iterator)['id'] for _ in range(5)]
+        iterator.close()
+        second = pagination.ParallelScan(table.scan, checkpoint=checkpoints[-1])
+        self.assertEqual(second.total_segments, 2)
+        scanned = consumed + [item['id'] for item in second]
+        self.assertListEqual(sorted(set(scanned)), list(range(10)))
+        self.assertEqual(len(scanned), 11)
+
+    def test_parallel_scan_segment_mismatch(self):
+        checkpoint = pagination.ParallelScan(self.table.scan, segments=2).checkpoint
+        with self.assertRaises(pagination.CursorException):
+            pagination.ParallelScan(self.table.scan, segments=3, checkpoint=checkpoint)
+
+    def test_parallel_scan_error(self):
+        table = FakeSegmentedTable(self.table.items, fail_segment=1)
+        with self.assertRaises(ValueError):
+            list(pagination.ParallelScan(table.scan, segments=2))
+        with self.assertRaises(ValueError):
+            pagination.ParallelScan(table.scan, segments=2).run(lambda items, segment: None)
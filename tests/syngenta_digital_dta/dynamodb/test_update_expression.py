@@ -0,0 +1,95 @@
+import unittest
+
+from syngenta_digital_dta.common.dict_merger import Change
+from syngenta_digital_dta.dynamodb import update_expression
+
+
+class UpdateExpressionTest(unittest.TestCase):
+
+    def test_build(self):
+        expression = update_expression.build([
+            Change('set', ('object_key', 'string_key'), 'something'),
+            Change('append', ('array_number',), [4]),
+            Change('unset', ('object_key', 'old_key'), None)
+        ])
+        expression.condition_equals('modified', '2020-10-05')
+        self.assertDictEqual(expression.to_kwargs(), {
+            'UpdateExpression': 'SET #n0.#n1 = :v0, #n2 = list_append(#n2, :v1) REMOVE #n0.#n3',
+            'ExpressionAttributeNames': {
+                '#n0': 'object_key',
+                '#n1': 'string_key',
+                '#n2': 'array_number',
+                '#n3': 'old_key',
+                '#n4': 'modified'
+            },
+            'ExpressionAttributeValues': {
+                ':v0': 'something',
+                ':v1': [4],
+                ':v2': '2020-10-05'
+            },
+            'ConditionExpression': '#n4 = :v2'
+        })
+
+    def test_build_remove_only(self):
+        kwargs = update_expression.build([Change('unset', ('old_key',), None)]).to_kwargs()
+        self.assertDictEqual(kwargs, {
+            'UpdateExpression': 'REMOVE #n0',
+            'ExpressionAttributeNames': {'#n0': 'old_key'}
+        })
+
+    def test_build_unsupported(self):
+        self.assertRaises(update_expression.UpdateExpressionException, update_expression.build,
+                          [Change('unknown', ('key',), None)])
+
+    def test_build_extend_and_add(self):
+        expression = update_expression.build([
+            Change('extend', ('array_number',), [4]),
+            Change('add', ('views',), 1)
+        ])
+        expression.condition_exists('test_id')
+        self.assertDictEqual(expression.to_kwargs(), {
+            'UpdateExpression': 'SET #n0 = list_append(if_not_exists(#n0, :v0), :v1) ADD #n1 :v2',
+            'ExpressionAttributeNames': {'#n0': 'array_number', '#n1': 'views', '#n2': 'test_id'},
+            'ExpressionAttributeValues': {':v0': [], ':v1': [4], ':v2': 1},
+            'ConditionExpression': 'attribute_exists(#n2)'
+        })
+
+    def test_compile_patch(self):
+        changes = update_expression.compile_patch(
+            {
+                'test_id': 'abc123',
+                'object_key': {'string_key': 'something', 'empty': {}},
+                'array_number': [4],
+                'created': None
+            },
+            exclude=['test_id'],
+            add={'stats.views': 1}
+        )
+        self.assertListEqual(changes, [
+            Change('set', ('object_key',), {'string_key': 'something', 'empty': {}}),
+            Change('extend', ('array_number',), [4]),
+            Change('set', ('created',), None),
+            Change('add', ('stats', 'views'), 1)
+        ])
+
+    def test_compile_patch_operations(self):
+        changes = update_expression.compile_patch(
+            {'object_key': {'string_key': 'x'}, 'array_number': [4]},
+            update_list_operation='replace',
+            update_dict_operation='remove'
+        )
+        self.assertListEqual(changes, [
+            Change('unset', ('object_key', 'string_key'), None),
+            Change('set', ('array_number',), [4])
+        ])
+        for operation in ('add', 'remove'):
+            self.assertRaises(update_expression.UpdateExpressionException, update_expression.compile_patch,
+                              {'array_number': [4]}, update_list_operation=operation)
+
+    def test_compile_patch_overlapping_add(self):
+        for add in ({'object_key': 1}, {'object_key.views': 1}, {'stats': 1, 'stats.views': 1}):
+            with self.subTest(add=add):
+                self.assertRaises(update_expression.UpdateExpressionException, update_expression.compile_patch,
+                                  {'object_key': {'string_key': 'x'}}, add=add)
+        changes = update_expression.compile_patch({'object_key': {'string_key': 'x'}}, add={'object_keys': 1})
+        self.assertEqual(len(changes), 2)
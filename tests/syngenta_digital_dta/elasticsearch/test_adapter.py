@@ -26,6 +26,22 @@ class ElasticsearchAdapterTest(unittest.TestCase):
     def test_connected(self):
         self.assertEqual(self.adapter.connection.ping(), True)
 
+    def test_connect_shared(self):
+        kwargs = {
+            'engine': 'elasticsearch',
+            'index': 'users',
+            'endpoint': 'localhost',
+            'model_schema': 'test-elasticsearch-user-model',
+            'model_schema_file': 'tests/openapi.yml',
+            'model_identifier': 'user_id',
+            'shared': True
+        }
+        first = syngenta_digital_dta.adapter(**kwargs)
+        other = syngenta_digital_dta.adapter(**{**kwargs, 'index': 'others'})
+        self.assertIsNot(first, other)
+        self.assertIs(first.connection, other.connection)
+        syngenta_digital_dta.close_all()
+
     def test_create_template(self):
         try:
             self.adapter.create_template(
@@ -119,6 +135,23 @@ class ElasticsearchAdapterTest(unittest.TestCase):
         except Exception:
             self.assertEqual(False, True)
 
+    def test_batch_create(self):
+        data = [
+            {
+                'user_id': uuid.uuid4().hex,
+                'email': f'some.user.{index}@syngenta.com',
+                'first': 'Some',
+                'last': 'User',
+                'extra_key': True
+            }
+            for index in range(5)
+        ]
+        result = self.adapter.batch_create(data=(item for item in data), batch_size=2)
+        self.assertEqual(result, 5)
+        created = self.adapter.get(data[4]['user_id'], normalize=True)
+        self.assertEqual(created['email'], 'some.user.4@syngenta.com')
+        self.assertNotIn('extra_key', created)
+
     def test_create_uniqueness(self):
         unique = uuid.uuid4().hex
         data = {
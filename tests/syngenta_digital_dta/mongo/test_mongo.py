@@ -28,6 +28,24 @@ class MongoAdapterTest(unittest.TestCase):
     def test_init(self):
         self.assertIsInstance(self.adapter, syngenta_digital_dta.mongo.adapter.MongoAdapter)
 
+    def test_init_dict_options(self):
+        adapter = syngenta_digital_dta.adapter(
+            engine='mongo',
+            database='unit',
+            collection='test',
+            user='root',
+            password='Lq4nKg&&TRhHv%7z',
+            endpoint='mongodb://localhost:27017/',
+            model_schema='test-mongo-model',
+            model_schema_file='tests/openapi.yml',
+            model_identifier='test_id',
+            model_version_key='modified',
+            sns_attributes={'source': 'unit'},
+            metrics='emf',
+            metrics_options={'namespace': 'unit'}
+        )
+        self.assertIsInstance(adapter, syngenta_digital_dta.mongo.adapter.MongoAdapter)
+
     def test_create_succeed(self):
         data = mock_data.get_standard()
         result = self.adapter.create(data=data)
@@ -152,6 +170,22 @@ class MongoAdapterTest(unittest.TestCase):
         self.assertDictEqual(result, data)
         self.adapter.delete(query={'test_id': data['test_id']})  # clean up
 
+    def test_update_partial(self):
+        data = mock_data.get_standard()
+        self.adapter.create(data=data)
+        result = self.adapter.update(
+            query={'test_id': data['test_id']},
+            data={'object_key': {'string_key': 'something'}, 'array_number': [4]},
+            partial=True
+        )
+        data['object_key']['string_key'] = 'something'
+        data['array_number'] = [1, 2, 3, 4]
+        self.assertDictEqual(result, data)
+        stored = self.adapter.find_one(query={'test_id': data['test_id']})
+        stored.pop('_id')
+        self.assertDictEqual(stored, data)
+        self.adapter.delete(query={'test_id': data['test_id']})  # clean up
+
     def test_update_fail(self):
         data = mock_data.get_standard()
         try:
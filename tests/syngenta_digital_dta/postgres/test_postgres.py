@@ -1,3 +1,4 @@
+import threading
 import uuid
 import unittest
 import warnings
@@ -77,6 +78,39 @@ class PostgresAdapterTest(unittest.TestCase):
     def test_connected(self):
         self.assertEqual(self.user_adapter.connection.closed, 0)
 
+    def test_connect_shared(self):
+        kwargs = {
+            'engine': 'postgres',
+            'table': 'users',
+            'endpoint': 'localhost',
+            'database': 'dta-postgis',
+            'port': 5432,
+            'user': 'root',
+            'password': 'Lq4nKg&&TRhHv%7z',
+            'model_schema': 'test-postgres-user-model',
+            'model_schema_file': 'tests/openapi.yml',
+            'model_identifier': 'user_id',
+            'shared': True
+        }
+        first = syngenta_digital_dta.adapter(**kwargs)
+        other = syngenta_digital_dta.adapter(**{**kwargs, 'table': 'addresses', 'model_identifier': 'address_id'})
+        first.connect()
+        other.connect()
+        first.cursor.execute('SELECT 1')
+        connections = []
+        thread = threading.Thread(target=lambda: connections.append(first.connection))
+        thread.start()
+        thread.join()
+        self.assertIs(first.pool, other.pool)
+        self.assertIs(first.connection, other.connection)
+        self.assertIsNot(connections[0], first.connection)
+        connection = first.connection
+        first.commit()
+        self.assertNotIn(connection, first.pool._used.values())
+        syngenta_digital_dta.close_all()
+        self.assertTrue(first.pool.closed)
+        self.assertNotEqual(connection.closed, 0)
+
     def test_insert(self):
         data = {
             'user_id': str(uuid.uuid4()),
@@ -97,6 +131,23 @@ class PostgresAdapterTest(unittest.TestCase):
         result = self.user_adapter.create(data=data, commit=True)
         self.assertDictEqual(data, result)
 
+    def test_batch_insert(self):
+        data = [
+            {
+                'user_id': str(uuid.uuid4()),
+                'email': f'paul.cruse.{index}@syngenta.com',
+                'first': 'Paul',
+                'last': 'Cruse III',
+                'extra_key': True
+            }
+            for index in range(5)
+        ]
+        result = self.user_adapter.batch_insert(data=(item for item in data), batch_size=2, commit=True)
+        self.assertEqual(result, 5)
+        inserted = self.user_adapter.get(data[4]['user_id'])
+        self.assertEqual(inserted['email'], 'paul.cruse.4@syngenta.com')
+        self.assertNotIn('extra_key', inserted)
+
     def test_insert_remove_keys(self):
         data = {
             'user_id': str(uuid.uuid4()),
@@ -135,6 +186,19 @@ class PostgresAdapterTest(unittest.TestCase):
         result = self.user_adapter.update(data=data, commit=True)
         self.assertDictEqual(data, result)
 
+    def test_update_partial(self):
+        data = {
+            'user_id': 'some-update-partial-guid',
+            'email': 'paul.cruse@syngenta.com',
+            'first': 'Paul',
+            'last': 'Cruse III'
+        }
+        self.user_adapter.upsert(data=data, commit=True)
+        result = self.user_adapter.update(data={'user_id': data['user_id'], 'last': 'Cruse'}, partial=True, commit=True)
+        data['last'] = 'Cruse'
+        self.assertDictEqual(data, result)
+        self.assertDictEqual(data, self.user_adapter.get(data['user_id']))
+
     def test_update_fail(self):
         data = {
             'user_id': 'some-update-guid-success',
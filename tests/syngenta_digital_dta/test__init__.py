@@ -1,3 +1,4 @@
+import threading
 import uuid
 import unittest
 import warnings
@@ -90,3 +91,31 @@ class AdapterTest(unittest.TestCase):
             self.assertEqual(True, False)
         except Exception as e:
             self.assertEqual(str(e), 'engine not-supported not supported; contribute to get it supported :)')
+
+    def test_shared_adapter(self):
+        kwargs = {
+            'engine': 'dynamodb',
+            'table': 'TABLE_NAME',
+            'endpoint': 'http://localhost:4000',
+            'model_schema': 'test-dynamo-model',
+            'model_schema_file': 'tests/openapi.yml',
+            'model_identifier': 'test_id',
+            'model_version_key': 'modified',
+            'shared': True
+        }
+        first = syngenta_digital_dta.adapter(**kwargs)
+        second = syngenta_digital_dta.adapter(**kwargs)
+        other = syngenta_digital_dta.adapter(**{**kwargs, 'table': 'OTHER_TABLE'})
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.assertIs(first.table.meta.client, other.table.meta.client)
+        tables = []
+        thread = threading.Thread(target=lambda: tables.append(first.table))
+        thread.start()
+        thread.join()
+        self.assertIsNot(tables[0], first.table)
+        self.assertIs(tables[0].meta.client, first.client)
+        self.assertEqual(tables[0].name, 'TABLE_NAME')
+        syngenta_digital_dta.close_all()
+        self.assertIsNot(first, syngenta_digital_dta.adapter(**kwargs))
+        syngenta_digital_dta.close_all()
@@ -0,0 +1,56 @@
+import os
+import subprocess
+import sys
+import unittest
+
+# cumulative import budget per engine in milliseconds; scale with DTA_IMPORT_BUDGET_SCALE on slow machines
+ENGINE_BUDGETS = {
+    'dynamodb': 600,
+    'postgres': 300,
+    'elasticsearch': 600,
+    's3': 600,
+    'file_system': 50,
+    'mongo': 600
+}
+
+ENGINE_EXCLUDED_MODULES = {
+    'dynamodb': ['yaml', 'jsonref', 'simplejson', 'jsonpickle', 'requests', 'pymongo', 'psycopg2', 'elasticsearch'],
+    'postgres': ['boto3', 'yaml', 'jsonref', 'simplejson', 'jsonpickle', 'requests', 'pymongo', 'elasticsearch'],
+    'elasticsearch': ['boto3', 'yaml', 'jsonref', 'jsonpickle', 'requests_aws4auth', 'pymongo', 'psycopg2'],
+    's3': ['yaml', 'jsonref', 'simplejson', 'jsonpickle', 'requests', 'pymongo', 'psycopg2', 'elasticsearch'],
+    'file_system': ['boto3', 'yaml', 'jsonref', 'simplejson', 'jsonpickle', 'requests', 'pymongo', 'psycopg2'],
+    'mongo': ['boto3', 'yaml', 'jsonref', 'simplejson', 'jsonpickle', 'requests', 'psycopg2', 'elasticsearch']
+}
+
+
+class ImportTimeTest(unittest.TestCase):
+
+    def setUp(self, *args, **keywargs):
+        self.maxDiff = None
+        self.scale = float(os.getenv('DTA_IMPORT_BUDGET_SCALE', '1'))
+
+    def test_import_time_budget(self):
+        for engine, budget in ENGINE_BUDGETS.items():
+            with self.subTest(engine=engine):
+                cumulative = self.__import_time(f'syngenta_digital_dta.{engine}.adapter')
+                self.assertLessEqual(cumulative / 1000, budget * self.scale)
+
+    def test_import_excluded_modules(self):
+        for engine, excluded in ENGINE_EXCLUDED_MODULES.items():
+            with self.subTest(engine=engine):
+                loaded = self.__loaded_modules(f'syngenta_digital_dta.{engine}.adapter')
+                self.assertListEqual([module for module in excluded if module in loaded], [])
+
+    def __import_time(self, module):
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                                capture_output=True, text=True, check=True)
+        for line in result.stderr.splitlines():
+            parts = [part.strip() for part in line.split('|')]
+            if len(parts) == 3 and parts[2] == module:
+                return int(parts[1])
+        raise AssertionError(f'{module} not found in importtime output')
+
+    def __loaded_modules(self, module):
+        result = subprocess.run([sys.executable, '-c', f'import sys, {module}; print(" ".join(sys.modules))'],
+                                capture_output=True, text=True, check=True)
+        return set(result.stdout.split())